@@ -1,7 +1,11 @@
+import argparse
+import concurrent.futures
+import hashlib
 import json
+import os
 import pathlib
 import string
-from typing import Final
+from typing import Final, Optional
 from xml.etree import ElementTree
 
 
@@ -15,30 +19,104 @@ class InvalidSVGException(Exception):
         super().__init__(msg)
 
 
+def _parse_svg(file: pathlib.Path) -> Optional[str]:
+    try:
+        with file.open("r", encoding="utf8") as f:
+            content: str = f.read()
+        ElementTree.fromstring(content)
+    except ElementTree.ParseError as e:
+        return str(e)
+    except UnicodeDecodeError as e:
+        return f"not utf8: {e}"
+    return None
+
+
+class IconCache:
+    VERSION: Final[int] = 1
+
+    def __init__(self, path: pathlib.Path = pathlib.Path(".cache").joinpath("icons.json")):
+        self._PATH: Final[pathlib.Path] = path
+        # icon name -> (content digest, parse error or None)
+        self._previous: dict[str, tuple[str, Optional[str]]] = {}
+        self._entries: Final[dict[str, tuple[str, Optional[str]]]] = {}
+        self._load()
+
+    def lookup(self, name: str, digest: str) -> tuple[bool, Optional[str]]:
+        entry: Optional[tuple[str, Optional[str]]] = self._previous.get(name)
+        if entry is None or entry[0] != digest:
+            return False, None
+        self._entries[name] = entry
+        return True, entry[1]
+
+    def record(self, name: str, digest: str, error: Optional[str]) -> None:
+        self._entries[name] = (digest, error)
+
+    def save(self) -> None:
+        if self._entries == self._previous:
+            return
+        self._PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = self._PATH.with_name(f"{self._PATH.name}.tmp")
+        with tmp.open("w", encoding="utf8") as f:
+            json.dump({"version": self.VERSION, "icons": self._entries}, f)
+        tmp.replace(self._PATH)
+
+    def _load(self) -> None:
+        try:
+            with self._PATH.open("r", encoding="utf8") as f:
+                cached: dict = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get("version") == self.VERSION:
+            self._previous = {name: (digest, error) for name, (digest, error) in cached["icons"].items()}
+
+
 class IconValidator:
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, use_cache: bool = True):
         self._SOURCE_DIR: Final[str] = "src"
         self._TECH_DIR: Final[str] = "technologies"
         self._FULL_TECH_DIR: Final[pathlib.Path] = pathlib.Path(self._SOURCE_DIR).joinpath(self._TECH_DIR)
         self._IMAGES_DIR: Final[str] = "images"
         self._ICONS_DIR: Final[str] = "icons"
         self._FULL_IMAGES_DIR: Final[pathlib.Path] = pathlib.Path(self._SOURCE_DIR).joinpath(self._IMAGES_DIR).joinpath(self._ICONS_DIR)
+        self._WORKERS: Final[int] = workers or os.cpu_count() or 1
+        self._USE_CACHE: Final[bool] = use_cache
 
     def validate(self) -> None:
         json_icons: set[str] = self.get_json_icons()
-        for file in self._FULL_IMAGES_DIR.iterdir():
+        errors: list[str] = []
+        svgs: list[pathlib.Path] = []
+        for file in sorted(self._FULL_IMAGES_DIR.iterdir()):
             if file.name not in json_icons:
-                raise InvalidStructureException(f"{file.name} must be used, {file} isn't used!")
+                errors.append(f"{file.name} must be used, {file} isn't used!")
             if file.name.lower().endswith(".svg"):
-                self._validate_svg(file)
+                svgs.append(file)
+        if errors:
+            raise InvalidStructureException("\n".join(errors))
+        invalid: list[str] = [f"Invalid SVG '{file.name}': {error}" for file, error in self._parse_all(svgs) if error is not None]
+        if invalid:
+            raise InvalidSVGException("\n".join(invalid))
 
-    def _validate_svg(self, file: pathlib.Path) -> None:
-        try:
-            with file.open("r", encoding="utf8") as f:
-                content: str = f.read()
-            ElementTree.fromstring(content)
-        except ElementTree.ParseError as e:
-            raise InvalidSVGException(f"Invalid SVG '{file.name}': {e}")
+    def _parse_all(self, svgs: list[pathlib.Path]) -> list[tuple[pathlib.Path, Optional[str]]]:
+        cache: Optional[IconCache] = IconCache() if self._USE_CACHE else None
+        results: list[tuple[pathlib.Path, Optional[str]]] = []
+        pending: list[tuple[pathlib.Path, str]] = []
+        for file in svgs:
+            digest: str = hashlib.blake2b(file.read_bytes(), digest_size=16).hexdigest()
+            if cache is not None:
+                hit, error = cache.lookup(file.name, digest)
+                if hit:
+                    results.append((file, error))
+                    continue
+            pending.append((file, digest))
+        if pending:
+            with concurrent.futures.ProcessPoolExecutor(self._WORKERS) as executor:
+                for (file, digest), error in zip(pending, executor.map(_parse_svg, [file for file, _ in pending], chunksize=64)):
+                    results.append((file, error))
+                    if cache is not None:
+                        cache.record(file.name, digest, error)
+        if cache is not None:
+            cache.save()
+        return results
 
     def get_json_icons(self) -> set[str]:
         letters: list[str] = list(string.ascii_lowercase)
@@ -56,4 +134,8 @@ class IconValidator:
 
 
 if __name__ == '__main__':
-    IconValidator().validate()
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args: argparse.Namespace = parser.parse_args()
+    IconValidator(args.workers, not args.no_cache).validate()
@@ -0,0 +1,19 @@
+import pathlib
+import sys
+from typing import Final
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3].joinpath("scripts")))
+from bundle import BundleBuilder
+
+
+class ImpliesValidator:
+    def __init__(self):
+        self._SOURCE_DIR: Final[pathlib.Path] = pathlib.Path("src")
+
+    def validate(self) -> None:
+        # the builder resolves the implies closure the engine ships with and raises on the first cycle it walks into
+        BundleBuilder(self._SOURCE_DIR).compile()
+
+
+if __name__ == '__main__':
+    ImpliesValidator().validate()
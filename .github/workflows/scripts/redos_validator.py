@@ -0,0 +1,78 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import pathlib
+import sys
+from typing import Final, Optional
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3].joinpath("scripts")))
+from bundle import Bundle
+from redos import Finding, PatternReport, ReDoSAnalyzer
+
+
+class CatastrophicBacktrackingException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+_analyzer: Optional[ReDoSAnalyzer] = None
+
+
+def _init_worker(budget: float) -> None:
+    global _analyzer
+    _analyzer = ReDoSAnalyzer(budget)
+
+
+def _check(regex: str) -> PatternReport:
+    return _analyzer.check(regex)
+
+
+class ReDoSValidator:
+    def __init__(self, budget: float = 0.1, strict: bool = False, report: Optional[pathlib.Path] = None, workers: Optional[int] = None):
+        self._SOURCE_DIR: Final[pathlib.Path] = pathlib.Path("src")
+        self._BUDGET: Final[float] = budget
+        self._STRICT: Final[bool] = strict
+        self._REPORT: Final[Optional[pathlib.Path]] = report
+        self._WORKERS: Final[int] = workers or os.cpu_count() or 1
+
+    def validate(self) -> None:
+        usages: dict[str, list[tuple[str, str, str]]] = Bundle.from_source(self._SOURCE_DIR).usages()
+        with concurrent.futures.ProcessPoolExecutor(self._WORKERS, initializer=_init_worker, initargs=(self._BUDGET,)) as executor:
+            reports: list[PatternReport] = [report for report in executor.map(_check, sorted(usages), chunksize=16) if report.severity]
+        reports.sort(key=lambda report: (report.severity != Finding.EXPONENTIAL, -report.seconds))
+        failing: set[str] = {Finding.EXPONENTIAL, Finding.POLYNOMIAL} if self._STRICT else {Finding.EXPONENTIAL}
+        errors: list[str] = []
+        for report in reports:
+            for tech, field, source in usages[report.regex]:
+                line: str = f"{report.severity}: tech '{tech}' field '{field}' regex '{source}' ({', '.join(report.kinds) or 'fuzzing'}, {report.seconds:.3f}s on {report.length} chars)"
+                if report.severity in failing:
+                    errors.append(line)
+                else:
+                    print(f"warning: {line}")
+        if self._REPORT is not None:
+            self._write_report(reports, usages)
+        if errors:
+            raise CatastrophicBacktrackingException("\n".join(errors))
+
+    def _write_report(self, reports: list[PatternReport], usages: dict[str, list[tuple[str, str, str]]]) -> None:
+        self._REPORT.parent.mkdir(parents=True, exist_ok=True)
+        with self._REPORT.open("w", encoding="utf8") as f:
+            json.dump([{
+                "regex": report.regex,
+                "severity": report.severity,
+                "kinds": report.kinds,
+                "length": report.length,
+                "seconds": round(report.seconds, 4),
+                "usages": [{"tech": tech, "field": field, "source": source} for tech, field, source in usages[report.regex]]
+            } for report in reports], f, indent=2)
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=0.1, help="seconds a single generated input may take")
+    parser.add_argument("--strict", action="store_true", help="fail on polynomial patterns too")
+    parser.add_argument("--report", type=pathlib.Path, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args: argparse.Namespace = parser.parse_args()
+    ReDoSValidator(args.budget, args.strict, args.report, args.workers).validate()
@@ -0,0 +1,51 @@
+import argparse
+import json
+import pathlib
+import sys
+from typing import Final, Optional
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3].joinpath("scripts")))
+from bundle import Bundle
+from regex_backend import BACKENDS, CompatibilityClassifier, PatternCompatibility
+
+
+class RegexCompatibilityReport:
+    def __init__(self, compile_check: bool = False, report: Optional[pathlib.Path] = None):
+        self._SOURCE_DIR: Final[pathlib.Path] = pathlib.Path("src")
+        self._COMPILE_CHECK: Final[bool] = compile_check
+        self._REPORT: Final[Optional[pathlib.Path]] = report
+
+    def run(self) -> None:
+        usages: dict[str, list[tuple[str, str, str]]] = Bundle.from_source(self._SOURCE_DIR).usages()
+        classifier: CompatibilityClassifier = CompatibilityClassifier(compile_check=self._COMPILE_CHECK)
+        results: list[PatternCompatibility] = [classifier.classify(regex) for regex in sorted(usages)]
+        for backend in BACKENDS:
+            compatible: int = sum(1 for result in results if result.mask & backend.MASK)
+            print(f"{backend.NAME}: {compatible}/{len(results)} patterns compatible{'' if backend.available() else ' (not installed)'}")
+        reasons: dict[str, int] = {}
+        for result in results:
+            for backend, reason in result.reasons.items():
+                key: str = f"{backend}: {reason}"
+                reasons[key] = reasons.get(key, 0) + 1
+        for reason, count in sorted(reasons.items(), key=lambda item: -item[1]):
+            print(f"  {count} {reason}")
+        if self._REPORT is not None:
+            self._write_report(results, usages)
+
+    def _write_report(self, results: list[PatternCompatibility], usages: dict[str, list[tuple[str, str, str]]]) -> None:
+        self._REPORT.parent.mkdir(parents=True, exist_ok=True)
+        with self._REPORT.open("w", encoding="utf8") as f:
+            json.dump([{
+                "regex": result.regex,
+                "backends": result.backends,
+                "reasons": result.reasons,
+                "usages": [{"tech": tech, "field": field, "source": source} for tech, field, source in usages[result.regex]]
+            } for result in results if result.reasons], f, indent=2)
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--compile-check", action="store_true", help="compile with every installed backend instead of only translating")
+    parser.add_argument("--report", type=pathlib.Path, default=None)
+    args: argparse.Namespace = parser.parse_args()
+    RegexCompatibilityReport(args.compile_check, args.report).run()
@@ -1,8 +1,14 @@
+import argparse
+import concurrent.futures
+import hashlib
+import importlib.metadata
 import json
+import os
 import pathlib
-from typing import Final
+from typing import Final, Any, Optional
 
-from jsonschema import validate, ValidationError
+from jsonschema import validators
+from jsonschema.protocols import Validator
 
 
 class SchemaValidationException(Exception):
@@ -10,29 +16,120 @@ class SchemaValidationException(Exception):
         super().__init__(msg)
 
 
+_validator: Optional[Validator] = None
+
+
+def _init_worker(schema: dict) -> None:
+    global _validator
+    _validator = validators.validator_for(schema)(schema)
+
+
+def _check(entry: tuple[str, Any]) -> list[str]:
+    tech, data = entry
+    # the schema describes a file as an object of technologies, so one technology is checked as a file holding only it
+    errors: list = sorted(_validator.iter_errors({tech: data}), key=lambda e: [str(p) for p in e.absolute_path])
+    return [f"{e.message} (at {' -> '.join(str(p) for p in e.absolute_path) if e.absolute_path else 'root'})" for e in errors]
+
+
+class SchemaCache:
+    VERSION: Final[int] = 1
+
+    def __init__(self, schema: dict, path: pathlib.Path = pathlib.Path(".cache").joinpath("schema.json")):
+        self._PATH: Final[pathlib.Path] = path
+        # a jsonschema upgrade can change what passes, so results only carry over with the same version
+        self._SCHEMA: Final[str] = self.digest([schema, importlib.metadata.version("jsonschema")])
+        self._previous: dict[str, list[str]] = {}
+        # entry digest -> schema errors, empty when the entry is valid
+        self._entries: Final[dict[str, list[str]]] = {}
+        self._load()
+
+    def lookup(self, digest: str) -> Optional[list[str]]:
+        errors: Optional[list[str]] = self._previous.get(digest)
+        if errors is not None:
+            self._entries[digest] = errors
+        return errors
+
+    def record(self, digest: str, errors: list[str]) -> None:
+        self._entries[digest] = errors
+
+    def save(self) -> None:
+        if self._entries == self._previous:
+            return
+        self._PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = self._PATH.with_name(f"{self._PATH.name}.tmp")
+        with tmp.open("w", encoding="utf8") as f:
+            json.dump({"version": self.VERSION, "schema": self._SCHEMA, "entries": self._entries}, f)
+        tmp.replace(self._PATH)
+
+    def _load(self) -> None:
+        try:
+            with self._PATH.open("r", encoding="utf8") as f:
+                cached: dict = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get("version") == self.VERSION and cached.get("schema") == self._SCHEMA:
+            self._previous = cached["entries"]
+
+    @staticmethod
+    def digest(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf8")).hexdigest()
+
+
 class SchemaValidator:
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, use_cache: bool = True):
         self._SOURCE_DIR: Final[str] = "src"
         self._TECH_DIR: Final[str] = "technologies"
         self._FULL_TECH_DIR: Final[pathlib.Path] = pathlib.Path(self._SOURCE_DIR).joinpath(self._TECH_DIR)
         self._SCHEMA_FILE: Final[pathlib.Path] = pathlib.Path("schema.json")
+        self._WORKERS: Final[int] = workers or os.cpu_count() or 1
+        self._USE_CACHE: Final[bool] = use_cache
 
     def validate(self) -> None:
         if not self._SCHEMA_FILE.is_file():
             raise FileNotFoundError(f"Schema file '{self._SCHEMA_FILE}' not found!")
         with self._SCHEMA_FILE.open("r", encoding="utf8") as f:
             schema: dict = json.load(f)
+        validators.validator_for(schema).check_schema(schema)
+        cache: Optional[SchemaCache] = SchemaCache(schema) if self._USE_CACHE else None
+        errors: list[str] = []
+        # (file name, tech, entry digest) for every entry, in file order
+        entries: list[tuple[str, str, str]] = []
+        pending: dict[str, tuple[str, Any]] = {}
         for tech_file in sorted(self._FULL_TECH_DIR.iterdir()):
             if not tech_file.name.endswith(".json"):
                 continue
             with tech_file.open("r", encoding="utf8") as f:
-                technologies: dict = json.load(f)
-            try:
-                validate(instance=technologies, schema=schema)
-            except ValidationError as e:
-                path: str = " -> ".join(str(p) for p in e.absolute_path) if e.absolute_path else "root"
-                raise SchemaValidationException(f"{tech_file.name}: {e.message} (at {path})")
+                technologies: Any = json.load(f)
+            if not isinstance(technologies, dict):
+                errors.append(f"{tech_file.name}: {technologies!r} is not of type 'object' (at root)")
+                continue
+            for tech, data in technologies.items():
+                digest: str = SchemaCache.digest([tech, data])
+                entries.append((tech_file.name, tech, digest))
+                if cache is None or cache.lookup(digest) is None:
+                    pending[digest] = (tech, data)
+        outcomes: dict[str, list[str]] = dict(zip(pending, self._check_all(schema, list(pending.values()))))
+        for file_name, _, digest in entries:
+            entry_errors: list[str] = outcomes[digest] if digest in outcomes else cache.lookup(digest)
+            errors.extend(f"{file_name}: {error}" for error in entry_errors)
+        if cache is not None:
+            for digest, entry_errors in outcomes.items():
+                cache.record(digest, entry_errors)
+            cache.save()
+        if errors:
+            raise SchemaValidationException("\n".join(errors))
+
+    def _check_all(self, schema: dict, pending: list[tuple[str, Any]]) -> list[list[str]]:
+        if self._WORKERS == 1 or len(pending) < 64:
+            _init_worker(schema)
+            return [_check(entry) for entry in pending]
+        with concurrent.futures.ProcessPoolExecutor(self._WORKERS, initializer=_init_worker, initargs=(schema,)) as executor:
+            return list(executor.map(_check, pending, chunksize=64))
 
 
 if __name__ == '__main__':
-    SchemaValidator().validate()
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args: argparse.Namespace = parser.parse_args()
+    SchemaValidator(args.workers, not args.no_cache).validate()
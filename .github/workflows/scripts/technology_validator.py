@@ -4,10 +4,16 @@ import os
 import pathlib
 import re
 import string
+import sys
 from typing import Final, Any, Type, Optional
 
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[3].joinpath("scripts")))
+from patterns import InvalidVersionTemplateException, PatternParser, VersionTemplate
+from regex_dialect import JsRegexTranslator, UntranslatablePatternException
+from regex_registry import RegexRegistry
+
 
 class MissingRequiredFieldException(Exception):
     def __init__(self, msg: str):
@@ -172,13 +178,24 @@ class RegexValidator(abc.ABC, AbstractValidator):
 
     def _validate_regex(self, tech_name: str, data: Any) -> bool:
         if isinstance(data, str):
+            if not self._validate_tags(tech_name, data):
+                return False
             try:
-                if not self._validate_tags(tech_name, data):
-                    return False
-                re.compile(data.split(r"\;")[0])
-            except re.error as e:
-                self._set_custom_error(InvalidRegexException(f"Unable to compile regex '{data}' for tech '{tech_name}', got error: {e.msg}"))
+                regex: str = JsRegexTranslator().translate(data.split(r"\;")[0])
+            except UntranslatablePatternException as e:
+                self._set_custom_error(InvalidRegexException(f"Unable to translate regex '{data}' for tech '{tech_name}', got error: {e}"))
                 return False
+            error: Optional[str] = RegexRegistry.shared().error(regex)
+            if error is not None:
+                self._set_custom_error(InvalidRegexException(f"Unable to compile regex '{data}' for tech '{tech_name}', got error: {error}"))
+                return False
+            version: Optional[str] = PatternParser.parse(data).version
+            if version is not None:
+                try:
+                    VersionTemplate.parse(version, RegexRegistry.shared().compile(regex).groups)
+                except InvalidVersionTemplateException as e:
+                    self._set_custom_error(InvalidTagException(f"Invalid version for tech '{tech_name}' in pattern '{data}': {e}"))
+                    return False
         elif isinstance(data, dict):
             for _, val in data.items():
                 if not self._validate_regex(tech_name, val):
@@ -317,9 +334,9 @@ class DomValidator(RegexValidator):
 
 
 class IconValidator(StringValidator):
-    def __init__(self, icons: list[str], required: bool = False):
+    def __init__(self, icons: set[str], required: bool = False):
         super().__init__(required)
-        self._icons: Final[list[str]] = icons
+        self._icons: Final[set[str]] = icons
 
     def _validate(self, tech_name: str, data: Any) -> bool:
         if not super()._validate(tech_name, data):
@@ -331,18 +348,18 @@ class IconValidator(StringValidator):
 
 
 class CPEValidator(StringValidator):
+    # https://csrc.nist.gov/schema/cpe/2.3/cpe-naming_2.3.xsd
+    _CPE_PATTERN: Final[re.Pattern] = re.compile(r"""cpe:2\.3:[aho\*\-](:(((\?*|\*?)([a-zA-Z0-9\-\._]|(\\[\\\*\?!"#$$%&'\(\)\+,/:;<=>@\[
+        \]\^`\{\|}~]))+(\?*|\*?))|[\*\-])){5}(:(([a-zA-Z]{2,3}(-([a-zA-Z]{2}|[0-9]{3}))?)|[\*\-]))(:(((\?*|\*?)([
+        a-zA-Z0-9\-\._]|(\\[\\\*\?!"#$$%&'\(\)\+,/:;<=>@\[\]\^`\{\|}~]))+(\?*|\*?))|[\*\-])){4}""")
+
     def __init__(self):
         super().__init__()
 
     def _validate(self, tech_name: str, data: Any) -> bool:
         if not super()._validate(tech_name, data):
             return False
-        # https://csrc.nist.gov/schema/cpe/2.3/cpe-naming_2.3.xsd
-        cpe_regex: str = r"""cpe:2\.3:[aho\*\-](:(((\?*|\*?)([a-zA-Z0-9\-\._]|(\\[\\\*\?!"#$$%&'\(\)\+,/:;<=>@\[
-        \]\^`\{\|}~]))+(\?*|\*?))|[\*\-])){5}(:(([a-zA-Z]{2,3}(-([a-zA-Z]{2}|[0-9]{3}))?)|[\*\-]))(:(((\?*|\*?)([
-        a-zA-Z0-9\-\._]|(\\[\\\*\?!"#$$%&'\(\)\+,/:;<=>@\[\]\^`\{\|}~]))+(\?*|\*?))|[\*\-])){4}"""
-        pattern: re.Pattern = re.compile(cpe_regex)
-        if not pattern.match(data):
+        if not self._CPE_PATTERN.match(data):
             self._set_custom_error(InvalidCPEException(f"The cpe {data} for tech '{tech_name}' is invalid!"))
             return False
         return True
@@ -364,18 +381,36 @@ class ReferenceValidator(ArrayValidator):
         return True
 
 
-class TechnologiesValidator:
-    def __init__(self, file_name: str):
+class ValidationContext:
+    def __init__(self):
         self._SOURCE_DIR: Final[str] = "src"
         self._TECH_DIR: Final[str] = "technologies"
         self._FULL_TECH_DIR: Final[pathlib.Path] = pathlib.Path(self._SOURCE_DIR).joinpath(self._TECH_DIR)
-        self._TECH_FILE: Final[pathlib.Path] = self._FULL_TECH_DIR.joinpath(file_name)
-        with pathlib.Path(self._SOURCE_DIR).joinpath("categories.json").open("r", encoding="utf8") as categories:
-            self._CATEGORIES: Final[list[int]] = [int(cat) for cat in json.loads(categories.read())]
         self._IMAGES_DIR: Final[str] = "images"
         self._ICONS_DIR: Final[str] = "icons"
-        self._ICONS: Final[list[str]] = [icon.name for icon in pathlib.Path(self._SOURCE_DIR).joinpath(self._IMAGES_DIR).joinpath(self._ICONS_DIR).iterdir()]
-        self._ALL_TECHS: Final[set[str]] = self._get_all_tech_names()
+        with pathlib.Path(self._SOURCE_DIR).joinpath("categories.json").open("r", encoding="utf8") as categories:
+            self.categories: Final[list[int]] = [int(cat) for cat in json.loads(categories.read())]
+        self.icons: Final[set[str]] = {icon.name for icon in pathlib.Path(self._SOURCE_DIR).joinpath(self._IMAGES_DIR).joinpath(self._ICONS_DIR).iterdir()}
+        self.sources: Final[dict[str, str]] = {}
+        self.all_techs: Final[set[str]] = set()
+        for letter in list(string.ascii_lowercase) + ["_"]:
+            tech_file: pathlib.Path = self._FULL_TECH_DIR.joinpath(f"{letter}.json")
+            if tech_file.exists():
+                with tech_file.open("r", encoding="utf8") as f:
+                    self.sources[tech_file.name] = f.read()
+                self.all_techs.update(json.loads(self.sources[tech_file.name]).keys())
+
+
+class TechnologiesValidator:
+    def __init__(self, file_name: str, context: Optional[ValidationContext] = None):
+        self._SOURCE_DIR: Final[str] = "src"
+        self._TECH_DIR: Final[str] = "technologies"
+        self._FULL_TECH_DIR: Final[pathlib.Path] = pathlib.Path(self._SOURCE_DIR).joinpath(self._TECH_DIR)
+        self._TECH_FILE: Final[pathlib.Path] = self._FULL_TECH_DIR.joinpath(file_name)
+        self._context: Final[ValidationContext] = context or ValidationContext()
+        self._CATEGORIES: Final[list[int]] = self._context.categories
+        self._ICONS: Final[set[str]] = self._context.icons
+        self._ALL_TECHS: Final[set[str]] = self._context.all_techs
         self._validators: dict[str, AbstractValidator] = {  # TODO confidence and version validator
             "cats": CategoryValidator(self._CATEGORIES, True),
             "website": URLValidator(True),
@@ -408,21 +443,44 @@ class TechnologiesValidator:
         }
 
     def validate(self) -> None:
+        for tech, data in self._load().items():
+            self._validate_tech(tech, data)
+
+    def errors(self, techs: Optional[set[str]] = None) -> list[tuple[Optional[str], Exception]]:
+        try:
+            technologies: dict = self._load()
+        except DuplicateTechnologyException as e:
+            return [(None, e)]
+        errors: list[tuple[Optional[str], Exception]] = []
+        for tech, data in technologies.items():
+            if techs is not None and tech not in techs:
+                continue
+            try:
+                self._validate_tech(tech, data)
+            except Exception as e:
+                errors.append((tech, e))
+        return errors
+
+    def _load(self) -> dict:
+        source: Optional[str] = self._context.sources.get(self._TECH_FILE.name)
+        if source is None:
+            with self._TECH_FILE.open("r", encoding="utf8") as f:
+                source = f.read()
+        return json.loads(source, object_pairs_hook=self._duplicate_key_validator)
+
+    def _validate_tech(self, tech: str, data: dict) -> None:
         initial_letter: str = self._TECH_FILE.name.removesuffix(".json")
-        with self._TECH_FILE.open("r", encoding="utf8") as f:
-            technologies: dict = json.loads(f.read(), object_pairs_hook=self._duplicate_key_validator)
-            for tech, data in technologies.items():
-                first: str = tech[0].lower()
-                if initial_letter == "_":
-                    if first in string.ascii_lowercase:
-                        raise InvalidTechFileException(f"Tech '{tech}' starts with the letter '{first}', it should not be located in the '{self._TECH_FILE.name}' file, but '{first}.json'")
-                elif first != initial_letter:
-                    suggested_file: str = f"{first}.json" if first in string.ascii_lowercase else "_.json"
-                    raise InvalidTechFileException(f"Tech '{tech}' does not start with '{initial_letter}', it should not be located in the '{self._TECH_FILE.name}' file, but '{suggested_file}'")
-                if tech.strip() != tech:
-                    raise InvalidTechFileException(f"Tech '{tech}' can't start or end with whitespace ' '")
-                p: TechnologyProcessor = TechnologyProcessor(tech, data, self._validators)
-                p.process()
+        first: str = tech[0].lower()
+        if initial_letter == "_":
+            if first in string.ascii_lowercase:
+                raise InvalidTechFileException(f"Tech '{tech}' starts with the letter '{first}', it should not be located in the '{self._TECH_FILE.name}' file, but '{first}.json'")
+        elif first != initial_letter:
+            suggested_file: str = f"{first}.json" if first in string.ascii_lowercase else "_.json"
+            raise InvalidTechFileException(f"Tech '{tech}' does not start with '{initial_letter}', it should not be located in the '{self._TECH_FILE.name}' file, but '{suggested_file}'")
+        if tech.strip() != tech:
+            raise InvalidTechFileException(f"Tech '{tech}' can't start or end with whitespace ' '")
+        p: TechnologyProcessor = TechnologyProcessor(tech, data, self._validators)
+        p.process()
 
     @classmethod
     def _duplicate_key_validator(cls, pairs: list[tuple[str, Any]]) -> dict[str, Any]:
@@ -433,16 +491,6 @@ class TechnologiesValidator:
             result[key] = value
         return result
 
-    def _get_all_tech_names(self) -> set[str]:
-        all_techs: set[str] = set()
-        for letter in list(string.ascii_lowercase) + ["_"]:
-            tech_file: pathlib.Path = self._FULL_TECH_DIR.joinpath(f"{letter}.json")
-            if tech_file.exists():
-                with tech_file.open("r", encoding="utf8") as f:
-                    technologies: dict = json.load(f)
-                all_techs.update(technologies.keys())
-        return all_techs
-
 
 class TechnologyProcessor:
     def __init__(self, tech_name: str, tech_data: dict, validators: dict[str, AbstractValidator]):
@@ -467,4 +515,6 @@ class TechnologyProcessor:
 if __name__ == '__main__':
     # for letter in string.ascii_lowercase + "_":
     #     TechnologiesValidator(os.getenv("TECH_FILE_NAME", f"{letter}.json")).validate()
+    RegexRegistry.shared().load(RegexRegistry.default_cache_path())
     TechnologiesValidator(os.getenv("TECH_FILE_NAME")).validate()
+    RegexRegistry.shared().save(RegexRegistry.default_cache_path())
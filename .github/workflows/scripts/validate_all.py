@@ -0,0 +1,81 @@
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+from typing import Final, Optional
+
+from technology_validator import RegexRegistry, TechnologiesValidator, ValidationContext
+from validation_cache import ValidationCache
+
+_context: Optional[ValidationContext] = None
+
+
+def _init_worker(context: Optional[ValidationContext]) -> None:
+    global _context
+    if context is not None:
+        _context = context
+
+
+def _validate(item: tuple[str, set[str]]) -> tuple[str, list[tuple[Optional[str], str]], dict[str, Optional[str]]]:
+    file_name, techs = item
+    validator: TechnologiesValidator = TechnologiesValidator(file_name, _context)
+    errors: list[tuple[Optional[str], str]] = [(tech, f"{file_name}: {type(e).__name__}: {e}") for tech, e in validator.errors(techs)]
+    return file_name, errors, RegexRegistry.shared().outcomes()
+
+
+class AllTechnologiesValidator:
+    def __init__(self, workers: Optional[int] = None, use_cache: bool = True):
+        self._SOURCE_DIR: Final[str] = "src"
+        self._TECH_DIR: Final[str] = "technologies"
+        self._FULL_TECH_DIR: Final[pathlib.Path] = pathlib.Path(self._SOURCE_DIR).joinpath(self._TECH_DIR)
+        self._WORKERS: Final[int] = workers or os.cpu_count() or 1
+        self._USE_CACHE: Final[bool] = use_cache
+
+    def validate(self) -> None:
+        global _context
+        _context = ValidationContext()
+        cache: Optional[ValidationCache] = ValidationCache(_context) if self._USE_CACHE else None
+        regexes: RegexRegistry = RegexRegistry.shared()
+        if self._USE_CACHE:
+            regexes.load(RegexRegistry.default_cache_path())
+        file_names: list[str] = sorted(tech_file.name for tech_file in self._FULL_TECH_DIR.iterdir() if tech_file.suffix == ".json")
+        technologies: dict[str, dict] = {file_name: json.loads(_context.sources[file_name]) for file_name in file_names}
+        pending: dict[str, set[str]] = {
+            file_name: {tech for tech, data in techs.items() if cache is None or not cache.is_valid(file_name, tech, data)}
+            for file_name, techs in technologies.items()
+        }
+        fork: bool = "fork" in multiprocessing.get_all_start_methods()
+        mp_context: multiprocessing.context.BaseContext = multiprocessing.get_context("fork" if fork else "spawn")
+        errors: list[str] = []
+        # forked workers inherit the loaded context, spawned ones receive a pickled copy once
+        with concurrent.futures.ProcessPoolExecutor(self._WORKERS, mp_context=mp_context, initializer=_init_worker, initargs=(None if fork else _context,)) as executor:
+            # every file is still parsed by a worker so duplicated keys are caught even when nothing changed
+            for file_name, file_errors, outcomes in executor.map(_validate, pending.items()):
+                regexes.merge(outcomes)
+                errors.extend(error for _, error in file_errors)
+                if cache is None or any(tech is None for tech, _ in file_errors):
+                    continue
+                failed: set[Optional[str]] = {tech for tech, _ in file_errors}
+                for tech in pending[file_name] - failed:
+                    cache.record(file_name, tech, technologies[file_name][tech])
+        if cache is not None:
+            cache.save()
+            regexes.save(RegexRegistry.default_cache_path())
+        for error in errors:
+            print(error, file=sys.stderr)
+        if errors:
+            print(f"{len(errors)} invalid technologies in {len(file_names)} files", file=sys.stderr)
+            sys.exit(1)
+        validated: int = sum(len(techs) for techs in pending.values())
+        print(f"{len(_context.all_techs)} technologies in {len(file_names)} files are valid ({validated} validated, {len(_context.all_techs) - validated} cached)")
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args: argparse.Namespace = parser.parse_args()
+    AllTechnologiesValidator(args.workers, not args.no_cache).validate()
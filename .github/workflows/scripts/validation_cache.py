@@ -0,0 +1,117 @@
+import hashlib
+import importlib.metadata
+import json
+import pathlib
+import sys
+from typing import Final, Any, Optional
+
+from technology_validator import ValidationContext
+
+
+class ValidationCache:
+    VERSION: Final[int] = 1
+    # installed packages whose behaviour decides validation results
+    PACKAGES: Final[tuple[str, ...]] = ("beautifulsoup4", "soupsieve", "jsonschema")
+
+    def __init__(self, context: ValidationContext, path: pathlib.Path = pathlib.Path(".cache").joinpath("validation.json")):
+        self._PATH: Final[pathlib.Path] = path
+        self._context: Final[ValidationContext] = context
+        self._categories: Final[set[int]] = set(context.categories)
+        self._references: Final[dict[str, str]] = {
+            "validator": self._digest([source.read_text(encoding="utf8") for source in self._validator_sources()] + self._environment()),
+            "categories": self._digest(sorted(context.categories)),
+            "icons": self._digest(sorted(context.icons)),
+            "techs": self._digest(sorted(context.all_techs))
+        }
+        self._previous_references: dict[str, str] = {}
+        self._previous: dict[str, dict] = {}
+        self._entries: Final[dict[str, dict]] = {}
+        self._load()
+
+    def is_valid(self, file_name: str, tech: str, data: Any) -> bool:
+        key: str = f"{file_name}/{tech}"
+        entry: Optional[dict] = self._previous.get(key)
+        if entry is None or entry["hash"] != self._digest([file_name, tech, data]):
+            return False
+        if not self._references_exist(entry):
+            return False
+        self._entries[key] = entry
+        return True
+
+    def record(self, file_name: str, tech: str, data: Any) -> None:
+        refs: list[str] = []
+        for field in ("implies", "requires", "excludes"):
+            refs.extend(ref.split(r"\;")[0] for ref in data.get(field, []))
+        self._entries[f"{file_name}/{tech}"] = {
+            "hash": self._digest([file_name, tech, data]),
+            "cats": sorted(set(data.get("cats", []) + data.get("requiresCategory", []))),
+            "icon": data.get("icon"),
+            "techs": sorted(set(refs))
+        }
+
+    def save(self) -> None:
+        self._PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = self._PATH.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf8") as f:
+            json.dump({"version": self.VERSION, "references": self._references, "entries": self._entries}, f)
+        tmp.replace(self._PATH)
+
+    def _load(self) -> None:
+        if not self._PATH.exists():
+            return
+        try:
+            with self._PATH.open("r", encoding="utf8") as f:
+                cached: dict = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(cached, dict) or cached.get("version") != self.VERSION:
+            return
+        references: Any = cached.get("references")
+        entries: Any = cached.get("entries")
+        if not isinstance(references, dict) or not isinstance(entries, dict) or references.get("validator") != self._references["validator"]:
+            return
+        self._previous_references = references
+        self._previous = entries
+
+    def _references_exist(self, entry: dict) -> bool:
+        # a reference set only needs checking entry by entry when it changed since the cached run
+        if self._changed("categories") and not all(cat in self._categories for cat in entry["cats"]):
+            return False
+        if self._changed("icons") and entry["icon"] is not None and entry["icon"] not in self._context.icons:
+            return False
+        if self._changed("techs") and not all(ref in self._context.all_techs for ref in entry["techs"]):
+            return False
+        return True
+
+    def _changed(self, reference: str) -> bool:
+        return self._previous_references.get(reference) != self._references[reference]
+
+    @staticmethod
+    def _validator_sources() -> list[pathlib.Path]:
+        here: pathlib.Path = pathlib.Path(__file__).resolve()
+        scripts: pathlib.Path = here.parents[3].joinpath("scripts")
+        # patterns are translated, compiled and their version templates parsed by the runtime modules
+        return [
+            here.with_name("technology_validator.py"),
+            here.with_name("validate_all.py"),
+            here,
+            scripts.joinpath("regex_dialect.py"),
+            scripts.joinpath("regex_registry.py"),
+            scripts.joinpath("regex_backend.py"),
+            scripts.joinpath("patterns.py"),
+        ]
+
+    @classmethod
+    def _environment(cls) -> list[str]:
+        # re itself changes between Python versions
+        environment: list[str] = [sys.version.split()[0]]
+        for package in cls.PACKAGES:
+            try:
+                environment.append(f"{package}=={importlib.metadata.version(package)}")
+            except importlib.metadata.PackageNotFoundError:
+                environment.append(f"{package} missing")
+        return environment
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf8")).hexdigest()
@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+from typing import Final, AsyncIterable, AsyncIterator, Iterable, Optional
+
+from engine import Detection, Engine, Hits, Snapshot
+from fingerprint_store import LiveEngine
+
+
+class UnsupportedExecutorException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class AsyncScanner:
+    HEAVY_FIELDS: Final[tuple[str, ...]] = ("html", "scripts", "text", "css", "dom")
+
+    def __init__(self, engine: Engine | LiveEngine, executor: Optional[concurrent.futures.ThreadPoolExecutor] = None, max_pending: int = 64):
+        if executor is not None and not isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            raise UnsupportedExecutorException(f"{type(executor).__name__} can't run the heavy fields, use a ThreadPoolExecutor")
+        self._engine: Final[Engine | LiveEngine] = engine
+        # the heavy fields add to the same hits and share the loaded engine, so only threads work here, not processes
+        self._executor: Final[Optional[concurrent.futures.ThreadPoolExecutor]] = executor
+        self._MAX_PENDING: Final[int] = max_pending
+        self._INLINE_FIELDS: Final[tuple[str, ...]] = tuple(field for field in Engine.fields() if field not in self.HEAVY_FIELDS)
+
+    async def analyze(self, snapshot: Snapshot) -> list[Detection]:
+        # a live engine can be swapped mid scan, hits only make sense against the engine that produced them
+        engine: Engine = self._engine.engine if isinstance(self._engine, LiveEngine) else self._engine
+        hits: Hits = engine.match(snapshot, self._INLINE_FIELDS)
+        if snapshot.html or snapshot.scripts or snapshot.text or snapshot.css:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            # every field is passed so requires-gated technologies unlocked by the heavy fields get evaluated too
+            hits = await loop.run_in_executor(self._executor, engine.match, snapshot, None, hits)
+        return engine.resolve(hits)
+
+    async def scan(self, snapshots: AsyncIterable[Snapshot] | Iterable[Snapshot]) -> AsyncIterator[tuple[Snapshot, list[Detection]]]:
+        results: asyncio.Queue = asyncio.Queue()
+        slots: asyncio.Semaphore = asyncio.Semaphore(self._MAX_PENDING)
+        finished: object = object()
+        tasks: set[asyncio.Task] = set()
+
+        async def run(snapshot: Snapshot) -> None:
+            try:
+                await results.put((snapshot, await self.analyze(snapshot), None))
+            except Exception as e:
+                await results.put((snapshot, None, e))
+
+        async def feed() -> None:
+            try:
+                async for snapshot in self._iterate(snapshots):
+                    await slots.acquire()
+                    task: asyncio.Task = asyncio.create_task(run(snapshot))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                await asyncio.gather(*tasks)
+            finally:
+                # the consumer waits on the queue, it has to wake up even when the source fails, awaiting the feeder re-raises
+                results.put_nowait(finished)
+
+        feeder: asyncio.Task = asyncio.create_task(feed())
+        try:
+            while (item := await results.get()) is not finished:
+                # a slot stays taken until its result is consumed, so a slow consumer throttles the feed
+                slots.release()
+                snapshot, detections, error = item
+                if error is not None:
+                    raise error
+                yield snapshot, detections
+            await feeder
+        finally:
+            feeder.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    @staticmethod
+    async def _iterate(snapshots: AsyncIterable[Snapshot] | Iterable[Snapshot]) -> AsyncIterator[Snapshot]:
+        if isinstance(snapshots, AsyncIterable):
+            async for snapshot in snapshots:
+                yield snapshot
+        else:
+            for snapshot in snapshots:
+                yield snapshot
@@ -0,0 +1,361 @@
+import argparse
+import hashlib
+import io
+import json
+import pathlib
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Final, Any, Optional
+
+from bundle import Bundle, BundleFormat
+from engine import Snapshot
+from regex_backend import BACKENDS
+from regex_registry import RegexRegistry
+
+try:
+    from bs4 import BeautifulSoup
+    from soupsieve import SelectorSyntaxError
+except ImportError:
+    BeautifulSoup = None
+    SelectorSyntaxError = None
+
+
+class CorpusGenerator:
+    WORDS: Final[tuple[str, ...]] = (
+        "home", "about", "contact", "product", "service", "news", "blog", "shop", "cart", "account", "search", "menu",
+        "content", "footer", "header", "main", "section", "article", "widget", "banner", "slider", "gallery", "form",
+        "button", "login", "price", "offer", "support", "team", "career", "privacy", "terms", "cookie", "policy"
+    )
+    HEADERS: Final[dict[str, tuple[str, ...]]] = {
+        "content-type": ("text/html; charset=utf-8", "text/html"),
+        "cache-control": ("max-age=0, no-cache", "public, max-age=3600", "private"),
+        "vary": ("Accept-Encoding", "Accept-Encoding, Cookie"),
+        "server": ("nginx", "Apache", "cloudflare", "Microsoft-IIS/10.0", "LiteSpeed"),
+        "x-powered-by": ("PHP/8.1.2", "Express", "ASP.NET", "Next.js"),
+    }
+
+    def __init__(self, bundle: Bundle, seed: int = 0, pages: int = 40, page_size: int = 60000):
+        self._bundle: Final[Bundle] = bundle
+        self._SEED: Final[int] = seed
+        self._PAGES: Final[int] = pages
+        self._PAGE_SIZE: Final[int] = page_size
+        self._literals: Final[dict[str, list[str]]] = self._field_literals()
+
+    def generate(self) -> list[dict[str, Any]]:
+        rng: random.Random = random.Random(self._SEED)
+        return [self._page(rng, page) for page in range(self._PAGES)]
+
+    def write(self, directory: pathlib.Path) -> list[pathlib.Path]:
+        directory.mkdir(parents=True, exist_ok=True)
+        paths: list[pathlib.Path] = []
+        for page, snapshot in enumerate(self.generate()):
+            path: pathlib.Path = directory.joinpath(f"page-{page:04d}.json")
+            with path.open("w", encoding="utf8") as f:
+                json.dump(snapshot, f, indent=2, sort_keys=True)
+            paths.append(path)
+        return paths
+
+    def _page(self, rng: random.Random, page: int) -> dict[str, Any]:
+        host: str = f"www.{rng.choice(self.WORDS)}{page}.example"
+        script_src: list[str] = [self._script_url(rng) for _ in range(rng.randint(4, 16))]
+        scripts: list[str] = [self._script(rng) for _ in range(rng.randint(1, 4))]
+        meta: dict[str, str] = {key: self._fragment(rng, "meta") for key in rng.sample(self._keys("meta"), min(4, len(self._keys("meta"))))}
+        headers: dict[str, str] = {key: rng.choice(values) for key, values in self.HEADERS.items()}
+        for key in rng.sample(self._keys("headers"), min(6, len(self._keys("headers")))):
+            headers[key] = self._fragment(rng, "headers")
+        cookies: dict[str, str] = {key: f"{rng.getrandbits(64):016x}" for key in rng.sample(self._keys("cookies"), min(5, len(self._keys("cookies"))))}
+        text: str = " ".join(self._sentence(rng) for _ in range(self._PAGE_SIZE // 400))
+        css: str = "\n".join(f".{rng.choice(self.WORDS)}-{rng.randint(0, 99)} {{ margin: {rng.randint(0, 20)}px; }}" for _ in range(40))
+        css += "\n" + "\n".join(f"/* {self._fragment(rng, 'css')} */" for _ in range(4))
+        return {
+            "url": f"https://{host}/{rng.choice(self.WORDS)}/",
+            "html": self._html(rng, host, meta, script_src, scripts, text),
+            "text": text,
+            "css": css,
+            "robots": "User-agent: *\nDisallow: /" + "\nDisallow: /".join(rng.sample(self.WORDS, 4)),
+            "certIssuer": rng.choice(("R3", "Let's Encrypt", "DigiCert Inc", "Sectigo Limited")),
+            "scripts": scripts,
+            "scriptSrc": script_src,
+            "xhr": [f"https://{host}/api/{rng.choice(self.WORDS)}" for _ in range(3)],
+            "headers": headers,
+            "cookies": cookies,
+            "meta": meta,
+        }
+
+    def _html(self, rng: random.Random, host: str, meta: dict[str, str], script_src: list[str], scripts: list[str], text: str) -> str:
+        parts: list[str] = ["<!DOCTYPE html>", "<html lang=\"en\">", "<head>", f"<title>{rng.choice(self.WORDS).title()} | {host}</title>"]
+        parts.extend(f"<meta name=\"{key}\" content=\"{value}\">" for key, value in meta.items())
+        parts.extend(f"<script src=\"{src}\"></script>" for src in script_src)
+        parts.append("</head>")
+        parts.append(f"<body class=\"{' '.join(rng.sample(self.WORDS, 3))}\">")
+        words: list[str] = text.split(" ")
+        size: int = sum(len(part) for part in parts)
+        while size < self._PAGE_SIZE:
+            tag: str = rng.choice(("div", "section", "p", "span", "a", "li", "article"))
+            start: int = rng.randrange(len(words))
+            block: str = f"<{tag} id=\"{rng.choice(self.WORDS)}-{rng.randint(0, 999)}\" class=\"{rng.choice(self.WORDS)}\">{' '.join(words[start:start + 30])}</{tag}>"
+            if rng.random() < 0.05:
+                block += f"<!-- {self._fragment(rng, 'html')} -->"
+            parts.append(block)
+            size += len(block)
+        parts.extend(f"<script>{script}</script>" for script in scripts)
+        parts.append("</body></html>")
+        return "\n".join(parts)
+
+    def _script_url(self, rng: random.Random) -> str:
+        version: str = f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}"
+        name: str = self._fragment(rng, "scriptSrc").strip("/") or rng.choice(self.WORDS)
+        return f"https://cdn.{rng.choice(self.WORDS)}.example/{version}/{name}.min.js?ver={version}"
+
+    def _script(self, rng: random.Random) -> str:
+        statements: list[str] = [f"var {rng.choice(self.WORDS)}{index} = \"{self._fragment(rng, 'scripts')}\";" for index in range(rng.randint(5, 40))]
+        return "\n".join(statements)
+
+    def _sentence(self, rng: random.Random) -> str:
+        return " ".join(rng.choice(self.WORDS) for _ in range(rng.randint(5, 15))) + "."
+
+    def _fragment(self, rng: random.Random, field: str) -> str:
+        literals: list[str] = self._literals.get(field, [])
+        if not literals or rng.random() < 0.5:
+            return rng.choice(self.WORDS)
+        return rng.choice(literals)
+
+    def _keys(self, field: str) -> list[str]:
+        return sorted(self._bundle.keys[field])
+
+    def _field_literals(self) -> dict[str, list[str]]:
+        # literals the prefilter keys on make realistic near-misses and some real matches
+        literals: dict[str, set[str]] = {}
+        for tech in self._bundle.technologies:
+            for field, entries in tech[BundleFormat.TECH_PATTERNS].items():
+                if field == BundleFormat.DOM_FIELD:
+                    continue
+                for entry in entries:
+                    pattern_id: int = entry[-1] if isinstance(entry, tuple) else entry
+                    literals.setdefault(field, set()).update(self._bundle.pattern_literals(pattern_id))
+        return {field: sorted(values) for field, values in literals.items()}
+
+
+class PatternBenchmark:
+    def __init__(self, bundle: Bundle, snapshots: list[Snapshot], repeat: int = 3, regexes: Optional[RegexRegistry] = None):
+        self._bundle: Final[Bundle] = bundle
+        self._snapshots: Final[list[Snapshot]] = snapshots
+        self._REPEAT: Final[int] = repeat
+        self._regexes: Final[RegexRegistry] = regexes if regexes is not None else RegexRegistry.shared()
+
+    def run(self, fields: tuple[str, ...]) -> dict[str, Any]:
+        # (regex or selector, field) -> names of the technologies using it
+        usages: dict[tuple[str, str], set[str]] = {}
+        # (regex or selector, field, key) -> seconds, the key is empty outside keyed fields
+        costs: dict[tuple[str, str, str], float] = {}
+        # (regex or selector, field) -> why it couldn't be measured
+        failures: dict[tuple[str, str], str] = {}
+        for field in fields:
+            if field in BundleFormat.LIST_FIELDS:
+                values: list[list[str]] = [snapshot.values(field) for snapshot in self._snapshots]
+                for tech_id, pattern_id in self._list_entries(field):
+                    self._measure(field, "", pattern_id, values, tech_id, usages, costs)
+            elif field in BundleFormat.KEYED_FIELDS:
+                items: list[dict[str, list[str]]] = [snapshot.keyed(field) for snapshot in self._snapshots]
+                for key, entries in sorted(self._bundle.keys[field].items()):
+                    values = [page.get(key, []) for page in items]
+                    for tech_id, pattern_id in entries:
+                        self._measure(field, key, pattern_id, values, tech_id, usages, costs)
+            elif field == BundleFormat.DOM_FIELD:
+                self._measure_dom(usages, costs, failures)
+        return self._report(usages, costs, failures)
+
+    def _list_entries(self, field: str) -> list[tuple[int, int]]:
+        return [
+            (tech_id, pattern_id)
+            for tech_id, tech in enumerate(self._bundle.technologies)
+            for pattern_id in tech[BundleFormat.TECH_PATTERNS].get(field, ())
+        ]
+
+    def _measure(self, field: str, item_key: str, pattern_id: int, values: list[list[str]], tech_id: int, usages: dict, costs: dict) -> None:
+        regex: str = self._bundle.strings[self._bundle.patterns[pattern_id][BundleFormat.PATTERN_REGEX]]
+        usages.setdefault((regex, field), set()).add(self._bundle.tech_name(tech_id))
+        # the same regex under two header names runs against different values, each one costs its own time
+        key: tuple[str, str, str] = (regex, field, item_key)
+        if key in costs:
+            return
+        compiled: Any = self._regexes.compile(regex, self._bundle.backends[pattern_id])
+        best: float = float("inf")
+        for _ in range(self._REPEAT):
+            start: float = time.perf_counter()
+            for page in values:
+                for value in page:
+                    compiled.search(value)
+            best = min(best, time.perf_counter() - start)
+        costs[key] = best
+
+    def _measure_dom(self, usages: dict, costs: dict, failures: dict) -> None:
+        if BeautifulSoup is None:
+            return
+        soups: list = [BeautifulSoup(snapshot.html, "html.parser") for snapshot in self._snapshots if snapshot.html]
+        for tech_id, tech in enumerate(self._bundle.technologies):
+            for selector_id, _, _, _ in tech[BundleFormat.TECH_PATTERNS].get(BundleFormat.DOM_FIELD, ()):
+                selector: str = self._bundle.strings[selector_id]
+                key: tuple[str, str] = (selector, BundleFormat.DOM_FIELD)
+                usages.setdefault(key, set()).add(self._bundle.tech_name(tech_id))
+                if (*key, "") in costs or key in failures:
+                    continue
+                start: float = time.perf_counter()
+                try:
+                    for soup in soups:
+                        soup.select(selector)
+                except SelectorSyntaxError as e:
+                    # a partial run would understate its cost, so it's reported apart from the measured ones
+                    failures[key] = str(e).splitlines()[0]
+                    continue
+                costs[(*key, "")] = time.perf_counter() - start
+
+    def _report(self, usages: dict, costs: dict, failures: dict) -> dict[str, Any]:
+        fields: dict[str, float] = {}
+        technologies: dict[str, float] = {}
+        patterns: list[dict[str, Any]] = []
+        summed: dict[tuple[str, str], float] = {}
+        for (regex, field, _), seconds in costs.items():
+            summed[(regex, field)] = summed.get((regex, field), 0.0) + seconds
+        for (regex, field), seconds in summed.items():
+            fields[field] = fields.get(field, 0.0) + seconds
+            names: list[str] = sorted(usages[(regex, field)])
+            for name in names:
+                technologies[name] = technologies.get(name, 0.0) + seconds
+            patterns.append({"field": field, "regex": regex, "seconds": seconds, "technologies": names})
+        patterns.sort(key=lambda pattern: -pattern["seconds"])
+        return {
+            "content_hash": self._bundle.content_hash.hex(),
+            "corpus": self.corpus_digest(self._snapshots),
+            "total": sum(fields.values()),
+            "fields": dict(sorted(fields.items(), key=lambda item: -item[1])),
+            "technologies": dict(sorted(technologies.items(), key=lambda item: -item[1])),
+            "patterns": patterns,
+            "failures": [
+                {"field": field, "regex": regex, "error": error, "technologies": sorted(usages[(regex, field)])}
+                for (regex, field), error in sorted(failures.items())
+            ],
+        }
+
+    @staticmethod
+    def corpus_digest(snapshots: list[Snapshot]) -> str:
+        digest = hashlib.sha256()
+        for snapshot in snapshots:
+            digest.update(json.dumps(vars(snapshot), sort_keys=True).encode("utf8"))
+        return digest.hexdigest()
+
+
+class BenchmarkComparison:
+    def __init__(self, base: dict[str, Any], head: dict[str, Any], threshold: float = 1.5, min_seconds: float = 0.005):
+        self._base: Final[dict[str, Any]] = base
+        self._head: Final[dict[str, Any]] = head
+        self._THRESHOLD: Final[float] = threshold
+        self._MIN_SECONDS: Final[float] = min_seconds
+
+    @property
+    def same_corpus(self) -> bool:
+        return self._base["corpus"] == self._head["corpus"]
+
+    def regressions(self) -> list[tuple[str, float, float]]:
+        regressions: list[tuple[str, float, float]] = []
+        for name, seconds in self._head["technologies"].items():
+            before: float = self._base["technologies"].get(name, 0.0)
+            if seconds - before > self._MIN_SECONDS and seconds > before * self._THRESHOLD:
+                regressions.append((name, before, seconds))
+        return sorted(regressions, key=lambda regression: regression[1] - regression[2])
+
+    def fields(self) -> list[tuple[str, float, float]]:
+        names: list[str] = sorted(set(self._base["fields"]) | set(self._head["fields"]))
+        return [(name, self._base["fields"].get(name, 0.0), self._head["fields"].get(name, 0.0)) for name in names]
+
+
+def checkout_source(revision: str, directory: pathlib.Path) -> pathlib.Path:
+    archive: bytes = subprocess.run(["git", "archive", "--format=tar", revision, "src"], check=True, capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+    return directory.joinpath("src")
+
+
+def load_corpus(directory: pathlib.Path) -> list[Snapshot]:
+    snapshots: list[Snapshot] = []
+    for path in sorted(directory.glob("*.json")):
+        with path.open("r", encoding="utf8") as f:
+            snapshots.append(Snapshot.from_dict(json.load(f)))
+    return snapshots
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    corpus_parser: argparse.ArgumentParser = commands.add_parser("corpus", help="write the synthetic corpus")
+    run_parser: argparse.ArgumentParser = commands.add_parser("run", help="time every pattern against the corpus")
+    for sub in (corpus_parser, run_parser):
+        sub.add_argument("--seed", type=int, default=0)
+        sub.add_argument("--pages", type=int, default=40)
+        sub.add_argument("--page-size", type=int, default=60000)
+    corpus_parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("build").joinpath("bench-corpus"))
+    run_parser.add_argument("--corpus", type=pathlib.Path, default=None, help="corpus directory, generated from the current data when missing")
+    run_parser.add_argument("--revision", default=None, help="git revision whose src/ is benchmarked")
+    run_parser.add_argument("--fields", nargs="+", default=list(BundleFormat.LIST_FIELDS + BundleFormat.KEYED_FIELDS))
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--top", type=int, default=20)
+    run_parser.add_argument("--backends", nargs="+", choices=[backend.NAME for backend in BACKENDS], default=list(RegexRegistry.DEFAULT_BACKENDS), help="regex backends patterns are routed to")
+    run_parser.add_argument("--output", type=pathlib.Path, default=None)
+    compare_parser: argparse.ArgumentParser = commands.add_parser("compare", help="compare two benchmark reports")
+    compare_parser.add_argument("base", type=pathlib.Path)
+    compare_parser.add_argument("head", type=pathlib.Path)
+    compare_parser.add_argument("--threshold", type=float, default=1.5)
+    compare_parser.add_argument("--min-seconds", type=float, default=0.005)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.command == "corpus":
+        paths: list[pathlib.Path] = CorpusGenerator(Bundle.from_source(), args.seed, args.pages, args.page_size).write(args.output)
+        print(f"wrote {len(paths)} snapshots to {args.output}")
+    elif args.command == "run":
+        with tempfile.TemporaryDirectory() as directory:
+            source_dir: pathlib.Path = checkout_source(args.revision, pathlib.Path(directory)) if args.revision else pathlib.Path("src")
+            bundle: Bundle = Bundle.from_source(source_dir)
+            if args.corpus is not None:
+                snapshots: list[Snapshot] = load_corpus(args.corpus)
+            else:
+                snapshots = [Snapshot.from_dict(page) for page in CorpusGenerator(Bundle.from_source(), args.seed, args.pages, args.page_size).generate()]
+            report: dict[str, Any] = PatternBenchmark(bundle, snapshots, args.repeat, RegexRegistry(backends=args.backends)).run(tuple(args.fields))
+        report["revision"] = args.revision
+        if args.output is not None:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            with args.output.open("w", encoding="utf8") as f:
+                json.dump(report, f, indent=2)
+        print(f"total {report['total'] * 1000:.1f} ms over {len(snapshots)} pages")
+        for field, seconds in report["fields"].items():
+            print(f"  {field:<12} {seconds * 1000:10.2f} ms")
+        print("slowest technologies:")
+        for name, seconds in list(report["technologies"].items())[:args.top]:
+            print(f"  {seconds * 1000:10.2f} ms  {name}")
+        print("slowest patterns:")
+        for pattern in report["patterns"][:args.top]:
+            print(f"  {pattern['seconds'] * 1000:10.2f} ms  {pattern['field']:<10} {', '.join(pattern['technologies'])}: {pattern['regex']}")
+        for failure in report["failures"]:
+            print(f"warning: couldn't measure {failure['field']} '{failure['regex']}' ({', '.join(failure['technologies'])}): {failure['error']}", file=sys.stderr)
+    else:
+        with args.base.open("r", encoding="utf8") as f:
+            base: dict[str, Any] = json.load(f)
+        with args.head.open("r", encoding="utf8") as f:
+            head: dict[str, Any] = json.load(f)
+        comparison: BenchmarkComparison = BenchmarkComparison(base, head, args.threshold, args.min_seconds)
+        if not comparison.same_corpus:
+            print("warning: the reports were produced on different corpora", file=sys.stderr)
+        for field, before, after in comparison.fields():
+            print(f"  {field:<12} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms")
+        regressions: list[tuple[str, float, float]] = comparison.regressions()
+        for name, before, after in regressions:
+            print(f"regression: {name} {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,452 @@
+import hashlib
+import json
+import marshal
+import mmap
+import pathlib
+import re
+import string
+import struct
+import threading
+from re import _parser as sre_parse
+from typing import Final, Any, Optional
+
+from patterns import PatternParser, ParsedPattern, TemplatePart, VersionTemplate
+from prefilter import LiteralExtractor
+from regex_backend import CompatibilityClassifier
+from regex_dialect import JsRegexTranslator, UntranslatablePatternException
+
+
+class InvalidBundleException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class TechNotFoundException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class ImpliesCycleException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class BundleFormat:
+    MAGIC: Final[bytes] = b"WAPB"
+    VERSION: Final[int] = 7
+    # magic, version, reserved, content hash, matcher payload size, metadata size
+    HEADER: Final[struct.Struct] = struct.Struct("<4sHH32sQQ")
+    NONE: Final[int] = -1
+
+    LIST_FIELDS: Final[tuple[str, ...]] = ("url", "xhr", "html", "text", "css", "robots", "scriptSrc", "scripts", "certIssuer")
+    KEYED_FIELDS: Final[tuple[str, ...]] = ("headers", "cookies", "meta", "js", "dns", "probe")
+    CASE_SENSITIVE_FIELDS: Final[tuple[str, ...]] = ("js",)
+    DOM_FIELD: Final[str] = "dom"
+
+    DOM_EXISTS: Final[int] = 0
+    DOM_ATTRIBUTE: Final[int] = 1
+    DOM_PROPERTY: Final[int] = 2
+    DOM_TEXT: Final[int] = 3
+
+    PATTERN_REGEX: Final[int] = 0
+    PATTERN_VERSION: Final[int] = 1
+    PATTERN_CONFIDENCE: Final[int] = 2
+
+    TECH_NAME: Final[int] = 0
+    TECH_CATS: Final[int] = 1
+    TECH_GROUPS: Final[int] = 2
+    TECH_PATTERNS: Final[int] = 3
+    TECH_IMPLIES: Final[int] = 4
+    TECH_REQUIRES: Final[int] = 5
+    TECH_REQUIRES_CATEGORY: Final[int] = 6
+    TECH_EXCLUDES: Final[int] = 7
+
+    METADATA_FIELDS: Final[tuple[str, ...]] = ("description", "website", "icon", "cpe", "saas", "oss", "pricing")
+
+    @classmethod
+    def normalize_key(cls, field: str, key: str) -> str:
+        return key if field in cls.CASE_SENSITIVE_FIELDS else key.lower()
+
+
+class BundleBuilder:
+    def __init__(self, source_dir: pathlib.Path = pathlib.Path("src"), previous: Optional["Bundle"] = None):
+        self._SOURCE_DIR: Final[pathlib.Path] = source_dir
+        self._TECH_DIR: Final[str] = "technologies"
+        self._FULL_TECH_DIR: Final[pathlib.Path] = self._SOURCE_DIR.joinpath(self._TECH_DIR)
+        self._CATEGORIES_FILE: Final[pathlib.Path] = self._SOURCE_DIR.joinpath("categories.json")
+        self._GROUPS_FILE: Final[pathlib.Path] = self._SOURCE_DIR.joinpath("groups.json")
+        self._translator: Final[JsRegexTranslator] = JsRegexTranslator()
+        # literals and backend masks only depend on the regex, a rebuild takes them from the bundle it replaces
+        self._previous: Final[dict[str, tuple[tuple[str, ...], int]]] = {} if previous is None else {
+            previous.strings[regex_id]: (previous.pattern_literals(pattern_id), previous.backends[pattern_id])
+            for pattern_id, (regex_id, _, _) in enumerate(previous.patterns)
+        }
+        self._strings: dict[str, int] = {}
+        self._patterns: dict[tuple[int, int, int], int] = {}
+        self._sources: dict[int, int] = {}
+
+    def build(self, output: pathlib.Path = pathlib.Path("build").joinpath("technologies.bundle")) -> pathlib.Path:
+        content_hash, payload, metadata = self.compile()
+        data: bytes = marshal.dumps(payload)
+        cold: bytes = marshal.dumps(metadata)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = output.with_name(f"{output.name}.tmp")
+        with tmp.open("wb") as f:
+            f.write(BundleFormat.HEADER.pack(BundleFormat.MAGIC, BundleFormat.VERSION, 0, content_hash, len(data), len(cold)))
+            f.write(data)
+            f.write(cold)
+        tmp.replace(output)
+        return output
+
+    def compile(self) -> tuple[bytes, dict[str, Any], tuple[tuple, ...]]:
+        digest = hashlib.sha256()
+        sources: list[pathlib.Path] = [self._CATEGORIES_FILE, self._GROUPS_FILE] + self.tech_files()
+        raw: dict[pathlib.Path, bytes] = {}
+        for source in sources:
+            raw[source] = source.read_bytes()
+            digest.update(source.name.encode("utf8"))
+            digest.update(raw[source])
+        technologies: dict[str, dict] = {}
+        for source in sources[2:]:
+            technologies.update(json.loads(raw[source]))
+        return self.assemble(digest.digest(), json.loads(raw[self._CATEGORIES_FILE]), json.loads(raw[self._GROUPS_FILE]), technologies)
+
+    def assemble(self, content_hash: bytes, categories: dict[str, dict], groups: dict[str, dict], technologies: dict[str, dict]) -> tuple[bytes, dict[str, Any], tuple[tuple, ...]]:
+        self._strings = {}
+        self._patterns = {}
+        self._sources = {}
+        category_groups: dict[int, tuple[int, ...]] = {int(cat): tuple(data["groups"]) for cat, data in categories.items()}
+        tech_ids: dict[str, int] = {name: tech_id for tech_id, name in enumerate(technologies)}
+        payload: dict[str, Any] = {
+            "groups": tuple((int(group), self._intern(data["name"])) for group, data in groups.items()),
+            "categories": tuple((int(cat), self._intern(data["name"]), data["priority"], tuple(data["groups"])) for cat, data in categories.items()),
+            "technologies": tuple(self._technology(name, data, tech_ids, category_groups) for name, data in technologies.items()),
+        }
+        # metadata is never matched against, it stays out of the string table so loading the matcher doesn't pay for it
+        metadata: tuple[tuple, ...] = tuple(tuple(data.get(field) for field in BundleFormat.METADATA_FIELDS) for data in technologies.values())
+        payload["keys"] = self._key_index(payload["technologies"])
+        payload["implies"] = self._implies_closure(payload["technologies"])
+        payload["excludes"] = tuple(
+            tuple(sorted({excluded for tech_id in (source_id, *(implied_id for implied_id, _, _ in implied)) for excluded in payload["technologies"][tech_id][BundleFormat.TECH_EXCLUDES]}))
+            for source_id, implied in enumerate(payload["implies"])
+        )
+        payload["patterns"] = tuple(self._patterns)
+        payload["literals"] = self._literals()
+        payload["backends"] = self._backends()
+        payload["templates"] = self._templates()
+        payload["sources"] = dict(self._sources)
+        payload["strings"] = tuple(self._strings)
+        return content_hash, payload, metadata
+
+    def _implies_closure(self, technologies: tuple[tuple, ...]) -> tuple[tuple[tuple[int, int, int], ...], ...]:
+        strings: list[str] = list(self._strings)
+        closures: list[Optional[dict[int, tuple[int, int]]]] = [None] * len(technologies)
+        visiting: list[int] = []
+
+        def visit(tech_id: int) -> dict[int, tuple[int, int]]:
+            if closures[tech_id] is not None:
+                return closures[tech_id]
+            if tech_id in visiting:
+                cycle: list[int] = visiting[visiting.index(tech_id):] + [tech_id]
+                raise ImpliesCycleException(f"Implies cycle detected: {' -> '.join(strings[technologies[cycle_id][BundleFormat.TECH_NAME]] for cycle_id in cycle)}")
+            visiting.append(tech_id)
+            closure: dict[int, tuple[int, int]] = {}
+            for implied_id, confidence, version_id in technologies[tech_id][BundleFormat.TECH_IMPLIES]:
+                self._merge_implied(closure, implied_id, confidence, version_id)
+                for nested_id, (nested_confidence, nested_version_id) in visit(implied_id).items():
+                    self._merge_implied(closure, nested_id, min(confidence, nested_confidence), nested_version_id)
+            visiting.pop()
+            closures[tech_id] = closure
+            return closure
+
+        return tuple(
+            tuple((implied_id, confidence, version_id) for implied_id, (confidence, version_id) in sorted(visit(tech_id).items()))
+            for tech_id in range(len(technologies))
+        )
+
+    @staticmethod
+    def _merge_implied(closure: dict[int, tuple[int, int]], implied_id: int, confidence: int, version_id: int) -> None:
+        if implied_id not in closure or closure[implied_id][0] < confidence:
+            closure[implied_id] = (confidence, version_id)
+
+    def _key_index(self, technologies: tuple[tuple, ...]) -> dict[str, dict[str, tuple[tuple[int, int], ...]]]:
+        strings: list[str] = list(self._strings)
+        index: dict[str, dict[str, list[tuple[int, int]]]] = {field: {} for field in BundleFormat.KEYED_FIELDS}
+        for tech_id, tech in enumerate(technologies):
+            for field, entries in tech[BundleFormat.TECH_PATTERNS].items():
+                if field not in index:
+                    continue
+                for key_id, pattern_id in entries:
+                    index[field].setdefault(BundleFormat.normalize_key(field, strings[key_id]), []).append((tech_id, pattern_id))
+        return {field: {key: tuple(entries) for key, entries in keys.items()} for field, keys in index.items()}
+
+    def _literals(self) -> tuple[tuple[int, ...], ...]:
+        strings: list[str] = list(self._strings)
+        extractor: LiteralExtractor = LiteralExtractor()
+        regexes: list[str] = [strings[pattern[BundleFormat.PATTERN_REGEX]] for pattern in self._patterns]
+        return tuple(
+            tuple(self._intern(literal) for literal in (self._previous[regex][0] if regex in self._previous else extractor.extract(regex)))
+            for regex in regexes
+        )
+
+    def _backends(self) -> tuple[int, ...]:
+        strings: list[str] = list(self._strings)
+        classifier: CompatibilityClassifier = CompatibilityClassifier()
+        regexes: list[str] = [strings[pattern[BundleFormat.PATTERN_REGEX]] for pattern in self._patterns]
+        return tuple(self._previous[regex][1] if regex in self._previous else classifier.mask(regex) for regex in regexes)
+
+    def _templates(self) -> dict[int, tuple[TemplatePart, ...]]:
+        strings: list[str] = list(self._strings)
+        templates: dict[int, tuple[TemplatePart, ...]] = {}
+        for pattern in self._patterns:
+            version_id: int = pattern[BundleFormat.PATTERN_VERSION]
+            if version_id == BundleFormat.NONE:
+                continue
+            try:
+                groups: int = sre_parse.parse(strings[pattern[BundleFormat.PATTERN_REGEX]], re.IGNORECASE).state.groups - 1
+            except re.error:
+                continue
+            templates[version_id] = VersionTemplate.parse(strings[version_id], groups)
+        return templates
+
+    def tech_files(self) -> list[pathlib.Path]:
+        files: list[pathlib.Path] = []
+        for letter in ["_"] + list(string.ascii_lowercase):
+            tech_file: pathlib.Path = self._FULL_TECH_DIR.joinpath(f"{letter}.json")
+            if tech_file.exists():
+                files.append(tech_file)
+        return files
+
+    def _technology(self, name: str, data: dict, tech_ids: dict[str, int], category_groups: dict[int, tuple[int, ...]]) -> tuple:
+        cats: tuple[int, ...] = tuple(data["cats"])
+        groups: tuple[int, ...] = tuple(sorted({group for cat in cats for group in category_groups.get(cat, ())}))
+        patterns: dict[str, tuple] = {}
+        for field in BundleFormat.LIST_FIELDS:
+            value: Any = data.get(field)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                value = [value]
+            patterns[field] = tuple(self._pattern(PatternParser.parse(item)) for item in value)
+        for field in BundleFormat.KEYED_FIELDS:
+            value = data.get(field)
+            if value is None:
+                continue
+            entries: list[tuple[int, int]] = []
+            for key, item in value.items():
+                for pattern in item if isinstance(item, list) else [item]:
+                    entries.append((self._intern(key), self._pattern(PatternParser.parse(pattern))))
+            patterns[field] = tuple(entries)
+        if (dom := data.get(BundleFormat.DOM_FIELD)) is not None:
+            patterns[BundleFormat.DOM_FIELD] = self._dom(dom)
+        return (
+            self._intern(name),
+            cats,
+            groups,
+            patterns,
+            tuple(self._implied(name, ref, tech_ids) for ref in data.get("implies", [])),
+            tuple(self._reference(name, ref, tech_ids) for ref in data.get("requires", [])),
+            tuple(data.get("requiresCategory", [])),
+            tuple(self._reference(name, ref, tech_ids) for ref in data.get("excludes", [])),
+        )
+
+    def _dom(self, dom: list | dict) -> tuple:
+        entries: list[tuple[int, int, int, int]] = []
+        if isinstance(dom, list):
+            for selector in dom:
+                parsed: ParsedPattern = PatternParser.parse(selector)
+                entries.append((self._intern(parsed.regex), BundleFormat.DOM_EXISTS, BundleFormat.NONE, self._pattern(ParsedPattern("", parsed.version, parsed.confidence))))
+            return tuple(entries)
+        for selector, checks in dom.items():
+            selector_id: int = self._intern(selector)
+            for check, value in checks.items():
+                if check == "exists":
+                    entries.append((selector_id, BundleFormat.DOM_EXISTS, BundleFormat.NONE, self._pattern(PatternParser.parse(value))))
+                elif check == "text":
+                    entries.append((selector_id, BundleFormat.DOM_TEXT, BundleFormat.NONE, self._pattern(PatternParser.parse(value))))
+                else:
+                    kind: int = BundleFormat.DOM_ATTRIBUTE if check == "attributes" else BundleFormat.DOM_PROPERTY
+                    for attr_name, attr_value in value.items():
+                        entries.append((selector_id, kind, self._intern(attr_name), self._pattern(PatternParser.parse(attr_value))))
+        return tuple(entries)
+
+    def _implied(self, tech_name: str, ref: str, tech_ids: dict[str, int]) -> tuple[int, int, int]:
+        parsed: ParsedPattern = PatternParser.parse(ref)
+        return self._reference(tech_name, parsed.regex, tech_ids), parsed.confidence, self._optional_string(parsed.version)
+
+    @staticmethod
+    def _reference(tech_name: str, ref: str, tech_ids: dict[str, int]) -> int:
+        clean_ref: str = ref.split(PatternParser.TAG_SEPARATOR)[0]
+        if clean_ref not in tech_ids:
+            raise TechNotFoundException(f"Tech '{tech_name}' references '{clean_ref}' but it doesn't exist!")
+        return tech_ids[clean_ref]
+
+    def _pattern(self, parsed: ParsedPattern) -> int:
+        try:
+            regex: str = self._translator.translate(parsed.regex)
+        except UntranslatablePatternException as e:
+            raise UntranslatablePatternException(f"Unable to translate regex '{parsed.regex}': {e}")
+        key: tuple[int, int, int] = (self._intern(regex), self._optional_string(parsed.version), parsed.confidence)
+        if regex != parsed.regex:
+            self._sources[key[0]] = self._intern(parsed.regex)
+        return self._patterns.setdefault(key, len(self._patterns))
+
+    def _optional_string(self, value: Optional[str]) -> int:
+        return BundleFormat.NONE if value is None else self._intern(value)
+
+    def _intern(self, value: str) -> int:
+        return self._strings.setdefault(value, len(self._strings))
+
+
+class TechnologyMetadata:
+    __slots__ = ("description", "website", "icon", "cpe", "saas", "oss", "pricing")
+
+    def __init__(self, description: Optional[str], website: Optional[str], icon: Optional[str], cpe: Optional[str], saas: Optional[bool], oss: Optional[bool], pricing: Optional[list[str]]):
+        self.description: Final[Optional[str]] = description
+        self.website: Final[Optional[str]] = website
+        self.icon: Final[Optional[str]] = icon
+        self.cpe: Final[Optional[str]] = cpe
+        self.saas: Final[Optional[bool]] = saas
+        self.oss: Final[Optional[bool]] = oss
+        self.pricing: Final[tuple[str, ...]] = tuple(pricing or ())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {field: list(value) if isinstance(value, tuple) else value for field in self.__slots__ if (value := getattr(self, field)) not in (None, ())}
+
+
+class TechnologyTable:
+    # the per technology fields resolution reads, one column each and indexed by tech id
+    __slots__ = ("names", "cats", "groups", "requires", "requires_category", "gated")
+
+    def __init__(self, strings: tuple[str, ...], technologies: tuple[tuple, ...]):
+        self.names: Final[tuple[str, ...]] = tuple(strings[tech[BundleFormat.TECH_NAME]] for tech in technologies)
+        self.cats: Final[tuple[tuple[int, ...], ...]] = tuple(tech[BundleFormat.TECH_CATS] for tech in technologies)
+        self.groups: Final[tuple[tuple[int, ...], ...]] = tuple(tech[BundleFormat.TECH_GROUPS] for tech in technologies)
+        self.requires: Final[tuple[tuple[int, ...], ...]] = tuple(tech[BundleFormat.TECH_REQUIRES] for tech in technologies)
+        self.requires_category: Final[tuple[tuple[int, ...], ...]] = tuple(tech[BundleFormat.TECH_REQUIRES_CATEGORY] for tech in technologies)
+        # 1 where the technology is only evaluated once its requirements are detected
+        self.gated: Final[bytes] = bytes(1 if requires or requires_category else 0 for requires, requires_category in zip(self.requires, self.requires_category))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class Bundle:
+    def __init__(self, content_hash: bytes, payload: dict[str, Any], metadata: Optional[tuple[tuple, ...]] = None, path: Optional[pathlib.Path] = None):
+        self.content_hash: Final[bytes] = content_hash
+        self.strings: Final[tuple[str, ...]] = payload["strings"]
+        self.patterns: Final[tuple[tuple[int, int, int], ...]] = payload["patterns"]
+        self.literals: Final[tuple[tuple[int, ...], ...]] = payload["literals"]
+        # per pattern bitmask of the regex backends that run it like re does
+        self.backends: Final[tuple[int, ...]] = payload["backends"]
+        # version string id -> template parsed against the capture groups of its regex
+        self.templates: Final[dict[int, tuple[TemplatePart, ...]]] = payload["templates"]
+        # translated regex string id -> the regex as written in src, only where translation changed it
+        self.sources: Final[dict[int, int]] = payload["sources"]
+        self.keys: Final[dict[str, dict[str, tuple[tuple[int, int], ...]]]] = payload["keys"]
+        self.implies: Final[tuple[tuple[tuple[int, int, int], ...], ...]] = payload["implies"]
+        self.excludes: Final[tuple[tuple[int, ...], ...]] = payload["excludes"]
+        self.categories: Final[tuple[tuple, ...]] = payload["categories"]
+        self.groups: Final[tuple[tuple, ...]] = payload["groups"]
+        self.technologies: Final[tuple[tuple, ...]] = payload["technologies"]
+        self.table: Final[TechnologyTable] = TechnologyTable(self.strings, self.technologies)
+        self._tech_ids: Optional[dict[str, int]] = None
+        # metadata is read from the end of the bundle file the first time it's asked for
+        self._metadata: Optional[tuple[tuple, ...]] = metadata
+        self._PATH: Final[Optional[pathlib.Path]] = path
+        self._lock: Final[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def load(cls, path: pathlib.Path = pathlib.Path("build").joinpath("technologies.bundle")) -> "Bundle":
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content_hash, size, _ = cls._read_header(path, mm)
+            view: memoryview = memoryview(mm)[BundleFormat.HEADER.size:BundleFormat.HEADER.size + size]
+            try:
+                payload: dict[str, Any] = marshal.loads(view)
+            finally:
+                view.release()
+        return cls(content_hash, payload, path=path)
+
+    @staticmethod
+    def _read_header(path: pathlib.Path, mm: mmap.mmap) -> tuple[bytes, int, int]:
+        if len(mm) < BundleFormat.HEADER.size:
+            raise InvalidBundleException(f"{path} is too small to be a bundle")
+        magic, version, _, content_hash, size, metadata_size = BundleFormat.HEADER.unpack_from(mm, 0)
+        if magic != BundleFormat.MAGIC:
+            raise InvalidBundleException(f"{path} is not a technologies bundle")
+        if version != BundleFormat.VERSION:
+            raise InvalidBundleException(f"{path} has format version {version}, but {BundleFormat.VERSION} is required, rebuild it")
+        if len(mm) != BundleFormat.HEADER.size + size + metadata_size:
+            raise InvalidBundleException(f"{path} is truncated, expected {size + metadata_size} payload bytes")
+        return content_hash, size, metadata_size
+
+    @classmethod
+    def from_source(cls, source_dir: pathlib.Path = pathlib.Path("src")) -> "Bundle":
+        content_hash, payload, metadata = BundleBuilder(source_dir).compile()
+        return cls(content_hash, payload, metadata)
+
+    def metadata(self, tech_id: int) -> TechnologyMetadata:
+        if self._metadata is None:
+            with self._lock:
+                if self._metadata is None:
+                    self._metadata = self._load_metadata()
+        return TechnologyMetadata(*self._metadata[tech_id])
+
+    def _load_metadata(self) -> tuple[tuple, ...]:
+        if self._PATH is None:
+            raise InvalidBundleException("Bundle was built without metadata")
+        with self._PATH.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content_hash, size, _ = self._read_header(self._PATH, mm)
+            if content_hash != self.content_hash:
+                raise InvalidBundleException(f"{self._PATH} was rebuilt after it was loaded, load it again")
+            view: memoryview = memoryview(mm)[BundleFormat.HEADER.size + size:]
+            try:
+                return marshal.loads(view)
+            finally:
+                view.release()
+
+    def string(self, string_id: int) -> Optional[str]:
+        return None if string_id == BundleFormat.NONE else self.strings[string_id]
+
+    def pattern(self, pattern_id: int) -> ParsedPattern:
+        pattern: tuple[int, int, int] = self.patterns[pattern_id]
+        return ParsedPattern(self.strings[pattern[BundleFormat.PATTERN_REGEX]], self.string(pattern[BundleFormat.PATTERN_VERSION]), pattern[BundleFormat.PATTERN_CONFIDENCE])
+
+    def source(self, regex_id: int) -> str:
+        return self.strings[self.sources.get(regex_id, regex_id)]
+
+    def usages(self) -> dict[str, list[tuple[str, str, str]]]:
+        # regex -> (tech name, field with its key or selector, regex as written in src) for every place it's used
+        usages: dict[str, list[tuple[str, str, str]]] = {}
+        for tech_id, tech in enumerate(self.technologies):
+            for field, entries in tech[BundleFormat.TECH_PATTERNS].items():
+                for entry in entries:
+                    if field in BundleFormat.KEYED_FIELDS:
+                        key_id, pattern_id = entry
+                        label: str = f"{field}[{self.strings[key_id]}]"
+                    elif field == BundleFormat.DOM_FIELD:
+                        selector_id, _, _, pattern_id = entry
+                        label = f"{field}[{self.strings[selector_id]}]"
+                    else:
+                        pattern_id = entry
+                        label = field
+                    regex_id: int = self.patterns[pattern_id][BundleFormat.PATTERN_REGEX]
+                    usages.setdefault(self.strings[regex_id], []).append((self.tech_name(tech_id), label, self.source(regex_id)))
+        return usages
+
+    def pattern_literals(self, pattern_id: int) -> tuple[str, ...]:
+        return tuple(self.strings[literal_id] for literal_id in self.literals[pattern_id])
+
+    def tech_name(self, tech_id: int) -> str:
+        return self.table.names[tech_id]
+
+    def tech_id(self, name: str) -> int:
+        if self._tech_ids is None:
+            self._tech_ids = {tech_name: tech_id for tech_id, tech_name in enumerate(self.table.names)}
+        if name not in self._tech_ids:
+            raise TechNotFoundException(f"Tech '{name}' doesn't exist!")
+        return self._tech_ids[name]
+
+
+if __name__ == '__main__':
+    print(BundleBuilder().build())
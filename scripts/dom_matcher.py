@@ -0,0 +1,295 @@
+import re
+from typing import Final, Any, Iterable, Optional
+
+
+class UnsupportedSelectorException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class CompoundSelector:
+    __slots__ = ("tag", "id", "classes", "attributes", "literals")
+
+    def __init__(self, tag: Optional[str], id: Optional[str], classes: tuple[str, ...], attributes: tuple[tuple[str, Optional[re.Pattern]], ...], literals: tuple[str, ...]):
+        self.tag: Optional[str] = tag
+        self.id: Optional[str] = id
+        self.classes: tuple[str, ...] = classes
+        self.attributes: tuple[tuple[str, Optional[re.Pattern]], ...] = attributes
+        # lowercase strings the raw markup of any matching element must contain
+        self.literals: tuple[str, ...] = literals
+
+    def matches(self, element: Any) -> bool:
+        if self.tag is not None and element.name != self.tag:
+            return False
+        attrs: dict = element.attrs
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        if self.classes:
+            classes: Any = attrs.get("class", ())
+            if isinstance(classes, str):
+                classes = classes.split()
+            if any(name not in classes for name in self.classes):
+                return False
+        for name, pattern in self.attributes:
+            value: Any = attrs.get(name)
+            if value is None:
+                return False
+            if pattern is not None and pattern.match(value if isinstance(value, str) else " ".join(value)) is None:
+                return False
+        return True
+
+
+class ComplexSelector:
+    __slots__ = ("compounds", "combinators")
+
+    def __init__(self, compounds: list[CompoundSelector], combinators: list[str]):
+        self.compounds: list[CompoundSelector] = compounds
+        # combinators[i] joins compounds[i] and compounds[i + 1]
+        self.combinators: list[str] = combinators
+
+    @property
+    def subject(self) -> CompoundSelector:
+        return self.compounds[-1]
+
+    @property
+    def literals(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(literal for compound in self.compounds for literal in compound.literals))
+
+    def matches(self, element: Any) -> bool:
+        return self._matches_at(len(self.compounds) - 1, element)
+
+    def _matches_at(self, index: int, element: Any) -> bool:
+        if not self.compounds[index].matches(element):
+            return False
+        if index == 0:
+            return True
+        combinator: str = self.combinators[index - 1]
+        if combinator == " ":
+            parent: Any = element.parent
+            while parent is not None and parent.parent is not None:
+                if self._matches_at(index - 1, parent):
+                    return True
+                parent = parent.parent
+            return False
+        if combinator == ">":
+            parent = element.parent
+            return parent is not None and parent.parent is not None and self._matches_at(index - 1, parent)
+        sibling: Any = element.previous_sibling
+        while sibling is not None:
+            if not isinstance(sibling, str):
+                if self._matches_at(index - 1, sibling):
+                    return True
+                if combinator == "+":
+                    return False
+            sibling = sibling.previous_sibling
+        return False
+
+
+class SelectorParser:
+    _ESCAPE: Final[str] = r"\\(?:[0-9a-fA-F]{1,6}[ \t\r\n\f]?|[^\r\n\f0-9a-fA-F])"
+    _IDENTIFIER: Final[str] = rf"-?(?:[A-Za-z_\u0080-\uffff]|{_ESCAPE})(?:[\w\u0080-\uffff-]|{_ESCAPE})*"
+    _TAG: Final[re.Pattern] = re.compile(rf"\*|{_IDENTIFIER}")
+    _ID: Final[re.Pattern] = re.compile(rf"#((?:[\w\u0080-\uffff-]|{_ESCAPE})+)")
+    _CLASS: Final[re.Pattern] = re.compile(rf"\.({_IDENTIFIER})")
+    _ATTRIBUTE: Final[re.Pattern] = re.compile(
+        rf"\[\s*({_IDENTIFIER})\s*(?:([~|^$*]?=)\s*(?:\"((?:[^\"\\\r\n\f]|{_ESCAPE})*)\"|'((?:[^'\\\r\n\f]|{_ESCAPE})*)'|({_IDENTIFIER}))\s*(?:([iIsS])\s*)?)?\]"
+    )
+    _COMBINATOR: Final[re.Pattern] = re.compile(r"\s*([>+~])\s*|\s+")
+    _COMMA: Final[re.Pattern] = re.compile(r"\s*,\s*")
+    _UNESCAPE: Final[re.Pattern] = re.compile(r"\\(?:([0-9a-fA-F]{1,6})[ \t\r\n\f]?|(.))", re.DOTALL)
+
+    def parse(self, selector: str) -> list[ComplexSelector]:
+        text: str = selector.strip()
+        complexes: list[ComplexSelector] = []
+        position: int = 0
+        while True:
+            complex_selector, position = self._complex(text, position)
+            complexes.append(complex_selector)
+            if position == len(text):
+                return complexes
+            comma: Optional[re.Match] = self._COMMA.match(text, position)
+            if comma is None:
+                raise UnsupportedSelectorException(f"unsupported syntax at {position} in '{selector}'")
+            position = comma.end()
+
+    def _complex(self, text: str, position: int) -> tuple[ComplexSelector, int]:
+        compounds: list[CompoundSelector] = []
+        combinators: list[str] = []
+        while True:
+            compound, position = self._compound(text, position)
+            compounds.append(compound)
+            combinator: Optional[re.Match] = self._COMBINATOR.match(text, position)
+            if combinator is None or combinator.end() == len(text) or text[combinator.end()] == ",":
+                if combinator is not None and combinator.group(1) is None:
+                    position = combinator.end()
+                return ComplexSelector(compounds, combinators), position
+            combinators.append(combinator.group(1) or " ")
+            position = combinator.end()
+
+    def _compound(self, text: str, position: int) -> tuple[CompoundSelector, int]:
+        tag: Optional[str] = None
+        element_id: Optional[str] = None
+        classes: list[str] = []
+        attributes: list[tuple[str, Optional[re.Pattern]]] = []
+        literals: list[str] = []
+        start: int = position
+        if match := self._TAG.match(text, position):
+            tag = None if match.group() == "*" else self._unescape(match.group()).lower()
+            position = match.end()
+        while position < len(text):
+            if match := self._ID.match(text, position):
+                if element_id is not None and element_id != self._unescape(match.group(1)):
+                    raise UnsupportedSelectorException(f"multiple ids in '{text}'")
+                element_id = self._unescape(match.group(1))
+                literals.append(element_id)
+            elif match := self._CLASS.match(text, position):
+                classes.append(self._unescape(match.group(1)))
+                literals.append(classes[-1])
+            elif match := self._ATTRIBUTE.match(text, position):
+                attributes.append(self._attribute(match))
+                literals.append(attributes[-1][0])
+                if match.group(2) is not None:
+                    # multi-valued attributes like class are rejoined with single spaces
+                    literals.extend(self._unescape(next(group for group in match.group(3, 4, 5) if group is not None)).split())
+            else:
+                break
+            position = match.end()
+        if position == start or (position < len(text) and text[position] not in " \t\r\n\f>+~,"):
+            raise UnsupportedSelectorException(f"unsupported syntax at {position} in '{text}'")
+        literals = [literal.lower() for literal in literals if verbatim(literal)]
+        if tag is not None:
+            literals.append(f"<{tag}")
+        return CompoundSelector(tag, element_id, tuple(classes), tuple(attributes), tuple(literals)), position
+
+    @classmethod
+    def _unescape(cls, text: str) -> str:
+        return cls._UNESCAPE.sub(cls._codepoint, text) if "\\" in text else text
+
+    @staticmethod
+    def _codepoint(match: re.Match) -> str:
+        if match.group(1) is None:
+            return match.group(2)
+        codepoint: int = int(match.group(1), 16)
+        return chr(codepoint) if 0 < codepoint <= 0x10FFFF else "\ufffd"
+
+    @classmethod
+    def _attribute(cls, match: re.Match) -> tuple[str, Optional[re.Pattern]]:
+        # mirrors soupsieve so both engines agree on every operator and edge case
+        name: str = cls._unescape(match.group(1)).lower()
+        operator: Optional[str] = match.group(2)
+        if operator is None:
+            return name, None
+        value: str = cls._unescape(next(group for group in match.group(3, 4, 5) if group is not None))
+        case: Optional[str] = match.group(6)
+        if case:
+            flags: int = (re.I if case.lower() == "i" else 0) | re.DOTALL
+        else:
+            flags = (re.I if name == "type" else 0) | re.DOTALL
+        escaped: str = re.escape(value)
+        if operator == "^=":
+            return name, re.compile(rf"^{escaped}.*" if value else "(?!)", flags)
+        if operator == "$=":
+            return name, re.compile(rf".*?{escaped}$" if value else "(?!)", flags)
+        if operator == "*=":
+            return name, re.compile(rf".*?{escaped}.*" if value else "(?!)", flags)
+        if operator == "~=":
+            if not value or re.search(r"[ \t\r\n\f]", value):
+                return name, re.compile("(?!)", flags)
+            return name, re.compile(rf".*?(?:(?<=^)|(?<=[ \t\r\n\f])){escaped}(?=(?:[ \t\r\n\f]|$)).*", flags)
+        if operator == "|=":
+            return name, re.compile(rf"^{escaped}(?:-.*)?$", flags)
+        return name, re.compile(rf"^{escaped}$", flags)
+
+
+class DomMatcher:
+    def __init__(self, selectors: Iterable[str]):
+        parser: SelectorParser = SelectorParser()
+        self._selectors: Final[list[str]] = []
+        self._complexes: Final[dict[str, list[ComplexSelector]]] = {}
+        self._unsupported: Final[set[str]] = set()
+        self._by_id: Final[dict[str, list[tuple[int, ComplexSelector]]]] = {}
+        self._by_class: Final[dict[str, list[tuple[int, ComplexSelector]]]] = {}
+        self._by_tag: Final[dict[str, list[tuple[int, ComplexSelector]]]] = {}
+        self._by_attribute: Final[dict[str, list[tuple[int, ComplexSelector]]]] = {}
+        self._universal: Final[list[tuple[int, ComplexSelector]]] = []
+        for selector in dict.fromkeys(selectors):
+            try:
+                complexes: list[ComplexSelector] = parser.parse(selector)
+            except UnsupportedSelectorException:
+                self._unsupported.add(selector)
+                continue
+            index: int = len(self._selectors)
+            self._selectors.append(selector)
+            self._complexes[selector] = complexes
+            for complex_selector in complexes:
+                self._index(index, complex_selector)
+
+    def supports(self, selector: str) -> bool:
+        return selector not in self._unsupported
+
+    @property
+    def unsupported(self) -> set[str]:
+        return self._unsupported
+
+    def literals(self, selector: str) -> tuple[tuple[str, ...], ...]:
+        # the selector can only match markup containing every literal of at least one of these
+        if selector not in self._complexes:
+            return ((),)
+        return tuple(complex_selector.literals for complex_selector in self._complexes[selector])
+
+    def tags(self, selectors: Iterable[str]) -> Optional[set[str]]:
+        # the tag names a tree must keep for these selectors, None when they need ancestors or siblings too
+        tags: set[str] = set()
+        for selector in selectors:
+            if selector not in self._complexes:
+                return None
+            for complex_selector in self._complexes[selector]:
+                if len(complex_selector.compounds) > 1 or complex_selector.subject.tag is None:
+                    return None
+                tags.add(complex_selector.subject.tag)
+        return tags
+
+    def match(self, soup: Any) -> dict[str, list]:
+        results: list[list] = [[] for _ in self._selectors]
+        by_id, by_class, by_tag, by_attribute, universal = self._by_id, self._by_class, self._by_tag, self._by_attribute, self._universal
+        for element in soup.find_all(True):
+            attrs: dict = element.attrs
+            candidates: list[tuple[int, ComplexSelector]] = list(universal)
+            candidates.extend(by_tag.get(element.name, ()))
+            if attrs:
+                for name in attrs:
+                    candidates.extend(by_attribute.get(name, ()))
+                element_id: Any = attrs.get("id")
+                if isinstance(element_id, str):
+                    candidates.extend(by_id.get(element_id, ()))
+                classes: Any = attrs.get("class")
+                if classes:
+                    for name in set(classes.split() if isinstance(classes, str) else classes):
+                        candidates.extend(by_class.get(name, ()))
+            for index, complex_selector in candidates:
+                found: list = results[index]
+                # a selector list can reach the same element through several of its selectors
+                if (not found or found[-1] is not element) and complex_selector.matches(element):
+                    found.append(element)
+        return {selector: results[index] for index, selector in enumerate(self._selectors)}
+
+    def _index(self, index: int, complex_selector: ComplexSelector) -> None:
+        subject: CompoundSelector = complex_selector.subject
+        if subject.id is not None:
+            self._by_id.setdefault(subject.id, []).append((index, complex_selector))
+        elif subject.classes:
+            self._by_class.setdefault(subject.classes[0], []).append((index, complex_selector))
+        elif subject.tag is not None:
+            self._by_tag.setdefault(subject.tag, []).append((index, complex_selector))
+        elif subject.attributes:
+            self._by_attribute.setdefault(subject.attributes[0][0], []).append((index, complex_selector))
+        else:
+            self._universal.append((index, complex_selector))
+
+
+_NOT_VERBATIM: Final[re.Pattern] = re.compile(r"[&<>\"'\s]|[^\x00-\x7f]")
+
+
+def verbatim(literal: str) -> bool:
+    # markup may spell these characters as references or reflow whitespace, so they can't be searched for as is
+    return bool(literal) and _NOT_VERBATIM.search(literal) is None
@@ -0,0 +1,674 @@
+import json
+import pathlib
+import re
+import sys
+import time
+from typing import Final, Any, Iterable, Iterator, Optional
+
+from bundle import Bundle, BundleFormat, TechnologyTable
+from dom_matcher import DomMatcher, verbatim
+from instrumentation import Instrumentation
+from patterns import TemplatePart
+from prefilter import LiteralScanner, Prefilter
+from regex_registry import RegexRegistry
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+except ImportError:
+    BeautifulSoup = None
+    SoupStrainer = None
+
+
+class Snapshot:
+    def __init__(
+            self,
+            url: str = "",
+            html: str = "",
+            text: str = "",
+            css: str = "",
+            robots: str = "",
+            cert_issuer: str = "",
+            scripts: Iterable[str] = (),
+            script_src: Iterable[str] = (),
+            xhr: Iterable[str] = (),
+            headers: Optional[dict[str, str | list[str]]] = None,
+            cookies: Optional[dict[str, str | list[str]]] = None,
+            meta: Optional[dict[str, str | list[str]]] = None,
+            js: Optional[dict[str, str | list[str]]] = None,
+            dns: Optional[dict[str, str | list[str]]] = None,
+            probe: Optional[dict[str, str | list[str]]] = None):
+        self.url: str = url
+        self.html: str = html
+        self.text: str = text
+        self.css: str = css
+        self.robots: str = robots
+        self.cert_issuer: str = cert_issuer
+        self.scripts: list[str] = list(scripts)
+        self.script_src: list[str] = list(script_src)
+        self.xhr: list[str] = list(xhr)
+        self.headers: dict[str, str | list[str]] = headers or {}
+        self.cookies: dict[str, str | list[str]] = cookies or {}
+        self.meta: dict[str, str | list[str]] = meta or {}
+        self.js: dict[str, str | list[str]] = js or {}
+        self.dns: dict[str, str | list[str]] = dns or {}
+        self.probe: dict[str, str | list[str]] = probe or {}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Snapshot":
+        return cls(
+            url=data.get("url", ""),
+            html=data.get("html", ""),
+            text=data.get("text", ""),
+            css=data.get("css", ""),
+            robots=data.get("robots", ""),
+            cert_issuer=data.get("certIssuer", ""),
+            scripts=data.get("scripts", ()),
+            script_src=data.get("scriptSrc", ()),
+            xhr=data.get("xhr", ()),
+            headers=data.get("headers"),
+            cookies=data.get("cookies"),
+            meta=data.get("meta"),
+            js=data.get("js"),
+            dns=data.get("dns"),
+            probe=data.get("probe"),
+        )
+
+    def values(self, field: str) -> list[str]:
+        if field == "url":
+            return [self.url] if self.url else []
+        if field == "html":
+            return [self.html] if self.html else []
+        if field == "text":
+            return [self.text] if self.text else []
+        if field == "css":
+            return [self.css] if self.css else []
+        if field == "robots":
+            return [self.robots] if self.robots else []
+        if field == "certIssuer":
+            return [self.cert_issuer] if self.cert_issuer else []
+        if field == "scripts":
+            return self.scripts
+        if field == "scriptSrc":
+            return self.script_src
+        if field == "xhr":
+            return self.xhr
+        return []
+
+    def keyed(self, field: str) -> dict[str, list[str]]:
+        items: dict[str, str | list[str]] = getattr(self, field)
+        return {
+            BundleFormat.normalize_key(field, key): value if isinstance(value, list) else [value]
+            for key, value in items.items()
+        }
+
+
+class Detection:
+    def __init__(self, name: str, confidence: int, version: str, categories: tuple[int, ...], groups: tuple[int, ...]):
+        self.name: Final[str] = name
+        self.confidence: Final[int] = confidence
+        self.version: Final[str] = version
+        self.categories: Final[tuple[int, ...]] = categories
+        self.groups: Final[tuple[int, ...]] = groups
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "confidence": self.confidence,
+            "version": self.version,
+            "cats": list(self.categories),
+            "groups": list(self.groups),
+        }
+
+    def __repr__(self) -> str:
+        return f"Detection({self.name!r}, confidence={self.confidence}, version={self.version!r})"
+
+
+class Hits:
+    def __init__(self):
+        self.confidence: dict[int, int] = {}
+        self.versions: dict[int, list[str]] = {}
+        self.fields: set[str] = set()
+        self.evaluated: set[tuple[str, int]] = set()
+
+    def add(self, tech_id: int, confidence: int, version: str) -> None:
+        self.confidence[tech_id] = self.confidence.get(tech_id, 0) + confidence
+        if version:
+            self.versions.setdefault(tech_id, []).append(version)
+
+    def update(self, other: "Hits") -> None:
+        for tech_id, confidence in other.confidence.items():
+            self.confidence[tech_id] = self.confidence.get(tech_id, 0) + confidence
+        for tech_id, versions in other.versions.items():
+            self.versions.setdefault(tech_id, []).extend(versions)
+        self.fields.update(other.fields)
+        self.evaluated.update(other.evaluated)
+
+    def __contains__(self, tech_id: int) -> bool:
+        return tech_id in self.confidence
+
+    def __len__(self) -> int:
+        return len(self.confidence)
+
+
+class VersionResolver:
+    def resolve(self, template: Optional[tuple[TemplatePart, ...]], match: re.Match) -> str:
+        if not template:
+            return ""
+        return "".join(self._render(template, match)).strip()
+
+    def _render(self, parts: tuple[TemplatePart, ...], match: re.Match) -> Iterator[str]:
+        for part in parts:
+            if isinstance(part, str):
+                yield part
+            elif isinstance(part, int):
+                yield match.group(part) or ""
+            else:
+                group, present, absent = part
+                yield from self._render(present if match.group(group) else absent, match)
+
+
+class PageContext:
+    def __init__(self, engine: "Engine", snapshot: Snapshot):
+        self._engine: Final[Engine] = engine
+        self.snapshot: Final[Snapshot] = snapshot
+        self._values: dict[str, list[str]] = {}
+        self._items: dict[str, dict[str, list[str]]] = {}
+        self._candidates: dict[str, set[int]] = {}
+        self._soup: Optional[BeautifulSoup] = None
+        self._selected: dict[str, list] = {}
+        self._dom_candidates: Optional[set[str]] = None
+
+    def values(self, field: str) -> list[str]:
+        if field not in self._values:
+            self._values[field] = self.snapshot.values(field)
+        return self._values[field]
+
+    def items(self, field: str) -> dict[str, list[str]]:
+        if field not in self._items:
+            self._items[field] = self.snapshot.keyed(field)
+        return self._items[field]
+
+    def candidates(self, field: str) -> set[int]:
+        if field not in self._candidates:
+            values: list[str] = self.values(field)
+            self._candidates[field] = set(self._engine.prefilter(field).candidates("\n".join(values).lower())) if values else set()
+            if self._engine.instrumentation is not None and values:
+                self._engine.instrumentation.prefilter(field, len(self._candidates[field]), len(self._engine.entries(field)))
+        return self._candidates[field]
+
+    def dom_candidates(self) -> set[str]:
+        if self._dom_candidates is None:
+            html: str = self.snapshot.html
+            self._dom_candidates = self._engine.dom_candidates(html) if html else set()
+            if self._engine.instrumentation is not None and html:
+                self._engine.instrumentation.prefilter(BundleFormat.DOM_FIELD, len(self._dom_candidates), len(self._engine.dom_selectors))
+        return self._dom_candidates
+
+    def select(self, selector: str) -> list:
+        if selector not in self._selected:
+            if selector not in self.dom_candidates():
+                return []
+            if self._soup is None:
+                self._soup = self._engine.parse_dom(self.snapshot.html, self.dom_candidates())
+                self._selected = self._engine.dom_matcher.match(self._soup)
+            if selector not in self._selected:
+                self._selected[selector] = self._soup.select(selector)
+        return self._selected[selector]
+
+
+class BatchResult:
+    def __init__(self, engine: "Engine", size: int):
+        self._engine: Final[Engine] = engine
+        self.size: Final[int] = size
+        self.pages: dict[int, list[int]] = {}
+        self.confidence: dict[int, list[int]] = {}
+        self.versions: dict[int, list[str]] = {}
+
+    def add(self, tech_id: int, page: int, confidence: int, version: str) -> None:
+        self.pages.setdefault(tech_id, []).append(page)
+        self.confidence.setdefault(tech_id, []).append(confidence)
+        self.versions.setdefault(tech_id, []).append(version)
+
+    def technologies(self) -> list[int]:
+        return sorted(self.pages)
+
+    def column(self, tech_id: int) -> list[tuple[int, int, str]]:
+        return list(zip(self.pages.get(tech_id, []), self.confidence.get(tech_id, []), self.versions.get(tech_id, [])))
+
+    def page(self, page: int) -> list[Detection]:
+        detections: list[Detection] = []
+        for tech_id, pages in self.pages.items():
+            for position, hit_page in enumerate(pages):
+                if hit_page == page:
+                    detections.append(self._engine.detection(tech_id, self.confidence[tech_id][position], self.versions[tech_id][position]))
+        return sorted(detections, key=lambda detection: detection.name.lower())
+
+
+class Engine:
+    # the translator turns a javascript "$" into \Z, an even run of backslashes before it still leaves it an anchor
+    _END_ANCHOR: Final[re.Pattern] = re.compile(r"(?<!\\)(?:\\\\)*\\Z")
+
+    def __init__(self, bundle: Bundle, regexes: Optional[RegexRegistry] = None, previous: Optional["Engine"] = None):
+        self._bundle: Final[Bundle] = bundle
+        self._regexes: Final[RegexRegistry] = regexes if regexes is not None else RegexRegistry.shared()
+        self._compiled: list[Optional[re.Pattern]] = [None] * len(bundle.patterns)
+        self._versions: Final[VersionResolver] = VersionResolver()
+        self._list_entries: dict[str, list[tuple[int, int]]] = {field: [] for field in BundleFormat.LIST_FIELDS}
+        self._dom_entries: list[tuple[int, str, int, Optional[str], int]] = []
+        for tech_id, tech in enumerate(bundle.technologies):
+            for field, entries in tech[BundleFormat.TECH_PATTERNS].items():
+                if field in self._list_entries:
+                    self._list_entries[field].extend((tech_id, pattern_id) for pattern_id in entries)
+                elif field == BundleFormat.DOM_FIELD:
+                    for selector_id, kind, name_id, pattern_id in entries:
+                        self._dom_entries.append((tech_id, bundle.strings[selector_id], kind, bundle.string(name_id), pattern_id))
+        self._prefilters: dict[str, Prefilter] = {}
+        for field, entries in self._list_entries.items():
+            entry_literals: list[tuple[str, ...]] = [bundle.pattern_literals(pattern_id) for _, pattern_id in entries]
+            # a reload keeps the prefilter of every field whose literals didn't change, entries are positional so tech ids don't matter
+            if previous is not None and entry_literals == [previous.bundle.pattern_literals(pattern_id) for _, pattern_id in previous.entries(field)]:
+                self._prefilters[field] = previous.prefilter(field)
+            else:
+                self._prefilters[field] = Prefilter(entry_literals)
+        self._table: Final[TechnologyTable] = bundle.table
+        self._gated: Final[bytes] = bundle.table.gated
+        self._root_dom_entries: Final[list[tuple[int, str, int, Optional[str], int]]] = [entry for entry in self._dom_entries if not self._gated[entry[0]]]
+        self._dependency_order: Final[list[int]] = self._topological_order()
+        self._dependent_entries: dict[int, dict[str, list]] = {tech_id: {} for tech_id in self._dependency_order}
+        for field, entries in self._list_entries.items():
+            for entry, (tech_id, _) in enumerate(entries):
+                if self._gated[tech_id]:
+                    self._dependent_entries[tech_id].setdefault(field, []).append(entry)
+        for field, index in bundle.keys.items():
+            for key, key_entries in index.items():
+                for tech_id, pattern_id in key_entries:
+                    if self._gated[tech_id]:
+                        self._dependent_entries[tech_id].setdefault(field, []).append((key, pattern_id))
+        for dom_entry in self._dom_entries:
+            if self._gated[dom_entry[0]]:
+                self._dependent_entries[dom_entry[0]].setdefault(BundleFormat.DOM_FIELD, []).append(dom_entry)
+        self._closures: dict[int, frozenset[int]] = {}
+        self._end_anchored: dict[str, frozenset[int]] = {}
+        self._instrumentation: Optional[Instrumentation] = None
+        self._dom_selectors: Final[list[str]] = list(dict.fromkeys(selector for _, selector, _, _, _ in self._dom_entries))
+        self._dom_text_selectors: Final[set[str]] = {selector for _, selector, kind, _, _ in self._dom_entries if kind == BundleFormat.DOM_TEXT}
+        self._dom_matcher: Optional[DomMatcher] = None
+        self._dom_scanner: Optional[LiteralScanner] = None
+        self._dom_gates: list[tuple[str, tuple[frozenset[int], ...]]] = []
+        if previous is not None:
+            self._reuse_dom(previous)
+
+    def _reuse_dom(self, previous: "Engine") -> None:
+        if self._dom_selectors != previous.dom_selectors:
+            return
+        self._dom_matcher = previous._dom_matcher
+        if previous._dom_scanner is not None and self._dom_signature() == previous._dom_signature():
+            self._dom_scanner = previous._dom_scanner
+            self._dom_gates = previous._dom_gates
+
+    def _dom_signature(self) -> list[tuple[str, int, Optional[str], tuple[str, ...]]]:
+        return [(selector, kind, name, self._bundle.pattern_literals(pattern_id)) for _, selector, kind, name, pattern_id in self._dom_entries]
+
+    @classmethod
+    def from_source(cls, source_dir: pathlib.Path = pathlib.Path("src")) -> "Engine":
+        return cls(Bundle.from_source(source_dir))
+
+    @property
+    def bundle(self) -> Bundle:
+        return self._bundle
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        return self._instrumentation
+
+    def instrument(self, instrumentation: Optional[Instrumentation]) -> None:
+        self._instrumentation = instrumentation
+
+    @property
+    def dom_matcher(self) -> DomMatcher:
+        if self._dom_matcher is None:
+            self._dom_matcher = DomMatcher(self._dom_selectors)
+        return self._dom_matcher
+
+    @property
+    def dom_selectors(self) -> list[str]:
+        return self._dom_selectors
+
+    @property
+    def dom_scanner(self) -> LiteralScanner:
+        if self._dom_scanner is None:
+            literal_ids: dict[str, int] = {}
+            gates: list[tuple[str, tuple[frozenset[int], ...]]] = []
+            for _, selector, kind, name, pattern_id in self._dom_entries:
+                if kind == BundleFormat.DOM_PROPERTY:
+                    continue
+                alternatives: list[tuple[str, ...]] = [
+                    tuple(literals) + ((name.lower(),) if kind == BundleFormat.DOM_ATTRIBUTE and verbatim(name) else ())
+                    for literals in self.dom_matcher.literals(selector)
+                ]
+                # raw text elements hold their text verbatim, elsewhere this assumes fingerprinted words aren't split by inline tags
+                pattern_literals: tuple[str, ...] = ()
+                if kind == BundleFormat.DOM_TEXT and self.dom_matcher.tags({selector}) in ({"script"}, {"style"}, {"script", "style"}):
+                    pattern_literals = self._bundle.pattern_literals(pattern_id)
+                elif kind != BundleFormat.DOM_EXISTS and all(verbatim(literal) for literal in self._bundle.pattern_literals(pattern_id)):
+                    pattern_literals = self._bundle.pattern_literals(pattern_id)
+                if pattern_literals:
+                    alternatives = [literals + (literal,) for literals in alternatives for literal in pattern_literals]
+                gates.append((selector, tuple(
+                    frozenset(literal_ids.setdefault(literal, len(literal_ids)) for literal in literals) for literals in alternatives
+                )))
+            self._dom_gates = gates
+            self._dom_scanner = LiteralScanner(list(literal_ids))
+        return self._dom_scanner
+
+    def dom_candidates(self, html: str) -> set[str]:
+        found: set[int] = self.dom_scanner.scan(html.lower())
+        return {selector for selector, alternatives in self._dom_gates if any(literals <= found for literals in alternatives)}
+
+    def parse_dom(self, html: str, selectors: set[str]) -> BeautifulSoup:
+        # text needs whole subtrees as the full parse nests them, so only strain for attribute and existence checks
+        tags: Optional[set[str]] = None if selectors & self._dom_text_selectors else self.dom_matcher.tags(selectors)
+        return BeautifulSoup(html, "html.parser", parse_only=SoupStrainer(sorted(tags)) if tags else None)
+
+    def warm(self) -> None:
+        for pattern_id, regex in enumerate(self._compiled):
+            if regex is None:
+                self._compile(pattern_id)
+        self.dom_scanner
+
+    def analyze(self, snapshot: Snapshot) -> list[Detection]:
+        return self.resolve(self.match(snapshot))
+
+    def match(self, snapshot: Snapshot, fields: Optional[Iterable[str]] = None, hits: Optional[Hits] = None) -> Hits:
+        hits = hits if hits is not None else Hits()
+        fields = tuple(fields) if fields is not None else self.fields()
+        page: PageContext = PageContext(self, snapshot)
+        # every technology is evaluated, excludes only apply in resolve so the result doesn't depend on field order
+        instrumentation: Optional[Instrumentation] = self._instrumentation
+        for field in fields:
+            if field in hits.fields:
+                continue
+            hits.fields.add(field)
+            started: float = time.perf_counter() if instrumentation is not None else 0.0
+            if field in self._list_entries:
+                self._match_list(page, field, hits)
+            elif field in self._bundle.keys:
+                self._match_keyed(page, field, hits)
+            elif field == BundleFormat.DOM_FIELD:
+                self._match_dom(page, self._root_dom_entries, hits)
+            if instrumentation is not None:
+                instrumentation.field(field, time.perf_counter() - started)
+        started = time.perf_counter() if instrumentation is not None else 0.0
+        self._match_dependents(page, fields, hits)
+        if instrumentation is not None:
+            instrumentation.field("dependents", time.perf_counter() - started)
+        return hits
+
+    def entries(self, field: str) -> list[tuple[int, int]]:
+        return self._list_entries[field]
+
+    def prefilter(self, field: str) -> Prefilter:
+        return self._prefilters[field]
+
+    def end_anchored(self, field: str) -> frozenset[int]:
+        if field not in self._end_anchored:
+            self._end_anchored[field] = frozenset(
+                entry for entry, (_, pattern_id) in enumerate(self._list_entries[field])
+                if self._END_ANCHOR.search(self._bundle.strings[self._bundle.patterns[pattern_id][BundleFormat.PATTERN_REGEX]])
+            )
+        return self._end_anchored[field]
+
+    def keys(self, field: str) -> list[str]:
+        return list(self._bundle.keys[field])
+
+    @staticmethod
+    def fields() -> tuple[str, ...]:
+        return BundleFormat.LIST_FIELDS + BundleFormat.KEYED_FIELDS + (BundleFormat.DOM_FIELD,)
+
+    def resolve(self, hits: Hits) -> list[Detection]:
+        return sorted(
+            (self.detection(tech_id, confidence, version) for tech_id, (confidence, version) in self._resolve(hits).items()),
+            key=lambda detection: detection.name.lower()
+        )
+
+    def match_many(self, snapshots: Iterable[Snapshot]) -> "BatchResult":
+        snapshots = list(snapshots)
+        hits: list[Hits] = [Hits() for _ in snapshots]
+        instrumentation: Optional[Instrumentation] = self._instrumentation
+        for field, entries in self._list_entries.items():
+            started: float = time.perf_counter() if instrumentation is not None else 0.0
+            page_values: list[list[str]] = [snapshot.values(field) for snapshot in snapshots]
+            pending: dict[int, list[int]] = {}
+            for page, values in enumerate(page_values):
+                if values:
+                    candidates: list[int] = self._prefilters[field].candidates("\n".join(values).lower())
+                    if instrumentation is not None:
+                        instrumentation.prefilter(field, len(candidates), len(entries))
+                    for entry in candidates:
+                        pending.setdefault(entry, []).append(page)
+            for entry in sorted(pending):
+                tech_id, pattern_id = entries[entry]
+                if self._gated[tech_id]:
+                    continue
+                for page in pending[entry]:
+                    self.match_pattern(tech_id, pattern_id, page_values[page], hits[page])
+            if instrumentation is not None:
+                instrumentation.field(field, time.perf_counter() - started)
+        for field, index in self._bundle.keys.items():
+            started = time.perf_counter() if instrumentation is not None else 0.0
+            page_items: list[dict[str, list[str]]] = [snapshot.keyed(field) for snapshot in snapshots]
+            pages_by_key: dict[str, list[int]] = {}
+            for page, items in enumerate(page_items):
+                for key in items:
+                    if key in index:
+                        pages_by_key.setdefault(key, []).append(page)
+            for key, pages in pages_by_key.items():
+                for tech_id, pattern_id in index[key]:
+                    if self._gated[tech_id]:
+                        continue
+                    for page in pages:
+                        self.match_pattern(tech_id, pattern_id, page_items[page][key], hits[page])
+            if instrumentation is not None:
+                instrumentation.field(field, time.perf_counter() - started)
+        for page, snapshot in enumerate(snapshots):
+            hits[page].fields.update(field for field in self.fields() if field != BundleFormat.DOM_FIELD)
+            self.match(snapshot, None, hits[page])
+        result: BatchResult = BatchResult(self, len(snapshots))
+        for page, page_hits in enumerate(hits):
+            for tech_id, (confidence, version) in self._resolve(page_hits).items():
+                result.add(tech_id, page, confidence, version)
+        return result
+
+    def _resolve(self, hits: Hits) -> dict[int, tuple[int, str]]:
+        table: TechnologyTable = self._table
+        detected: dict[int, tuple[int, str]] = {
+            tech_id: (min(100, confidence), self._best_version(hits.versions.get(tech_id, [])))
+            for tech_id, confidence in hits.confidence.items()
+        }
+        while True:
+            resolved: dict[int, tuple[int, str]] = self._resolve_implies(detected)
+            categories: set[int] = {cat for tech_id in resolved for cat in table.cats[tech_id]}
+            unmet: list[int] = [
+                tech_id for tech_id in detected
+                if any(required not in resolved for required in table.requires[tech_id])
+                or any(cat not in categories for cat in table.requires_category[tech_id])
+            ]
+            if not unmet:
+                break
+            for tech_id in unmet:
+                del detected[tech_id]
+        # mutually exclusive technologies keep the one with the most evidence, an excluded one excludes nothing itself
+        excluded: set[int] = set()
+        for tech_id in sorted(detected, key=lambda tech_id: (-hits.confidence[tech_id], tech_id)):
+            if tech_id not in excluded:
+                excluded.update(self._bundle.excludes[tech_id])
+        # and it takes what it implies with it, so it goes before the implies are resolved again
+        resolved = self._resolve_implies({tech_id: detection for tech_id, detection in detected.items() if tech_id not in excluded})
+        return {tech_id: detection for tech_id, detection in resolved.items() if tech_id not in excluded}
+
+    def detection(self, tech_id: int, confidence: int, version: str) -> Detection:
+        return Detection(self._table.names[tech_id], confidence, version, self._table.cats[tech_id], self._table.groups[tech_id])
+
+    def _resolve_implies(self, detected: dict[int, tuple[int, str]]) -> dict[int, tuple[int, str]]:
+        resolved: dict[int, tuple[int, str]] = dict(detected)
+        for tech_id, (confidence, _) in detected.items():
+            for implied_id, implied_confidence, version_id in self._bundle.implies[tech_id]:
+                combined: int = min(confidence, implied_confidence)
+                if implied_id in resolved and resolved[implied_id][0] >= combined:
+                    continue
+                version: str = self._bundle.string(version_id) or (resolved[implied_id][1] if implied_id in resolved else "")
+                resolved[implied_id] = (combined, version)
+        return resolved
+
+    def _match_list(self, page: PageContext, field: str, hits: Hits) -> None:
+        values: list[str] = page.values(field)
+        if not values:
+            return
+        entries: list[tuple[int, int]] = self._list_entries[field]
+        for entry in sorted(page.candidates(field)):
+            tech_id, pattern_id = entries[entry]
+            if not self._gated[tech_id]:
+                self.match_pattern(tech_id, pattern_id, values, hits)
+
+    def _match_keyed(self, page: PageContext, field: str, hits: Hits) -> None:
+        index: dict[str, tuple[tuple[int, int], ...]] = self._bundle.keys[field]
+        for key, values in page.items(field).items():
+            for tech_id, pattern_id in index.get(key, ()):
+                if not self._gated[tech_id]:
+                    self.match_pattern(tech_id, pattern_id, values, hits)
+
+    def _match_dom(self, page: PageContext, entries: list[tuple[int, str, int, Optional[str], int]], hits: Hits) -> None:
+        if not page.snapshot.html or BeautifulSoup is None or not page.dom_candidates():
+            return
+        for tech_id, selector, kind, name, pattern_id in entries:
+            elements: list = page.select(selector)
+            if not elements:
+                continue
+            if kind == BundleFormat.DOM_EXISTS:
+                self.match_pattern(tech_id, pattern_id, [""], hits)
+            elif kind == BundleFormat.DOM_ATTRIBUTE:
+                values: list[str] = [
+                    " ".join(value) if isinstance(value, list) else value
+                    for element in elements if (value := element.get(name)) is not None
+                ]
+                self.match_pattern(tech_id, pattern_id, values, hits)
+            elif kind == BundleFormat.DOM_TEXT:
+                self.match_pattern(tech_id, pattern_id, [element.get_text() for element in elements], hits)
+
+    def _match_dependents(self, page: PageContext, fields: tuple[str, ...], hits: Hits) -> None:
+        table: TechnologyTable = self._table
+        present: set[int] = self._present(hits)
+        categories: set[int] = {cat for tech_id in present for cat in table.cats[tech_id]}
+        progressed: bool = True
+        while progressed:
+            progressed = False
+            for tech_id in self._dependency_order:
+                entries: dict[str, list] = self._dependent_entries[tech_id]
+                pending: list[str] = [field for field in fields if field in entries and (field, tech_id) not in hits.evaluated]
+                if not pending:
+                    continue
+                if any(required not in present for required in table.requires[tech_id]):
+                    continue
+                if any(cat not in categories for cat in table.requires_category[tech_id]):
+                    continue
+                progressed = True
+                for field in pending:
+                    hits.evaluated.add((field, tech_id))
+                    self._match_technology(page, field, tech_id, entries[field], hits)
+                if tech_id in hits and tech_id not in present:
+                    closure: frozenset[int] = self._closure(tech_id)
+                    present.update(closure)
+                    categories.update(cat for implied_id in closure for cat in table.cats[implied_id])
+
+    def _match_technology(self, page: PageContext, field: str, tech_id: int, entries: list, hits: Hits) -> None:
+        if field in self._list_entries:
+            values: list[str] = page.values(field)
+            candidates: set[int] = page.candidates(field)
+            for entry in entries:
+                if entry in candidates:
+                    self.match_pattern(tech_id, self._list_entries[field][entry][1], values, hits)
+        elif field == BundleFormat.DOM_FIELD:
+            self._match_dom(page, entries, hits)
+        else:
+            items: dict[str, list[str]] = page.items(field)
+            for key, pattern_id in entries:
+                if (values := items.get(key)) is not None:
+                    self.match_pattern(tech_id, pattern_id, values, hits)
+
+    def _present(self, hits: Hits) -> set[int]:
+        present: set[int] = set()
+        for tech_id in hits.confidence:
+            present.update(self._closure(tech_id))
+        return present
+
+    def _closure(self, tech_id: int) -> frozenset[int]:
+        if tech_id not in self._closures:
+            self._closures[tech_id] = frozenset((tech_id, *(implied_id for implied_id, _, _ in self._bundle.implies[tech_id])))
+        return self._closures[tech_id]
+
+    def _topological_order(self) -> list[int]:
+        table: TechnologyTable = self._table
+        by_category: dict[int, list[int]] = {}
+        for tech_id, cats in enumerate(table.cats):
+            for cat in cats:
+                by_category.setdefault(cat, []).append(tech_id)
+        levels: dict[int, int] = {}
+
+        def level(tech_id: int, visiting: set[int]) -> int:
+            if not self._gated[tech_id] or tech_id in visiting:
+                return 0
+            if tech_id not in levels:
+                visiting.add(tech_id)
+                parents: list[int] = list(table.requires[tech_id]) + [
+                    parent for cat in table.requires_category[tech_id] for parent in by_category.get(cat, []) if parent != tech_id
+                ]
+                levels[tech_id] = 1 + max((level(parent, visiting) for parent in parents), default=0)
+                visiting.discard(tech_id)
+            return levels[tech_id]
+
+        gated: list[int] = [tech_id for tech_id in range(len(table)) if self._gated[tech_id]]
+        return sorted(gated, key=lambda tech_id: (level(tech_id, set()), tech_id))
+
+    def match_pattern(self, tech_id: int, pattern_id: int, values: list[str], hits: Hits) -> bool:
+        if self._instrumentation is not None:
+            return self._match_timed(tech_id, pattern_id, values, hits)
+        return self._match_pattern(tech_id, pattern_id, values, hits)
+
+    def _match_timed(self, tech_id: int, pattern_id: int, values: list[str], hits: Hits) -> bool:
+        started: float = time.perf_counter()
+        matched: bool = self._match_pattern(tech_id, pattern_id, values, hits)
+        self._instrumentation.evaluation(tech_id, pattern_id, time.perf_counter() - started, matched)
+        return matched
+
+    def _match_pattern(self, tech_id: int, pattern_id: int, values: list[str], hits: Hits) -> bool:
+        regex: re.Pattern = self._compiled[pattern_id] or self._compile(pattern_id)
+        for value in values:
+            match: Optional[re.Match] = regex.search(value)
+            if match:
+                pattern: tuple[int, int, int] = self._bundle.patterns[pattern_id]
+                hits.add(tech_id, pattern[BundleFormat.PATTERN_CONFIDENCE], self._versions.resolve(self._bundle.templates.get(pattern[BundleFormat.PATTERN_VERSION]), match))
+                return True
+        return False
+
+    def _compile(self, pattern_id: int) -> re.Pattern:
+        regex: re.Pattern = self._regexes.compile(self._bundle.strings[self._bundle.patterns[pattern_id][BundleFormat.PATTERN_REGEX]], self._bundle.backends[pattern_id])
+        self._compiled[pattern_id] = regex
+        return regex
+
+    @staticmethod
+    def _best_version(versions: list[str]) -> str:
+        if not versions:
+            return ""
+        return max(versions, key=lambda version: ([int(part) for part in re.findall(r"\d+", version)], len(version)))
+
+
+if __name__ == '__main__':
+    bundle_path: pathlib.Path = pathlib.Path("build").joinpath("technologies.bundle")
+    engine: Engine = Engine(Bundle.load(bundle_path) if bundle_path.is_file() else Bundle.from_source())
+    snapshots: list[Snapshot] = []
+    for snapshot_file in sys.argv[1:]:
+        with open(snapshot_file, "r", encoding="utf8") as f:
+            snapshots.append(Snapshot.from_dict(json.load(f)))
+    batch: BatchResult = engine.match_many(snapshots)
+    for page, snapshot_file in enumerate(sys.argv[1:]):
+        print(json.dumps({"snapshot": snapshot_file, "technologies": [detection.to_dict() for detection in batch.page(page)]}, indent=2))
@@ -0,0 +1,284 @@
+import argparse
+import hashlib
+import json
+import marshal
+import pathlib
+import struct
+import threading
+import zlib
+from typing import Final, Any, Optional
+
+from bundle import Bundle, BundleBuilder, BundleFormat
+from engine import Engine
+from regex_registry import RegexRegistry
+
+
+class InvalidStoreException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class InvalidDeltaException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class FingerprintDelta:
+    MAGIC: Final[bytes] = b"WAPD"
+    VERSION: Final[int] = 1
+    # magic, version, reserved, base revision, target revision, compressed payload size
+    HEADER: Final[struct.Struct] = struct.Struct("<4sHH32s32sQ")
+
+    def __init__(
+            self,
+            base: bytes,
+            target: bytes,
+            technologies: dict[str, Optional[dict]],
+            predecessors: dict[str, Optional[str]],
+            order: Optional[list[str]] = None,
+            categories: Optional[dict[str, dict]] = None,
+            groups: Optional[dict[str, dict]] = None
+    ):
+        self.base: Final[bytes] = base
+        self.target: Final[bytes] = target
+        # tech name -> its data in the target revision, None when it was removed
+        self.technologies: Final[dict[str, Optional[dict]]] = technologies
+        # added tech name -> the tech it follows in the target revision, None when it comes first
+        self.predecessors: Final[dict[str, Optional[str]]] = predecessors
+        # the whole target order, only when technologies present in both revisions moved
+        self.order: Final[Optional[list[str]]] = order
+        # None when unchanged
+        self.categories: Final[Optional[dict[str, dict]]] = categories
+        self.groups: Final[Optional[dict[str, dict]]] = groups
+
+    @property
+    def changed(self) -> list[str]:
+        return [name for name, data in self.technologies.items() if data is not None]
+
+    @property
+    def removed(self) -> list[str]:
+        return [name for name, data in self.technologies.items() if data is None]
+
+    def __bool__(self) -> bool:
+        return self.base != self.target
+
+    def save(self, path: pathlib.Path = pathlib.Path("build").joinpath("fingerprints.delta")) -> pathlib.Path:
+        data: bytes = zlib.compress(marshal.dumps({
+            "technologies": self.technologies,
+            "predecessors": self.predecessors,
+            "order": self.order,
+            "categories": self.categories,
+            "groups": self.groups,
+        }))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = path.with_name(f"{path.name}.tmp")
+        with tmp.open("wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0, self.base, self.target, len(data)))
+            f.write(data)
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: pathlib.Path = pathlib.Path("build").joinpath("fingerprints.delta")) -> "FingerprintDelta":
+        raw: bytes = path.read_bytes()
+        if len(raw) < cls.HEADER.size:
+            raise InvalidDeltaException(f"{path} is too small to be a fingerprint delta")
+        magic, version, _, base, target, size = cls.HEADER.unpack_from(raw, 0)
+        if magic != cls.MAGIC:
+            raise InvalidDeltaException(f"{path} is not a fingerprint delta")
+        if version != cls.VERSION:
+            raise InvalidDeltaException(f"{path} has format version {version}, but {cls.VERSION} is required, diff it again")
+        if len(raw) != cls.HEADER.size + size:
+            raise InvalidDeltaException(f"{path} is truncated, expected {size} payload bytes")
+        try:
+            payload: dict[str, Any] = marshal.loads(zlib.decompress(raw[cls.HEADER.size:]))
+        except (zlib.error, EOFError, ValueError, TypeError):
+            raise InvalidDeltaException(f"{path} has a corrupt payload")
+        return cls(base, target, payload["technologies"], payload["predecessors"], payload["order"], payload["categories"], payload["groups"])
+
+
+class FingerprintStore:
+    MAGIC: Final[bytes] = b"WAPS"
+    VERSION: Final[int] = 1
+    # magic, version, reserved, revision, payload size
+    HEADER: Final[struct.Struct] = struct.Struct("<4sHH32sQ")
+
+    def __init__(self, categories: dict[str, dict], groups: dict[str, dict], technologies: dict[str, dict]):
+        self.categories: Final[dict[str, dict]] = categories
+        self.groups: Final[dict[str, dict]] = groups
+        # in the order a build from src reads them, tech ids follow it
+        self.technologies: Final[dict[str, dict]] = technologies
+        # tech name -> digest of its data, diffs compare these instead of the data
+        self.digests: Final[dict[str, bytes]] = {name: self.digest(data) for name, data in technologies.items()}
+        self.revision: Final[bytes] = self._revision()
+
+    def _revision(self) -> bytes:
+        revision = hashlib.sha256(self.digest([self.categories, self.groups]))
+        for name, digest in self.digests.items():
+            revision.update(name.encode("utf8"))
+            revision.update(digest)
+        return revision.digest()
+
+    @staticmethod
+    def digest(value: Any) -> bytes:
+        return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf8")).digest()
+
+    @classmethod
+    def from_source(cls, source_dir: pathlib.Path = pathlib.Path("src")) -> "FingerprintStore":
+        with source_dir.joinpath("categories.json").open("r", encoding="utf8") as f:
+            categories: dict[str, dict] = json.load(f)
+        with source_dir.joinpath("groups.json").open("r", encoding="utf8") as f:
+            groups: dict[str, dict] = json.load(f)
+        technologies: dict[str, dict] = {}
+        for tech_file in BundleBuilder(source_dir).tech_files():
+            with tech_file.open("r", encoding="utf8") as f:
+                technologies.update(json.load(f))
+        return cls(categories, groups, technologies)
+
+    def save(self, path: pathlib.Path = pathlib.Path("build").joinpath("fingerprints.store")) -> pathlib.Path:
+        data: bytes = zlib.compress(marshal.dumps({"categories": self.categories, "groups": self.groups, "technologies": self.technologies}))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = path.with_name(f"{path.name}.tmp")
+        with tmp.open("wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0, self.revision, len(data)))
+            f.write(data)
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: pathlib.Path = pathlib.Path("build").joinpath("fingerprints.store")) -> "FingerprintStore":
+        raw: bytes = path.read_bytes()
+        if len(raw) < cls.HEADER.size:
+            raise InvalidStoreException(f"{path} is too small to be a fingerprint store")
+        magic, version, _, revision, size = cls.HEADER.unpack_from(raw, 0)
+        if magic != cls.MAGIC:
+            raise InvalidStoreException(f"{path} is not a fingerprint store")
+        if version != cls.VERSION:
+            raise InvalidStoreException(f"{path} has format version {version}, but {cls.VERSION} is required, snapshot it again")
+        if len(raw) != cls.HEADER.size + size:
+            raise InvalidStoreException(f"{path} is truncated, expected {size} payload bytes")
+        try:
+            payload: dict[str, Any] = marshal.loads(zlib.decompress(raw[cls.HEADER.size:]))
+        except (zlib.error, EOFError, ValueError, TypeError):
+            raise InvalidStoreException(f"{path} has a corrupt payload")
+        store: FingerprintStore = cls(payload["categories"], payload["groups"], payload["technologies"])
+        if store.revision != revision:
+            raise InvalidStoreException(f"{path} content doesn't match its revision {revision.hex()[:12]}")
+        return store
+
+    def diff(self, target: "FingerprintStore") -> FingerprintDelta:
+        technologies: dict[str, Optional[dict]] = {name: None for name in self.technologies if name not in target.technologies}
+        predecessors: dict[str, Optional[str]] = {}
+        previous: Optional[str] = None
+        for name, digest in target.digests.items():
+            if name not in self.digests:
+                technologies[name] = target.technologies[name]
+                predecessors[name] = previous
+            elif self.digests[name] != digest:
+                technologies[name] = target.technologies[name]
+            previous = name
+        kept: list[str] = [name for name in self.technologies if name in target.technologies]
+        moved: bool = kept != [name for name in target.technologies if name in self.technologies]
+        return FingerprintDelta(
+            self.revision,
+            target.revision,
+            technologies,
+            predecessors,
+            list(target.technologies) if moved else None,
+            target.categories if self.digest(self.categories) != self.digest(target.categories) else None,
+            target.groups if self.digest(self.groups) != self.digest(target.groups) else None,
+        )
+
+    def apply(self, delta: FingerprintDelta) -> "FingerprintStore":
+        if delta.base != self.revision:
+            raise InvalidDeltaException(f"Delta applies to revision {delta.base.hex()[:12]}, but the store is at {self.revision.hex()[:12]}")
+        order: list[str]
+        if delta.order is not None:
+            order = delta.order
+        else:
+            order = [name for name in self.technologies if delta.technologies.get(name, self.technologies[name]) is not None]
+            # predecessors come first in the target order, so each one is already placed when its successor is inserted
+            for name, predecessor in delta.predecessors.items():
+                order.insert(0 if predecessor is None else order.index(predecessor) + 1, name)
+        technologies: dict[str, dict] = {}
+        for name in order:
+            data: Optional[dict] = delta.technologies.get(name, self.technologies.get(name))
+            if data is None:
+                raise InvalidDeltaException(f"Delta orders tech '{name}' but neither it nor the store has its data")
+            technologies[name] = data
+        store: FingerprintStore = FingerprintStore(
+            delta.categories if delta.categories is not None else self.categories,
+            delta.groups if delta.groups is not None else self.groups,
+            technologies
+        )
+        if store.revision != delta.target:
+            raise InvalidDeltaException(f"Applying the delta produced revision {store.revision.hex()[:12]} instead of {delta.target.hex()[:12]}")
+        return store
+
+    def bundle(self, previous: Optional[Bundle] = None) -> Bundle:
+        content_hash, payload, metadata = BundleBuilder(previous=previous).assemble(self.revision, self.categories, self.groups, self.technologies)
+        return Bundle(content_hash, payload, metadata)
+
+
+class LiveEngine:
+    def __init__(self, store: FingerprintStore, regexes: Optional[RegexRegistry] = None):
+        # a registry of its own by default, applying a delta evicts every regex the new revision doesn't use
+        self._regexes: Final[RegexRegistry] = regexes if regexes is not None else RegexRegistry()
+        self._lock: Final[threading.Lock] = threading.Lock()
+        # swapped as a single reference, a scan that already read it keeps a consistent store and engine pair
+        self._state: tuple[FingerprintStore, Engine] = (store, Engine(store.bundle(), self._regexes))
+
+    @property
+    def engine(self) -> Engine:
+        return self._state[1]
+
+    @property
+    def store(self) -> FingerprintStore:
+        return self._state[0]
+
+    def apply(self, delta: FingerprintDelta) -> Engine:
+        with self._lock:
+            previous_store, previous_engine = self._state
+            store: FingerprintStore = previous_store.apply(delta)
+            engine: Engine = Engine(store.bundle(previous_engine.bundle), self._regexes, previous_engine)
+            # the registry still holds every unchanged regex, warming only compiles the ones the delta brought
+            engine.warm()
+            self._state = (store, engine)
+            # without this the registry would keep every regex of every revision seen so far
+            self._regexes.retain(engine.bundle.strings[pattern[BundleFormat.PATTERN_REGEX]] for pattern in engine.bundle.patterns)
+        return engine
+
+    def reload(self, source_dir: pathlib.Path = pathlib.Path("src")) -> FingerprintDelta:
+        delta: FingerprintDelta = self.store.diff(FingerprintStore.from_source(source_dir))
+        if delta:
+            self.apply(delta)
+        return delta
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Snapshot fingerprint revisions and ship the changes between them")
+    commands = parser.add_subparsers(dest="command", required=True)
+    snapshot_parser: argparse.ArgumentParser = commands.add_parser("snapshot", help="store the current src revision")
+    snapshot_parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("build").joinpath("fingerprints.store"))
+    diff_parser: argparse.ArgumentParser = commands.add_parser("diff", help="write the delta from a stored revision to the current src")
+    diff_parser.add_argument("base", type=pathlib.Path)
+    diff_parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("build").joinpath("fingerprints.delta"))
+    apply_parser: argparse.ArgumentParser = commands.add_parser("apply", help="apply a delta to a stored revision")
+    apply_parser.add_argument("store", type=pathlib.Path)
+    apply_parser.add_argument("delta", type=pathlib.Path)
+    apply_parser.add_argument("--output", type=pathlib.Path, default=None)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.command == "snapshot":
+        store: FingerprintStore = FingerprintStore.from_source()
+        print(f"{store.save(args.output)} at revision {store.revision.hex()[:12]}")
+    elif args.command == "diff":
+        delta: FingerprintDelta = FingerprintStore.load(args.base).diff(FingerprintStore.from_source())
+        print(f"{delta.save(args.output)}: {len(delta.changed)} changed, {len(delta.removed)} removed, {delta.base.hex()[:12]} -> {delta.target.hex()[:12]}")
+    else:
+        store = FingerprintStore.load(args.store).apply(FingerprintDelta.load(args.delta))
+        print(f"{store.save(args.output or args.store)} at revision {store.revision.hex()[:12]}")
+
+
+if __name__ == '__main__':
+    main()
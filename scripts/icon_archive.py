@@ -0,0 +1,125 @@
+import hashlib
+import marshal
+import mmap
+import pathlib
+import struct
+from typing import Final, Any, Optional
+
+
+class InvalidIconArchiveException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class IconArchiveFormat:
+    MAGIC: Final[bytes] = b"WAPI"
+    VERSION: Final[int] = 1
+    # magic, version, reserved, content hash, index size, data size
+    HEADER: Final[struct.Struct] = struct.Struct("<4sHH32sQQ")
+    MEDIA_TYPES: Final[dict[str, str]] = {".svg": "image/svg+xml", ".png": "image/png"}
+
+
+class IconArchiveBuilder:
+    def __init__(self, source_dir: pathlib.Path = pathlib.Path("src")):
+        self._ICONS_DIR: Final[pathlib.Path] = source_dir.joinpath("images").joinpath("icons")
+
+    def build(self, output: pathlib.Path = pathlib.Path("build").joinpath("icons.pack")) -> pathlib.Path:
+        digest = hashlib.sha256()
+        # icon name -> (offset in the data section, size), identical icons share their bytes
+        index: dict[str, tuple[int, int]] = {}
+        blobs: dict[bytes, tuple[int, int]] = {}
+        data: list[bytes] = []
+        offset: int = 0
+        for file in sorted(self._ICONS_DIR.iterdir()):
+            content: bytes = file.read_bytes()
+            digest.update(file.name.encode("utf8"))
+            digest.update(content)
+            content_digest: bytes = hashlib.sha256(content).digest()
+            if content_digest not in blobs:
+                blobs[content_digest] = (offset, len(content))
+                data.append(content)
+                offset += len(content)
+            index[file.name] = blobs[content_digest]
+        packed_index: bytes = marshal.dumps(index)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = output.with_name(f"{output.name}.tmp")
+        with tmp.open("wb") as f:
+            f.write(IconArchiveFormat.HEADER.pack(IconArchiveFormat.MAGIC, IconArchiveFormat.VERSION, 0, digest.digest(), len(packed_index), offset))
+            f.write(packed_index)
+            for content in data:
+                f.write(content)
+        tmp.replace(output)
+        return output
+
+
+class IconArchive:
+    def __init__(self, path: pathlib.Path = pathlib.Path("build").joinpath("icons.pack")):
+        with path.open("rb") as f:
+            if path.stat().st_size < IconArchiveFormat.HEADER.size:
+                raise InvalidIconArchiveException(f"{path} is too small to be an icon archive")
+            # the mapping keeps its own handle on the file, the descriptor can go
+            self._mm: Final[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header: tuple[bytes, int, dict[str, tuple[int, int]]] = self._read_header(path)
+        except BaseException:
+            # whatever failed, nothing else holds the mapping to close it later
+            self._mm.close()
+            raise
+        self.content_hash: Final[bytes] = header[0]
+        self._base: Final[int] = header[1]
+        self._index: Final[dict[str, tuple[int, int]]] = header[2]
+
+    def _read_header(self, path: pathlib.Path) -> tuple[bytes, int, dict[str, tuple[int, int]]]:
+        magic, version, _, content_hash, index_size, data_size = IconArchiveFormat.HEADER.unpack_from(self._mm, 0)
+        if magic != IconArchiveFormat.MAGIC:
+            raise InvalidIconArchiveException(f"{path} is not an icon archive")
+        if version != IconArchiveFormat.VERSION:
+            raise InvalidIconArchiveException(f"{path} has format version {version}, but {IconArchiveFormat.VERSION} is required, rebuild it")
+        base: int = IconArchiveFormat.HEADER.size + index_size
+        if len(self._mm) != base + data_size:
+            raise InvalidIconArchiveException(f"{path} is truncated, expected {index_size + data_size} payload bytes")
+        try:
+            index: Any = marshal.loads(self._mm[IconArchiveFormat.HEADER.size:base])
+        except (EOFError, ValueError, TypeError):
+            raise InvalidIconArchiveException(f"{path} has a corrupt index, rebuild it")
+        if not isinstance(index, dict):
+            raise InvalidIconArchiveException(f"{path} has a corrupt index, rebuild it")
+        return content_hash, base, index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self) -> "IconArchive":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def names(self) -> list[str]:
+        return sorted(self._index)
+
+    def locate(self, name: str) -> Optional[tuple[int, int]]:
+        # absolute offset and size in the archive file
+        entry: Optional[tuple[int, int]] = self._index.get(name)
+        return None if entry is None else (self._base + entry[0], entry[1])
+
+    def get(self, name: str) -> Optional[bytes]:
+        location: Optional[tuple[int, int]] = self.locate(name)
+        if location is None:
+            return None
+        offset, size = location
+        return self._mm[offset:offset + size]
+
+    @staticmethod
+    def media_type(name: str) -> str:
+        return IconArchiveFormat.MEDIA_TYPES.get(pathlib.PurePath(name).suffix.lower(), "application/octet-stream")
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+if __name__ == '__main__':
+    print(IconArchiveBuilder().build())
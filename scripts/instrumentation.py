@@ -0,0 +1,94 @@
+import bisect
+import threading
+from typing import Final
+
+from bundle import Bundle
+
+
+class Instrumentation:
+    def field(self, field: str, seconds: float) -> None:
+        pass
+
+    def prefilter(self, field: str, candidates: int, entries: int) -> None:
+        pass
+
+    def evaluation(self, tech_id: int, pattern_id: int, seconds: float, matched: bool) -> None:
+        pass
+
+
+class MetricsCollector(Instrumentation):
+    BUCKETS: Final[tuple[float, ...]] = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0)
+
+    def __init__(self, bundle: Bundle, prefix: str = "webappanalyzer"):
+        self._bundle: Final[Bundle] = bundle
+        self._PREFIX: Final[str] = prefix
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self.field_seconds: Final[dict[str, float]] = {}
+        self.field_runs: Final[dict[str, int]] = {}
+        self.prefilter_candidates: Final[dict[str, int]] = {}
+        self.prefilter_skipped: Final[dict[str, int]] = {}
+        self.evaluations: Final[list[int]] = [0] * len(bundle.technologies)
+        self.matches: Final[list[int]] = [0] * len(bundle.technologies)
+        self.regex_buckets: Final[list[int]] = [0] * (len(self.BUCKETS) + 1)
+        self.regex_seconds: float = 0.0
+
+    def field(self, field: str, seconds: float) -> None:
+        with self._lock:
+            self.field_seconds[field] = self.field_seconds.get(field, 0.0) + seconds
+            self.field_runs[field] = self.field_runs.get(field, 0) + 1
+
+    def prefilter(self, field: str, candidates: int, entries: int) -> None:
+        with self._lock:
+            self.prefilter_candidates[field] = self.prefilter_candidates.get(field, 0) + candidates
+            self.prefilter_skipped[field] = self.prefilter_skipped.get(field, 0) + entries - candidates
+
+    def evaluation(self, tech_id: int, pattern_id: int, seconds: float, matched: bool) -> None:
+        with self._lock:
+            self.evaluations[tech_id] += 1
+            if matched:
+                self.matches[tech_id] += 1
+            self.regex_buckets[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            self.regex_seconds += seconds
+
+    def export(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            self._metric(lines, "field_seconds_total", "counter", "Time spent matching each field", [
+                ({"field": field}, seconds) for field, seconds in sorted(self.field_seconds.items())
+            ])
+            self._metric(lines, "field_runs_total", "counter", "Times each field was matched", [
+                ({"field": field}, runs) for field, runs in sorted(self.field_runs.items())
+            ])
+            self._metric(lines, "prefilter_candidates_total", "counter", "Entries the literal prefilter let through", [
+                ({"field": field}, count) for field, count in sorted(self.prefilter_candidates.items())
+            ])
+            self._metric(lines, "prefilter_skipped_total", "counter", "Entries the literal prefilter skipped", [
+                ({"field": field}, count) for field, count in sorted(self.prefilter_skipped.items())
+            ])
+            self._metric(lines, "technology_evaluations_total", "counter", "Pattern evaluations per technology", [
+                ({"technology": self._bundle.tech_name(tech_id)}, count) for tech_id, count in enumerate(self.evaluations) if count
+            ])
+            self._metric(lines, "technology_matches_total", "counter", "Matching pattern evaluations per technology", [
+                ({"technology": self._bundle.tech_name(tech_id)}, count) for tech_id, count in enumerate(self.matches) if count
+            ])
+            name: str = f"{self._PREFIX}_regex_seconds"
+            lines.append(f"# HELP {name} Time spent in a single pattern evaluation")
+            lines.append(f"# TYPE {name} histogram")
+            cumulative: int = 0
+            for bound, count in zip(self.BUCKETS + (float("inf"),), self.regex_buckets):
+                cumulative += count
+                lines.append(f"{name}_bucket{{le=\"{'+Inf' if bound == float('inf') else bound}\"}} {cumulative}")
+            lines.append(f"{name}_sum {self.regex_seconds}")
+            lines.append(f"{name}_count {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def _metric(self, lines: list[str], name: str, kind: str, description: str, samples: list[tuple[dict[str, str], float]]) -> None:
+        lines.append(f"# HELP {self._PREFIX}_{name} {description}")
+        lines.append(f"# TYPE {self._PREFIX}_{name} {kind}")
+        for labels, value in samples:
+            rendered: str = ",".join(f"{label}=\"{escape_label(label_value)}\"" for label, label_value in labels.items())
+            lines.append(f"{self._PREFIX}_{name}{{{rendered}}} {value}")
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
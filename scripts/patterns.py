@@ -0,0 +1,97 @@
+import re
+from typing import Final, Optional, Union
+
+
+class TooManyTagsException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class InvalidTagException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class InvalidVersionTemplateException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+# a literal, a capture group index, or (group, parts if the group matched, parts otherwise)
+TemplatePart = Union[str, int, tuple[int, tuple, tuple]]
+
+
+class VersionTemplate:
+    _TERNARY: Final[re.Pattern] = re.compile(r"\\(\d+)\?([^:]*):(.*)$")
+    _REFERENCE: Final[re.Pattern] = re.compile(r"\\(\d+)")
+
+    @classmethod
+    def parse(cls, template: str, groups: int) -> tuple[TemplatePart, ...]:
+        ternary: Optional[re.Match] = cls._TERNARY.search(template)
+        if ternary is None:
+            return cls._parts(template.strip(), groups)
+        if cls._TERNARY.search(ternary.group(3)):
+            raise InvalidVersionTemplateException(f"version template '{template}' has more than one ternary")
+        return cls._parts(template[:ternary.start()].lstrip(), groups) + (
+            (cls._group(template, ternary.group(1), groups), cls._parts(ternary.group(2), groups), cls._parts(ternary.group(3).rstrip(), groups)),
+        )
+
+    @classmethod
+    def _parts(cls, text: str, groups: int) -> tuple[TemplatePart, ...]:
+        parts: list[TemplatePart] = []
+        position: int = 0
+        for reference in cls._REFERENCE.finditer(text):
+            if reference.start() > position:
+                parts.append(text[position:reference.start()])
+            parts.append(cls._group(text, reference.group(1), groups))
+            position = reference.end()
+        if position < len(text):
+            parts.append(text[position:])
+        return tuple(parts)
+
+    @staticmethod
+    def _group(template: str, index: str, groups: int) -> int:
+        if int(index) > groups:
+            raise InvalidVersionTemplateException(f"version template '{template}' references group {index} but the regex only has {groups}")
+        return int(index)
+
+
+class ParsedPattern:
+    def __init__(self, regex: str, version: Optional[str] = None, confidence: int = 100):
+        self.regex: Final[str] = regex
+        self.version: Final[Optional[str]] = version
+        self.confidence: Final[int] = confidence
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ParsedPattern):
+            return NotImplemented
+        return (self.regex, self.version, self.confidence) == (other.regex, other.version, other.confidence)
+
+    def __hash__(self) -> int:
+        return hash((self.regex, self.version, self.confidence))
+
+    def __repr__(self) -> str:
+        return f"ParsedPattern({self.regex!r}, version={self.version!r}, confidence={self.confidence})"
+
+
+class PatternParser:
+    TAG_SEPARATOR: Final[str] = r"\;"
+
+    @classmethod
+    def parse(cls, pattern: str) -> ParsedPattern:
+        regex, *tags = pattern.split(cls.TAG_SEPARATOR)
+        if len(tags) > 2:
+            raise TooManyTagsException(f"pattern '{pattern}' has more than 2 tags, only confidence & version are allowed!")
+        version: Optional[str] = None
+        confidence: int = 100
+        for tag in tags:
+            tag_name, _, tag_value = tag.partition(":")
+            if tag_name == "confidence":
+                if not tag_value.isnumeric():
+                    raise InvalidTagException(f"Invalid tag value '{tag_value}' in pattern '{pattern}', confidence must be numeric!")
+                confidence = int(tag_value)
+            elif tag_name == "version":
+                version = tag_value
+            else:
+                raise InvalidTagException(f"this tag '{tag_name}' in pattern '{pattern}' doesn't exist!")
+        return ParsedPattern(regex, version, confidence)
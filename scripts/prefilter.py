@@ -0,0 +1,162 @@
+import re
+from re import _constants as sre_constants
+from re import _parser as sre_parse
+from typing import Final, Optional
+
+
+class LiteralExtractor:
+    def __init__(self, min_length: int = 3, max_alternatives: int = 16):
+        self._MIN_LENGTH: Final[int] = min_length
+        self._MAX_ALTERNATIVES: Final[int] = max_alternatives
+        self._REPEATS: Final[tuple] = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+    def extract(self, regex: str) -> tuple[str, ...]:
+        try:
+            parsed: sre_parse.SubPattern = sre_parse.parse(regex)
+        except re.error:
+            return ()
+        required: Optional[frozenset[str]] = self._sequence(list(parsed))
+        return tuple(sorted(required)) if required else ()
+
+    def _sequence(self, items: list) -> Optional[frozenset[str]]:
+        best: Optional[frozenset[str]] = None
+        run: frozenset[str] = frozenset({""})
+        for op, av in items:
+            exact: Optional[frozenset[str]] = self._exact(op, av)
+            if exact is not None and len(run) * len(exact) <= self._MAX_ALTERNATIVES:
+                run = frozenset(prefix + suffix for prefix in run for suffix in exact)
+                continue
+            best = self._better(best, run)
+            run = frozenset({""})
+            best = self._better(best, self._required(op, av))
+        return self._better(best, run)
+
+    def _exact(self, op, av) -> Optional[frozenset[str]]:
+        if op is sre_constants.LITERAL:
+            return frozenset({chr(av).lower()})
+        if op is sre_constants.AT:
+            return frozenset({""})
+        if op is sre_constants.SUBPATTERN:
+            return self._exact_sequence(list(av[3]))
+        if op is sre_constants.BRANCH:
+            alternatives: set[str] = set()
+            for branch in av[1]:
+                exact: Optional[frozenset[str]] = self._exact_sequence(list(branch))
+                if exact is None:
+                    return None
+                alternatives.update(exact)
+            return frozenset(alternatives) if len(alternatives) <= self._MAX_ALTERNATIVES else None
+        if op is sre_constants.IN and all(item_op is sre_constants.LITERAL for item_op, _ in av):
+            return frozenset(chr(item_av).lower() for _, item_av in av)
+        return None
+
+    def _exact_sequence(self, items: list) -> Optional[frozenset[str]]:
+        run: frozenset[str] = frozenset({""})
+        for op, av in items:
+            exact: Optional[frozenset[str]] = self._exact(op, av)
+            if exact is None or len(run) * len(exact) > self._MAX_ALTERNATIVES:
+                return None
+            run = frozenset(prefix + suffix for prefix in run for suffix in exact)
+        return run
+
+    def _required(self, op, av) -> Optional[frozenset[str]]:
+        if op is sre_constants.SUBPATTERN:
+            return self._sequence(list(av[3]))
+        if op in self._REPEATS and av[0] >= 1:
+            return self._sequence(list(av[2]))
+        if op is sre_constants.ATOMIC_GROUP:
+            return self._sequence(list(av))
+        if op is sre_constants.ASSERT:
+            return self._sequence(list(av[1]))
+        if op is sre_constants.BRANCH:
+            alternatives: set[str] = set()
+            for branch in av[1]:
+                required: Optional[frozenset[str]] = self._sequence(list(branch))
+                if required is None:
+                    return None
+                alternatives.update(required)
+            return frozenset(alternatives) if len(alternatives) <= self._MAX_ALTERNATIVES else None
+        return None
+
+    def _better(self, current: Optional[frozenset[str]], candidate: Optional[frozenset[str]]) -> Optional[frozenset[str]]:
+        if not candidate or min(len(literal) for literal in candidate) < self._MIN_LENGTH:
+            return current
+        if current is None:
+            return candidate
+        candidate_score: tuple[int, int] = (min(len(literal) for literal in candidate), -len(candidate))
+        current_score: tuple[int, int] = (min(len(literal) for literal in current), -len(current))
+        return candidate if candidate_score > current_score else current
+
+
+class LiteralScanner:
+    def __init__(self, literals: list[str]):
+        self._literals: Final[list[str]] = literals
+        ids: dict[str, int] = {literal: literal_id for literal_id, literal in enumerate(literals)}
+        self._prefixes: Final[dict[str, tuple[int, ...]]] = {
+            literal: tuple(ids[literal[:end]] for end in range(1, len(literal) + 1) if literal[:end] in ids)
+            for literal in literals
+        }
+        trie: dict = {}
+        for literal in literals:
+            node: dict = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[""] = True
+        self._regex: Final[Optional[re.Pattern]] = re.compile(self._trie_regex(trie)) if literals else None
+
+    @property
+    def max_length(self) -> int:
+        return max((len(literal) for literal in self._literals), default=0)
+
+    def scan(self, text: str) -> set[int]:
+        found: set[int] = set()
+        if self._regex is None:
+            return found
+        search = self._regex.search
+        prefixes: dict[str, tuple[int, ...]] = self._prefixes
+        match: Optional[re.Match] = search(text)
+        while match:
+            found.update(prefixes[match.group()])
+            match = search(text, match.start() + 1)
+        return found
+
+    def _trie_regex(self, node: dict) -> str:
+        alternatives: list[str] = [re.escape(char) + self._trie_regex(child) for char, child in sorted(node.items()) if char != ""]
+        if not alternatives:
+            return ""
+        body: str = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        return f"(?:{body})?" if "" in node else body
+
+
+class Prefilter:
+    def __init__(self, entry_literals: list[tuple[str, ...]]):
+        literal_ids: dict[str, int] = {}
+        self._unfiltered: Final[list[int]] = []
+        self._by_literal: Final[list[list[int]]] = []
+        for entry, literals in enumerate(entry_literals):
+            if not literals:
+                self._unfiltered.append(entry)
+                continue
+            for literal in literals:
+                if literal not in literal_ids:
+                    literal_ids[literal] = len(literal_ids)
+                    self._by_literal.append([])
+                self._by_literal[literal_ids[literal]].append(entry)
+        self._scanner: Final[LiteralScanner] = LiteralScanner(list(literal_ids))
+
+    @property
+    def unfiltered(self) -> list[int]:
+        return self._unfiltered
+
+    @property
+    def max_literal_length(self) -> int:
+        return self._scanner.max_length
+
+    def candidates(self, text: str) -> list[int]:
+        return sorted(self.scan(text).union(self._unfiltered))
+
+    def scan(self, text: str) -> set[int]:
+        selected: set[int] = set()
+        for literal_id in self._scanner.scan(text):
+            selected.update(self._by_literal[literal_id])
+        return selected
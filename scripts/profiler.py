@@ -0,0 +1,95 @@
+import argparse
+import json
+import pathlib
+import sys
+import threading
+import types
+from typing import Final, Optional
+
+from bundle import Bundle
+from engine import Engine, Snapshot
+from instrumentation import MetricsCollector, escape_label
+
+
+class SamplingProfiler:
+    def __init__(self, engine: Engine, interval: float = 0.001, prefix: str = "webappanalyzer"):
+        self._engine: Final[Engine] = engine
+        self._INTERVAL: Final[float] = interval
+        self._PREFIX: Final[str] = prefix
+        self._ENGINE_FILE: Final[str] = sys.modules[Engine.__module__].__file__
+        # engine methods that hold the technology being evaluated in a tech_id local
+        self._TECH_CODES: Final[set[types.CodeType]] = {
+            method.__code__ for method in (Engine.match_pattern, Engine._match_timed, Engine._match_pattern, Engine._match_dom, Engine._match_technology)
+        }
+        self._stop: Final[threading.Event] = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.samples: Final[dict[str, int]] = {}
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def top(self, count: int = 20) -> list[tuple[str, int]]:
+        return sorted(self.samples.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+    def export(self) -> str:
+        name: str = f"{self._PREFIX}_profile_samples_total"
+        lines: list[str] = [f"# HELP {name} Profiler samples attributed to each technology", f"# TYPE {name} counter"]
+        lines.extend(f"{name}{{technology=\"{escape_label(label)}\"}} {count}" for label, count in self.top(len(self.samples)))
+        return "\n".join(lines) + "\n"
+
+    def _run(self) -> None:
+        own: int = threading.get_ident()
+        while not self._stop.wait(self._INTERVAL):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own:
+                    label: Optional[str] = self._attribute(frame)
+                    if label is not None:
+                        self.samples[label] = self.samples.get(label, 0) + 1
+
+    def _attribute(self, frame: Optional[types.FrameType]) -> Optional[str]:
+        engine_function: Optional[str] = None
+        while frame is not None:
+            if frame.f_code in self._TECH_CODES and (tech_id := frame.f_locals.get("tech_id")) is not None:
+                return self._engine.bundle.tech_name(tech_id)
+            if engine_function is None and frame.f_code.co_filename == self._ENGINE_FILE:
+                engine_function = frame.f_code.co_name
+            frame = frame.f_back
+        # time inside the engine but outside any pattern, e.g. prefiltering or dom parsing
+        return f"<{engine_function}>" if engine_function is not None else None
+
+
+if __name__ == '__main__':
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("snapshots", nargs="+", type=pathlib.Path)
+    parser.add_argument("--profile", action="store_true", help="also sample which technologies use the CPU")
+    parser.add_argument("--interval", type=float, default=0.001)
+    args: argparse.Namespace = parser.parse_args()
+    bundle_path: pathlib.Path = pathlib.Path("build").joinpath("technologies.bundle")
+    engine: Engine = Engine(Bundle.load(bundle_path) if bundle_path.is_file() else Bundle.from_source())
+    metrics: MetricsCollector = MetricsCollector(engine.bundle)
+    engine.instrument(metrics)
+    profiler: SamplingProfiler = SamplingProfiler(engine, args.interval)
+    if args.profile:
+        profiler.start()
+    for snapshot_file in args.snapshots:
+        with snapshot_file.open("r", encoding="utf8") as f:
+            engine.analyze(Snapshot.from_dict(json.load(f)))
+    profiler.stop()
+    sys.stdout.write(metrics.export())
+    if args.profile:
+        sys.stdout.write(profiler.export())
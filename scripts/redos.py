@@ -0,0 +1,295 @@
+import re
+import string
+import time
+from re import _constants as sre_constants
+from re import _parser as sre_parse
+from typing import Final, Optional
+
+
+class Finding:
+    EXPONENTIAL: Final[str] = "exponential"
+    POLYNOMIAL: Final[str] = "polynomial"
+
+    def __init__(self, severity: str, kind: str, pump: str):
+        self.severity: Final[str] = severity
+        self.kind: Final[str] = kind
+        self.pump: Final[str] = pump
+
+    def __repr__(self) -> str:
+        return f"Finding({self.severity!r}, {self.kind!r}, {self.pump!r})"
+
+
+class PatternReport:
+    def __init__(self, regex: str, findings: list[Finding], length: int, seconds: float, severity: Optional[str]):
+        self.regex: Final[str] = regex
+        self.findings: Final[list[Finding]] = findings
+        self.length: Final[int] = length
+        self.seconds: Final[float] = seconds
+        self.severity: Final[Optional[str]] = severity
+
+    @property
+    def kinds(self) -> list[str]:
+        return sorted({finding.kind for finding in self.findings})
+
+
+class ReDoSAnalyzer:
+    ALPHABET: Final[str] = string.printable + "\x00\xe9"
+    _REPEATS: Final[tuple] = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+    def __init__(self, budget: float = 0.1, max_length: int = 20000, short_length: int = 256, unbounded: int = 16):
+        self._BUDGET: Final[float] = budget
+        self._MAX_LENGTH: Final[int] = max_length
+        # blowing the budget on an input this short means the growth is exponential, not polynomial
+        self._SHORT_LENGTH: Final[int] = short_length
+        # repeats allowing at least this many iterations count as unbounded
+        self._UNBOUNDED: Final[int] = unbounded
+        self._CATEGORIES: Final[dict] = {
+            sre_constants.CATEGORY_DIGIT: frozenset(string.digits),
+            sre_constants.CATEGORY_SPACE: frozenset(string.whitespace),
+            sre_constants.CATEGORY_WORD: frozenset(string.ascii_letters + string.digits + "_\xe9"),
+        }
+        self._NEGATED_CATEGORIES: Final[dict] = {
+            sre_constants.CATEGORY_NOT_DIGIT: sre_constants.CATEGORY_DIGIT,
+            sre_constants.CATEGORY_NOT_SPACE: sre_constants.CATEGORY_SPACE,
+            sre_constants.CATEGORY_NOT_WORD: sre_constants.CATEGORY_WORD,
+        }
+
+    def check(self, regex: str) -> PatternReport:
+        try:
+            compiled: re.Pattern = re.compile(regex, re.IGNORECASE)
+            parsed: list = list(sre_parse.parse(regex))
+        except re.error:
+            return PatternReport(regex, [], 0, 0.0, None)
+        findings: list[Finding] = self.analyze(parsed)
+        length, seconds = self.fuzz(compiled, parsed, findings)
+        severity: Optional[str] = None
+        if any(finding.severity == Finding.EXPONENTIAL for finding in findings) or (seconds > self._BUDGET and length <= self._SHORT_LENGTH):
+            severity = Finding.EXPONENTIAL
+        elif findings or seconds > self._BUDGET:
+            severity = Finding.POLYNOMIAL
+        return PatternReport(regex, findings, length, seconds, severity)
+
+    def analyze(self, items: list) -> list[Finding]:
+        findings: list[Finding] = []
+        self._walk(items, findings)
+        return findings
+
+    def fuzz(self, compiled: re.Pattern, items: list, findings: list[Finding]) -> tuple[int, float]:
+        pumps: set[str] = {finding.pump for finding in findings if finding.pump}
+        for op, av in self._repeats(items):
+            pump: str = self._sample(list(av[2])) or self._any_char(self._chars(list(av[2])))
+            if pump:
+                pumps.add(pump)
+        prefixes: set[str] = {"", self._sample(items)[:1]}
+        worst: tuple[int, float] = (0, 0.0)
+        for pump in sorted(pumps):
+            for prefix in sorted(prefixes):
+                for suffix in ("\x00", "!", "\n"):
+                    result: tuple[int, float] = self._pump(compiled, prefix, pump, suffix)
+                    if result[1] > worst[1]:
+                        worst = result
+                    if worst[1] > self._BUDGET:
+                        return worst
+        return worst
+
+    def _pump(self, compiled: re.Pattern, prefix: str, pump: str, suffix: str) -> tuple[int, float]:
+        count: int = 4
+        worst: tuple[int, float] = (0, 0.0)
+        while True:
+            attack: str = prefix + pump * count + suffix
+            if len(attack) > self._MAX_LENGTH:
+                return worst
+            start: float = time.perf_counter()
+            compiled.search(attack)
+            seconds: float = time.perf_counter() - start
+            if seconds > worst[1]:
+                worst = (len(attack), seconds)
+            if seconds > self._BUDGET:
+                return worst
+            # small steps first: an exponential pattern must hit the budget before the input gets long
+            count = count + 4 if count < 32 else count * 2
+
+    def _walk(self, items: list, findings: list[Finding]) -> None:
+        for index, (op, av) in enumerate(items):
+            if op in self._REPEATS and av[1] >= self._UNBOUNDED:
+                body: list = list(av[2])
+                self._nested(body, findings)
+                self._alternation(body, findings)
+                self._adjacent(items, index, findings)
+            for child in self._children(op, av):
+                self._walk(child, findings)
+
+    def _nested(self, body: list, findings: list[Finding]) -> None:
+        body = self._flatten(body)
+        for index, (op, av) in enumerate(body):
+            for inner_op, inner_av in self._repeats([(op, av)]):
+                if inner_av[1] < self._UNBOUNDED or self._width(list(inner_av[2]))[1] == 0:
+                    continue
+                inner_chars: frozenset[str] = self._chars(list(inner_av[2]))
+                if not self._separated(body, inner_chars, index):
+                    findings.append(Finding(Finding.EXPONENTIAL, "nested quantifier", self._any_char(inner_chars)))
+                    return
+
+    def _alternation(self, body: list, findings: list[Finding]) -> None:
+        for op, av in body:
+            if op is sre_constants.SUBPATTERN:
+                self._alternation(list(av[3]), findings)
+            elif op is sre_constants.BRANCH:
+                branches: list[list] = [list(branch) for branch in av[1]]
+                for first in range(len(branches)):
+                    for second in range(first + 1, len(branches)):
+                        pump: Optional[str] = self._overlap(branches[first], branches[second])
+                        if pump is not None:
+                            pump = pump or self._sample(body) or self._any_char(self._chars(body))
+                            findings.append(Finding(Finding.EXPONENTIAL, "overlapping alternation", pump))
+                            return
+
+    def _adjacent(self, items: list, index: int, findings: list[Finding]) -> None:
+        body: list = self._flatten(list(items[index][1][2]))
+        chars: frozenset[str] = self._chars(body)
+        for op, av in items[index + 1:]:
+            if op in self._REPEATS and av[1] >= self._UNBOUNDED:
+                next_body: list = self._flatten(list(av[2]))
+                next_chars: frozenset[str] = self._chars(next_body)
+                common: frozenset[str] = chars & next_chars
+                # each iteration needing a character the other repeat can't take pins where one ends and the other starts
+                if common and not self._separated(next_body, chars) and not self._separated(body, next_chars):
+                    findings.append(Finding(Finding.POLYNOMIAL, "adjacent quantifiers", self._any_char(common)))
+                return
+            if self._width([(op, av)])[0] > 0:
+                return
+
+    def _separated(self, items: list, chars: frozenset[str], skip: int = -1) -> bool:
+        # a mandatory separator the repeat can't consume makes the split unambiguous
+        return any(self._width([item])[0] > 0 and not self._chars([item]) & chars for other, item in enumerate(items) if other != skip)
+
+    def _overlap(self, first: list, second: list) -> Optional[str]:
+        # the parser factors common prefixes out, so (a|a) reaches us as two empty branches
+        if self._width(first)[0] == 0 and self._width(second)[0] == 0:
+            return ""
+        if self._width(first) == (1, 1) and self._width(second) == (1, 1):
+            return self._any_char(self._chars(first) & self._chars(second)) or None
+        for sample, other in ((self._sample(first), second), (self._sample(second), first)):
+            try:
+                if sample and re.fullmatch(self._unparse(other), sample, re.IGNORECASE):
+                    return sample
+            except re.error:
+                return None
+        return None
+
+    def _repeats(self, items: list) -> list[tuple]:
+        found: list[tuple] = []
+        for op, av in items:
+            if op in self._REPEATS:
+                found.append((op, av))
+            for child in self._children(op, av):
+                found.extend(self._repeats(child))
+        return found
+
+    def _flatten(self, items: list) -> list:
+        flat: list = []
+        for op, av in items:
+            if op is sre_constants.SUBPATTERN:
+                flat.extend(self._flatten(list(av[3])))
+            else:
+                flat.append((op, av))
+        return flat
+
+    @staticmethod
+    def _children(op, av) -> list[list]:
+        if op is sre_constants.SUBPATTERN:
+            return [list(av[3])]
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            return [list(av[2])]
+        if op is sre_constants.BRANCH:
+            return [list(branch) for branch in av[1]]
+        if op is sre_constants.GROUPREF_EXISTS:
+            return [list(branch) for branch in av[1:] if branch is not None]
+        # possessive repeats, atomic groups and lookarounds never backtrack into the outer pattern
+        return []
+
+    def _width(self, items: list) -> tuple[int, int]:
+        low, high = sre_parse.SubPattern(sre_parse.State(), items).getwidth()
+        return low, high
+
+    def _chars(self, items: list) -> frozenset[str]:
+        chars: set[str] = set()
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                chars.update(self._cased(chr(av)))
+            elif op is sre_constants.NOT_LITERAL:
+                chars.update(self.ALPHABET)
+                chars.difference_update(self._cased(chr(av)))
+            elif op is sre_constants.ANY:
+                chars.update(char for char in self.ALPHABET if char != "\n")
+            elif op is sre_constants.IN:
+                chars.update(self._set(av))
+            else:
+                for child in self._children(op, av):
+                    chars.update(self._chars(child))
+                if op is sre_constants.ATOMIC_GROUP:
+                    chars.update(self._chars(list(av)))
+                elif op is sre_constants.POSSESSIVE_REPEAT:
+                    chars.update(self._chars(list(av[2])))
+        return frozenset(chars)
+
+    def _set(self, items: list) -> frozenset[str]:
+        chars: set[str] = set()
+        negate: bool = False
+        for op, av in items:
+            if op is sre_constants.NEGATE:
+                negate = True
+            elif op is sre_constants.LITERAL:
+                chars.update(self._cased(chr(av)))
+            elif op is sre_constants.RANGE:
+                chars.update(char for char in self.ALPHABET if av[0] <= ord(char) <= av[1] or av[0] <= ord(char.swapcase()) <= av[1])
+            elif op is sre_constants.CATEGORY:
+                if av in self._CATEGORIES:
+                    chars.update(self._CATEGORIES[av])
+                elif av in self._NEGATED_CATEGORIES:
+                    chars.update(frozenset(self.ALPHABET) - self._CATEGORIES[self._NEGATED_CATEGORIES[av]])
+        return frozenset(self.ALPHABET) - chars if negate else frozenset(chars)
+
+    def _sample(self, items: list) -> str:
+        sample: list[str] = []
+        for op, av in items:
+            if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+                sample.append(self._any_char(self._chars([(op, av)])))
+            elif op is sre_constants.SUBPATTERN:
+                sample.append(self._sample(list(av[3])))
+            elif op is sre_constants.BRANCH:
+                sample.append(self._sample(list(av[1][0])))
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT):
+                sample.append(self._sample(list(av[2])) * av[0])
+            elif op is sre_constants.ATOMIC_GROUP:
+                sample.append(self._sample(list(av)))
+        return "".join(sample)
+
+    def _unparse(self, items: list) -> str:
+        # rebuilds a standalone regex for one branch so the samples of its siblings can be tested against it
+        return "".join(self._unparse_item(op, av) for op, av in items)
+
+    def _unparse_item(self, op, av) -> str:
+        if op is sre_constants.LITERAL:
+            return re.escape(chr(av))
+        if op is sre_constants.SUBPATTERN:
+            return f"(?:{self._unparse(list(av[3]))})"
+        if op is sre_constants.BRANCH:
+            return f"(?:{'|'.join(self._unparse(list(branch)) for branch in av[1])})"
+        if op in self._REPEATS or op is sre_constants.POSSESSIVE_REPEAT:
+            high: str = "" if av[1] == sre_constants.MAXREPEAT else str(av[1])
+            return f"(?:{self._unparse(list(av[2]))}){{{av[0]},{high}}}"
+        if op is sre_constants.AT or op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return ""
+        chars: frozenset[str] = self._chars([(op, av)])
+        return f"[{''.join(re.escape(char) for char in sorted(chars))}]" if chars else "(?!)"
+
+    @staticmethod
+    def _cased(char: str) -> set[str]:
+        return {char, char.lower(), char.upper()}
+
+    def _any_char(self, chars: frozenset[str]) -> str:
+        for char in "a0 <" + self.ALPHABET:
+            if char in chars:
+                return char
+        return ""
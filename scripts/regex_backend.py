@@ -0,0 +1,385 @@
+import re
+from re import _constants as sre_constants
+from re import _parser as sre_parse
+from typing import Final, Any, Optional
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+class IncompatiblePatternException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class RegexBackend:
+    NAME: str = ""
+    MASK: int = 0
+    LINEAR: bool = False
+
+    def __init__(self, flags: int = re.IGNORECASE):
+        self._FLAGS: Final[int] = flags
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def translate(self, regex: str, parsed: Optional[sre_parse.SubPattern] = None) -> str:
+        return regex
+
+    def compile(self, regex: str) -> Any:
+        raise NotImplementedError
+
+
+class StdlibBackend(RegexBackend):
+    NAME: str = "re"
+    MASK: int = 1
+
+    def compile(self, regex: str) -> re.Pattern:
+        try:
+            return re.compile(regex, self._FLAGS)
+        except re.error as e:
+            raise IncompatiblePatternException(f"re rejects it: {e.msg}")
+
+
+class RegexModuleBackend(RegexBackend):
+    NAME: str = "regex"
+    MASK: int = 2
+
+    @classmethod
+    def available(cls) -> bool:
+        return regex is not None
+
+    def translate(self, regex: str, parsed: Optional[sre_parse.SubPattern] = None) -> str:
+        return _Rewriter(regex, parsed or _parse(regex, self._FLAGS), linear=False).rewrite()
+
+    def compile(self, pattern: str) -> Any:
+        translated: str = self.translate(pattern)
+        try:
+            return regex.compile(translated, regex.V0 | (regex.IGNORECASE if self._FLAGS & re.IGNORECASE else 0))
+        except regex.error as e:
+            raise IncompatiblePatternException(f"regex rejects '{translated}': {e}")
+
+
+class Re2Backend(RegexBackend):
+    NAME: str = "re2"
+    MASK: int = 4
+    LINEAR: bool = True
+
+    @classmethod
+    def available(cls) -> bool:
+        return re2 is not None
+
+    def translate(self, regex: str, parsed: Optional[sre_parse.SubPattern] = None) -> str:
+        return _Rewriter(regex, parsed or _parse(regex, self._FLAGS), linear=True).rewrite()
+
+    def compile(self, regex: str) -> Any:
+        translated: str = self.translate(regex)
+        options: Any = re2.Options()
+        options.case_sensitive = not self._FLAGS & re.IGNORECASE
+        options.log_errors = False
+        try:
+            return re2.compile(translated, options)
+        except re2.error as e:
+            raise IncompatiblePatternException(f"re2 rejects '{translated}': {e}")
+
+
+# fastest first, stdlib re last as it runs every pattern the validators accept
+BACKENDS: Final[tuple[type[RegexBackend], ...]] = (Re2Backend, RegexModuleBackend, StdlibBackend)
+
+
+class _Rewriter:
+    # re gives \d, \w and \s their unicode meanings by general category, the other engines use ascii
+    # or unicode properties, so both get explicit classes that reproduce re
+    _SPACES: Final[tuple[tuple[int, int], ...]] = (
+        (0x09, 0x0D), (0x1C, 0x20), (0x85, 0x85), (0xA0, 0xA0), (0x1680, 0x1680), (0x2000, 0x200A),
+        (0x2028, 0x2029), (0x202F, 0x202F), (0x205F, 0x205F), (0x3000, 0x3000)
+    )
+    _WORD: Final[str] = r"\p{L}\p{N}_"
+    _LINEAR_UNSUPPORTED: Final[dict] = {
+        sre_constants.GROUPREF: "backreference",
+        sre_constants.GROUPREF_EXISTS: "conditional group",
+        sre_constants.ATOMIC_GROUP: "atomic group",
+        sre_constants.POSSESSIVE_REPEAT: "possessive repeat",
+    }
+    _LEAVES: Final[tuple] = (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.IN, sre_constants.ANY)
+    _REPEAT_LIMIT: Final[int] = 1000
+    _QUANTIFIER: Final[re.Pattern] = re.compile(r"\{(\d*)(,?)(\d*)\}")
+    _SIMPLE_ESCAPES: Final[str] = "tnrfva"
+    _PLAIN: Final[re.Pattern] = re.compile(r"[A-Za-z0-9 _,:;'\"<>/=@&%!#~`]+")
+    _FLAGS_GROUP: Final[re.Pattern] = re.compile(r"\(\?([aiLmsux]+)\)")
+    # how the dialect translation spells the ascii word boundary of javascript
+    _ASCII_BOUNDARIES: Final[tuple[str, ...]] = (r"(?a:\b)", r"(?a:\B)")
+    _BOUNDARY_BODIES: Final[tuple[list, ...]] = ([(sre_constants.AT, sre_constants.AT_BOUNDARY)], [(sre_constants.AT, sre_constants.AT_NON_BOUNDARY)])
+
+    def __init__(self, regex: str, parsed: sre_parse.SubPattern, linear: bool):
+        self._regex: Final[str] = regex
+        self._LINEAR: Final[bool] = linear
+        self._flags: Final[int] = parsed.state.flags
+        if self._flags & (re.VERBOSE | re.ASCII | re.LOCALE):
+            raise IncompatiblePatternException("x, a or L inline flag")
+        self._check(list(parsed), True, False)
+        self._position: int = 0
+
+    def rewrite(self) -> str:
+        out: list[str] = []
+        text: str = self._regex
+        while self._position < len(text):
+            plain: Optional[re.Match] = self._PLAIN.match(text, self._position)
+            if plain:
+                out.append(plain.group())
+                self._position = plain.end()
+                continue
+            char: str = text[self._position]
+            if char == "\\":
+                out.append(self._escape(False))
+            elif char == "[":
+                out.append(self._set())
+            elif char == "(":
+                out.append(self._group())
+            elif char == "{":
+                out.append(self._brace())
+            elif char == "}":
+                out.append(r"\}")
+                self._position += 1
+            elif char == "$" and self._LINEAR and not self._flags & re.MULTILINE:
+                # re also matches before a trailing newline, the tail check made sure consuming it changes no group
+                out.append(r"(?:\n?\z)")
+                self._position += 1
+            else:
+                out.append(char if char in ".^$*+?|)" else self._literal(char))
+                self._position += 1
+        return "".join(out)
+
+    def _check(self, items: list, tail: bool, captured: bool) -> None:
+        for index, (op, av) in enumerate(items):
+            if op in self._LEAVES:
+                continue
+            item_tail: bool = tail and index == len(items) - 1
+            if op is sre_constants.AT and av in (sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY):
+                raise IncompatiblePatternException("unicode word boundary")
+            if op is sre_constants.SUBPATTERN and (av[1], av[2]) == (re.ASCII, 0) and list(av[3]) in self._BOUNDARY_BODIES:
+                continue
+            if op is sre_constants.SUBPATTERN and (av[1] or av[2]):
+                raise IncompatiblePatternException("scoped inline flags")
+            if not self._LINEAR:
+                self._children(op, av, item_tail, captured)
+                continue
+            if op in self._LINEAR_UNSUPPORTED:
+                raise IncompatiblePatternException(self._LINEAR_UNSUPPORTED[op])
+            if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                raise IncompatiblePatternException("lookbehind" if av[0] < 0 else "lookahead")
+            if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and max(av[0], -1 if av[1] == sre_constants.MAXREPEAT else av[1]) > self._REPEAT_LIMIT:
+                raise IncompatiblePatternException(f"repeat over {self._REPEAT_LIMIT}")
+            if op is sre_constants.AT and av is sre_constants.AT_END and not self._flags & re.MULTILINE and (not item_tail or captured):
+                raise IncompatiblePatternException("end anchor before more pattern or inside a capture group")
+            self._children(op, av, item_tail, captured)
+
+    def _children(self, op, av, tail: bool, captured: bool) -> None:
+        if op is sre_constants.SUBPATTERN:
+            self._check(list(av[3]), tail, captured or av[0] is not None)
+        elif op is sre_constants.BRANCH:
+            for branch in av[1]:
+                self._check(list(branch), tail, captured)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT):
+            self._check(list(av[2]), False, captured)
+        elif op is sre_constants.ATOMIC_GROUP:
+            self._check(list(av), False, captured)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            self._check(list(av[1]), False, captured)
+        elif op is sre_constants.GROUPREF_EXISTS:
+            self._check(list(av[1]), tail, captured)
+            if av[2]:
+                self._check(list(av[2]), tail, captured)
+
+    def _escape(self, in_set: bool) -> str:
+        text: str = self._regex
+        code: str = text[self._position + 1]
+        self._position += 2
+        if code == "d":
+            return r"\p{Nd}"
+        if code == "D":
+            return r"\P{Nd}"
+        if code == "w":
+            return self._WORD if in_set else f"[{self._WORD}]"
+        if code in "WS" and in_set:
+            raise IncompatiblePatternException("negated class inside a set")
+        if code == "W":
+            return f"[^{self._WORD}]"
+        if code == "s":
+            return self._space() if in_set else f"[{self._space()}]"
+        if code == "S":
+            return f"[^{self._space()}]"
+        if code == "A" and not in_set:
+            return r"\A"
+        if code == "Z" and not in_set:
+            return r"\z" if self._LINEAR else r"\Z"
+        if code == "b" and in_set:
+            return self._codepoint(8)
+        if code in "xuU":
+            digits: int = {"x": 2, "u": 4, "U": 8}[code]
+            value: str = text[self._position:self._position + digits]
+            self._position += digits
+            return self._literal(chr(int(value, 16)))
+        if code in self._SIMPLE_ESCAPES:
+            return f"\\{code}"
+        if code.isalnum():
+            raise IncompatiblePatternException(f"escape \\{code}")
+        return self._literal(code)
+
+    def _space(self) -> str:
+        return "".join(self._codepoint(low) if low == high else f"{self._codepoint(low)}-{self._codepoint(high)}" for low, high in self._SPACES)
+
+    def _literal(self, char: str) -> str:
+        if self._PLAIN.fullmatch(char):
+            return char
+        if char.isascii() and char.isprintable():
+            return f"\\{char}"
+        return self._codepoint(ord(char))
+
+    def _codepoint(self, codepoint: int) -> str:
+        if self._LINEAR:
+            return f"\\x{{{codepoint:x}}}"
+        return f"\\x{codepoint:02x}" if codepoint < 0x100 else f"\\u{codepoint:04x}" if codepoint < 0x10000 else f"\\U{codepoint:08x}"
+
+    def _set(self) -> str:
+        text: str = self._regex
+        self._position += 1
+        out: list[str] = ["["]
+        if text[self._position] == "^":
+            out.append("^")
+            self._position += 1
+        items: list[tuple[str, Optional[str]]] = []
+        first: bool = True
+        while text[self._position] != "]" or first:
+            first = False
+            if text[self._position] == "[" and text[self._position + 1:self._position + 2] in (":", ".", "="):
+                raise IncompatiblePatternException("posix class syntax")
+            start: tuple[str, Optional[str]] = self._set_item()
+            if text[self._position] == "-" and text[self._position + 1] != "]" and start[1] is not None:
+                self._position += 1
+                end: tuple[str, Optional[str]] = self._set_item()
+                if end[1] is None:
+                    raise IncompatiblePatternException("range ending in a class")
+                items.append((f"{self._literal(start[1])}-{self._literal(end[1])}", None))
+            else:
+                items.append(start)
+        self._position += 1
+        out.extend(rendered for rendered, _ in items)
+        out.append("]")
+        return "".join(out)
+
+    def _set_item(self) -> tuple[str, Optional[str]]:
+        # rendered item and the single character it stands for, None for classes
+        text: str = self._regex
+        if text[self._position] == "\\":
+            code: str = text[self._position + 1]
+            start: int = self._position
+            rendered: str = self._escape(True)
+            if code in "dDwWsS":
+                return rendered, None
+            if code == "b":
+                return rendered, "\b"
+            if code in "xuU":
+                return rendered, chr(int(text[start + 2:self._position], 16))
+            if code in self._SIMPLE_ESCAPES:
+                return rendered, {"t": "\t", "n": "\n", "r": "\r", "f": "\f", "v": "\v", "a": "\a"}[code]
+            return rendered, code
+        char: str = text[self._position]
+        self._position += 1
+        return self._literal(char), char
+
+    def _group(self) -> str:
+        text: str = self._regex
+        if text.startswith("(?#", self._position):
+            end: int = text.index(")", self._position)
+            self._position = end + 1
+            return ""
+        if text.startswith("(?P<", self._position) or text.startswith("(?P=", self._position):
+            end = text.index(">" if text[self._position + 3] == "<" else ")", self._position)
+            opening: str = text[self._position:end + 1]
+            self._position = end + 1
+            return opening
+        for boundary in self._ASCII_BOUNDARIES:
+            if text.startswith(boundary, self._position):
+                self._position += len(boundary)
+                # the word boundary of re2 is ascii already
+                return boundary[4:6] if self._LINEAR else boundary
+        flags: Optional[re.Match] = self._FLAGS_GROUP.match(text, self._position)
+        if flags:
+            self._position = flags.end()
+            # unicode is the default for str patterns and only re knows the flag
+            return f"(?{flags.group(1).replace('u', '')})" if flags.group(1).strip("u") else ""
+        for opening in ("(?:", "(?=", "(?!", "(?<=", "(?<!", "(?>"):
+            if text.startswith(opening, self._position):
+                self._position += len(opening)
+                return opening
+        if text.startswith("(?", self._position):
+            raise IncompatiblePatternException("group syntax")
+        self._position += 1
+        return "("
+
+    def _brace(self) -> str:
+        quantifier: Optional[re.Match] = self._QUANTIFIER.match(self._regex, self._position)
+        if quantifier is None or not (quantifier.group(1) or quantifier.group(3) or quantifier.group(2)):
+            self._position += 1
+            return r"\{"
+        self._position = quantifier.end()
+        low: str = quantifier.group(1) or "0"
+        if not quantifier.group(2):
+            return f"{{{low}}}"
+        return f"{{{low},{quantifier.group(3)}}}"
+
+
+def _parse(regex: str, flags: int) -> sre_parse.SubPattern:
+    try:
+        return sre_parse.parse(regex, flags)
+    except re.error as e:
+        raise IncompatiblePatternException(f"re rejects it: {e.msg}")
+
+
+class PatternCompatibility:
+    def __init__(self, regex: str, mask: int, reasons: dict[str, str]):
+        self.regex: Final[str] = regex
+        self.mask: Final[int] = mask
+        self.reasons: Final[dict[str, str]] = reasons
+
+    @property
+    def backends(self) -> tuple[str, ...]:
+        return tuple(backend.NAME for backend in BACKENDS if self.mask & backend.MASK)
+
+
+class CompatibilityClassifier:
+    def __init__(self, flags: int = re.IGNORECASE, compile_check: bool = False):
+        self._FLAGS: Final[int] = flags
+        self._backends: Final[list[RegexBackend]] = [backend(flags) for backend in BACKENDS]
+        self._COMPILE_CHECK: Final[bool] = compile_check
+
+    def mask(self, regex: str) -> int:
+        return self.classify(regex).mask
+
+    def classify(self, regex: str) -> PatternCompatibility:
+        mask: int = 0
+        reasons: dict[str, str] = {}
+        try:
+            parsed: sre_parse.SubPattern = _parse(regex, self._FLAGS)
+        except IncompatiblePatternException as e:
+            return PatternCompatibility(regex, 0, {backend.NAME: str(e) for backend in self._backends})
+        for backend in self._backends:
+            try:
+                if self._COMPILE_CHECK and backend.available():
+                    backend.compile(regex)
+                else:
+                    backend.translate(regex, parsed)
+            except IncompatiblePatternException as e:
+                reasons[backend.NAME] = str(e)
+                continue
+            mask |= backend.MASK
+        return PatternCompatibility(regex, mask, reasons)
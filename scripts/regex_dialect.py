@@ -0,0 +1,164 @@
+import re
+from typing import Final
+
+
+class UntranslatablePatternException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class JsRegexTranslator:
+    # patterns are written for new RegExp(pattern, "i"): no u, m or s flag, so \d, \w and \b are ascii,
+    # . stops at every line terminator and $ only matches at the very end of the input
+    _DIGIT: Final[str] = "0-9"
+    _WORD: Final[str] = "A-Za-z0-9_"
+    _ANY: Final[str] = r"[^\n\r\u2028\u2029]"
+    _QUANTIFIER: Final[re.Pattern] = re.compile(r"\{\d+(?:,\d*)?\}")
+    _GROUP_NAME: Final[re.Pattern] = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+    _SET_SPECIAL: Final[str] = "&~|["
+
+    def translate(self, regex: str) -> str:
+        for char in regex:
+            if char < " " and char not in "\t\n\r":
+                hint: str = ", JSON \"\\b\" is a backspace, write \"\\\\b\" for a word boundary" if char == "\b" else ""
+                raise UntranslatablePatternException(f"control character U+{ord(char):04X} in pattern{hint}")
+        out: list[str] = []
+        position: int = 0
+        while position < len(regex):
+            char: str = regex[position]
+            if char == "\\":
+                position = self._escape(regex, position + 1, out)
+                continue
+            if char == "[":
+                position = self._set(regex, position + 1, out)
+                continue
+            if char == "(":
+                position = self._group(regex, position + 1, out)
+                continue
+            if char == "{":
+                quantifier: re.Match = self._QUANTIFIER.match(regex, position)
+                if quantifier:
+                    out.append(quantifier.group(0))
+                    position = quantifier.end()
+                else:
+                    out.append(r"\{")
+                    position += 1
+                continue
+            if char == ".":
+                out.append(self._ANY)
+            elif char == "$":
+                out.append(r"\Z")
+            elif char in "}]":
+                out.append("\\" + char)
+            else:
+                out.append(char)
+            position += 1
+        return "".join(out)
+
+    def _escape(self, regex: str, position: int, out: list[str]) -> int:
+        if position >= len(regex):
+            raise UntranslatablePatternException("pattern ends with a lone backslash")
+        char: str = regex[position]
+        if char == "d":
+            out.append(f"[{self._DIGIT}]")
+        elif char == "D":
+            out.append(f"[^{self._DIGIT}]")
+        elif char == "w":
+            out.append(f"[{self._WORD}]")
+        elif char == "W":
+            out.append(f"[^{self._WORD}]")
+        elif char in "bB":
+            out.append(f"(?a:\\{char})")
+        elif char == "k" and regex.startswith("<", position + 1):
+            end: int = regex.find(">", position)
+            if end < 0 or not self._GROUP_NAME.fullmatch(regex, position + 2, end):
+                raise UntranslatablePatternException(f"invalid named backreference at position {position - 1}")
+            out.append(f"(?P={regex[position + 2:end]})")
+            return end + 1
+        else:
+            return self._common_escape(regex, position, out)
+        return position + 1
+
+    def _common_escape(self, regex: str, position: int, out: list[str]) -> int:
+        char: str = regex[position]
+        if char == "c" and position + 1 < len(regex) and regex[position + 1].isascii() and regex[position + 1].isalpha():
+            out.append(f"\\x{ord(regex[position + 1]) % 32:02x}")
+            return position + 2
+        if char in "sSfnrtv0123456789":
+            out.append("\\" + char)
+        elif char in "xu":
+            length: int = 2 if char == "x" else 4
+            digits: str = regex[position + 1:position + 1 + length]
+            if len(digits) == length and all(digit in "0123456789abcdefABCDEF" for digit in digits):
+                out.append(f"\\{char}{digits}")
+                return position + 1 + length
+            out.append(char)
+        else:
+            # any other escaped character stands for itself, \A is "A" and \a is "a" rather than an anchor or a bell
+            out.append(re.escape(char))
+        return position + 1
+
+    def _set(self, regex: str, position: int, out: list[str]) -> int:
+        if regex.startswith("]", position):
+            out.append("(?!)")
+            return position + 1
+        if regex.startswith("^]", position):
+            out.append(r"[\s\S]")
+            return position + 2
+        negate: bool = regex.startswith("^", position)
+        if negate:
+            position += 1
+        items: list[str] = []
+        # \D and \W have no ascii spelling inside a class, they become alternatives next to it
+        alternatives: list[str] = []
+        while position < len(regex):
+            char: str = regex[position]
+            if char == "]":
+                if alternatives and negate:
+                    raise UntranslatablePatternException("\\D or \\W inside a negated character class has no ascii equivalent in re")
+                if items or not alternatives:
+                    alternatives.insert(0, f"[{'^' if negate else ''}{''.join(items)}]")
+                out.append(alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})")
+                return position + 1
+            if char == "\\":
+                position = self._set_escape(regex, position + 1, items, alternatives)
+                continue
+            if char in self._SET_SPECIAL or (char == "-" and items and items[-1] == "-"):
+                items.append("\\" + char)
+            else:
+                items.append(char)
+            position += 1
+        raise UntranslatablePatternException("unterminated character class")
+
+    def _set_escape(self, regex: str, position: int, items: list[str], alternatives: list[str]) -> int:
+        if position >= len(regex):
+            raise UntranslatablePatternException("pattern ends with a lone backslash")
+        char: str = regex[position]
+        if char == "d":
+            items.append(self._DIGIT)
+        elif char == "w":
+            items.append(self._WORD)
+        elif char == "D":
+            alternatives.append(f"[^{self._DIGIT}]")
+        elif char == "W":
+            alternatives.append(f"[^{self._WORD}]")
+        elif char == "b":
+            items.append(r"\x08")
+        else:
+            return self._common_escape(regex, position, items)
+        return position + 1
+
+    def _group(self, regex: str, position: int, out: list[str]) -> int:
+        if not regex.startswith("?", position):
+            out.append("(")
+            return position
+        for prefix in (":", "=", "!", "<=", "<!"):
+            if regex.startswith(prefix, position + 1):
+                out.append("(?" + prefix)
+                return position + 1 + len(prefix)
+        if regex.startswith("<", position + 1):
+            end: int = regex.find(">", position)
+            if end > 0 and self._GROUP_NAME.fullmatch(regex, position + 2, end):
+                out.append(f"(?P<{regex[position + 2:end]}>")
+                return end + 1
+        raise UntranslatablePatternException(f"unsupported group syntax at position {position - 1}")
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import pathlib
+import re
+import sys
+import threading
+from typing import Final, Any, Iterable, Optional
+
+from regex_backend import BACKENDS, IncompatiblePatternException, RegexBackend, StdlibBackend
+
+
+class RegexRegistry:
+    VERSION: Final[int] = 1
+    DEFAULT_FLAGS: Final[int] = re.IGNORECASE
+    # routing is opt-in: re2 costs about 29MB of RSS and 0.6s more warm-up on the full bundle
+    DEFAULT_BACKENDS: Final[tuple[str, ...]] = (StdlibBackend.NAME,)
+    _shared: Optional["RegexRegistry"] = None
+    _shared_lock: Final[threading.Lock] = threading.Lock()
+
+    def __init__(self, flags: int = DEFAULT_FLAGS, backends: Iterable[str] = DEFAULT_BACKENDS):
+        self._FLAGS: Final[int] = flags
+        # re compiles every pattern as the reference, the others are only tried for patterns classified compatible
+        self._backends: Final[list[RegexBackend]] = [
+            backend(flags) for name in backends for backend in BACKENDS
+            if backend.NAME == name and backend is not StdlibBackend and backend.available()
+        ]
+        self._compiled: Final[dict[str, re.Pattern]] = {}
+        self._routed: Final[dict[tuple[str, int], Any]] = {}
+        # digest -> compile error message, None when the pattern compiles
+        self._outcomes: Final[dict[str, Optional[str]]] = {}
+        self._new_outcomes: Final[dict[str, Optional[str]]] = {}
+        self.compilations: int = 0
+
+    @classmethod
+    def shared(cls) -> "RegexRegistry":
+        if cls._shared is None:
+            # two threads reaching this at once would otherwise each build one and compile every regex twice
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def default_cache_path() -> pathlib.Path:
+        return pathlib.Path(".cache").joinpath(f"regex-py{sys.version_info.major}.{sys.version_info.minor}.json")
+
+    def compile(self, regex: str, compatible: int = StdlibBackend.MASK) -> Any:
+        if compatible == StdlibBackend.MASK:
+            return self._reference(regex)
+        routed: Any = self._routed.get((regex, compatible))
+        if routed is None:
+            routed = self._route(regex, compatible)
+            self._routed[(regex, compatible)] = routed
+        return routed
+
+    def _route(self, regex: str, compatible: int) -> Any:
+        # re is only compiled for patterns no preferred backend takes, the bundle already checked they compile
+        for backend in self._backends:
+            if not backend.MASK & compatible:
+                continue
+            try:
+                compiled: Any = backend.compile(regex)
+            except IncompatiblePatternException:
+                continue
+            self.compilations += 1
+            return compiled
+        return self._reference(regex)
+
+    def retain(self, regexes: Iterable[str]) -> None:
+        # drops every other compiled pattern, an engine still holding one keeps it alive until it goes
+        kept: set[str] = set(regexes)
+        for regex in [regex for regex in self._compiled if regex not in kept]:
+            del self._compiled[regex]
+        for key in [key for key in self._routed if key[0] not in kept]:
+            del self._routed[key]
+
+    def _reference(self, regex: str) -> re.Pattern:
+        compiled: Optional[re.Pattern] = self._compiled.get(regex)
+        if compiled is not None:
+            return compiled
+        digest: str = self._digest(regex)
+        known_error: Optional[str] = self._outcomes.get(digest)
+        if known_error is not None:
+            raise re.error(known_error)
+        self.compilations += 1
+        try:
+            compiled = re.compile(regex, self._FLAGS)
+        except re.error as e:
+            self._record(digest, e.msg)
+            raise
+        self._record(digest, None)
+        self._compiled[regex] = compiled
+        return compiled
+
+    def error(self, regex: str) -> Optional[str]:
+        if regex in self._compiled:
+            return None
+        digest: str = self._digest(regex)
+        if digest in self._outcomes:
+            return self._outcomes[digest]
+        try:
+            self.compile(regex)
+        except re.error as e:
+            return e.msg
+        return None
+
+    def outcomes(self) -> dict[str, Optional[str]]:
+        return dict(self._new_outcomes)
+
+    def merge(self, outcomes: dict[str, Optional[str]]) -> None:
+        for digest, error in outcomes.items():
+            self._record(digest, error)
+
+    def load(self, path: pathlib.Path) -> None:
+        try:
+            with path.open("r", encoding="utf8") as f:
+                cached: dict = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get("version") == self.VERSION and cached.get("flags") == self._FLAGS:
+            self._outcomes.update(cached["outcomes"])
+
+    def save(self, path: pathlib.Path) -> None:
+        if not self._new_outcomes:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = path.with_name(f"{path.name}.tmp")
+        with tmp.open("w", encoding="utf8") as f:
+            json.dump({"version": self.VERSION, "flags": self._FLAGS, "outcomes": self._outcomes}, f)
+        tmp.replace(path)
+        self._new_outcomes.clear()
+
+    def __len__(self) -> int:
+        return len(self._compiled.keys() | {regex for regex, _ in self._routed})
+
+    def _record(self, digest: str, error: Optional[str]) -> None:
+        if digest not in self._outcomes or self._outcomes[digest] != error:
+            self._outcomes[digest] = error
+            self._new_outcomes[digest] = error
+
+    @staticmethod
+    def _digest(regex: str) -> str:
+        return hashlib.blake2b(regex.encode("utf8"), digest_size=16).hexdigest()
@@ -0,0 +1,100 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import pathlib
+import sys
+import threading
+from multiprocessing.pool import Pool
+from typing import Final, Iterable, Iterator, Optional
+
+from bundle import Bundle
+from engine import Detection, Engine, Snapshot
+
+_engine: Optional[Engine] = None
+# the bundle path _engine was loaded from, None is the bundle built from src
+_engine_path: Optional[str] = None
+
+
+def _init_worker(bundle_path: Optional[str]) -> None:
+    global _engine, _engine_path
+    if _engine is None or _engine_path != bundle_path:
+        _engine = Engine(Bundle.load(pathlib.Path(bundle_path)) if bundle_path else Bundle.from_source())
+        _engine_path = bundle_path
+
+
+def _scan(item: tuple[int, Snapshot]) -> tuple[int, list[Detection]]:
+    index, snapshot = item
+    return index, _engine.analyze(snapshot)
+
+
+class ScanPool:
+    def __init__(
+            self,
+            bundle_path: Optional[pathlib.Path] = pathlib.Path("build").joinpath("technologies.bundle"),
+            processes: Optional[int] = None,
+            chunksize: int = 8,
+            start_method: Optional[str] = None):
+        self._BUNDLE_PATH: Final[Optional[str]] = str(bundle_path) if bundle_path is not None and bundle_path.is_file() else None
+        self._START_METHOD: Final[str] = start_method or self.default_start_method()
+        self._PROCESSES: Final[int] = processes or multiprocessing.cpu_count()
+        self._CHUNKSIZE: Final[int] = chunksize
+        self._pool: Optional[Pool] = None
+
+    @staticmethod
+    def default_start_method() -> str:
+        # forking is only safe on linux and before any thread runs, a thread holding a lock leaves it held in the child
+        if sys.platform.startswith("linux") and threading.active_count() == 1:
+            return "fork"
+        return "spawn"
+
+    def __enter__(self) -> "ScanPool":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self._START_METHOD == "fork":
+            # workers inherit the warmed engine copy-on-write, not as shared memory: refcount updates still dirty every
+            # page they touch and freezing only keeps the GC from adding to that. scanning 80 pages on 4 workers left each
+            # one about 54MB shared and 35MB private, against 13MB shared and 54MB private when spawned
+            _init_worker(self._BUNDLE_PATH)
+            _engine.warm()
+            gc.freeze()
+        # a forked worker already holds the engine, the initializer only loads one when the parent's is for another bundle
+        self._pool = multiprocessing.get_context(self._START_METHOD).Pool(self._PROCESSES, _init_worker, (self._BUNDLE_PATH,))
+
+    def close(self) -> None:
+        global _engine, _engine_path
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        gc.unfreeze()
+        # drops the parent's copy, a pool started later loads its own
+        _engine = None
+        _engine_path = None
+
+    def scan(self, snapshots: Iterable[Snapshot]) -> Iterator[tuple[int, list[Detection]]]:
+        if self._pool is None:
+            self.start()
+        return self._pool.imap_unordered(_scan, enumerate(snapshots), self._CHUNKSIZE)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Scan page snapshots in a pool of worker processes")
+    parser.add_argument("snapshots", nargs="+", type=pathlib.Path)
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("--start-method", choices=multiprocessing.get_all_start_methods(), default=None)
+    args = parser.parse_args()
+
+    def load(paths: list[pathlib.Path]) -> Iterator[Snapshot]:
+        for path in paths:
+            with path.open("r", encoding="utf8") as f:
+                yield Snapshot.from_dict(json.load(f))
+
+    with ScanPool(processes=args.processes, start_method=args.start_method) as pool:
+        for page, detections in pool.scan(load(args.snapshots)):
+            print(json.dumps({"snapshot": str(args.snapshots[page]), "technologies": [detection.to_dict() for detection in detections]}))
@@ -0,0 +1,100 @@
+from typing import Final, Iterable, Optional
+
+from engine import Engine, Hits
+from prefilter import Prefilter
+
+
+class UnsupportedFieldException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class StreamClosedException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class StreamingMatcher:
+    STREAM_FIELDS: Final[tuple[str, ...]] = ("html", "text", "scripts", "css")
+
+    def __init__(self, engine: Engine, field: str = "html", window: int = 65536, overlap: int = 4096, targets: Optional[Iterable[int]] = None):
+        if field not in self.STREAM_FIELDS:
+            raise UnsupportedFieldException(f"'{field}' can't be streamed, only {', '.join(self.STREAM_FIELDS)} are supported")
+        self._engine: Final[Engine] = engine
+        self._entries: Final[list[tuple[int, int]]] = engine.entries(field)
+        self._prefilter: Final[Prefilter] = engine.prefilter(field)
+        # a pattern whose literal was seen keeps matching against the whole window until it expires
+        self._WINDOW: Final[int] = window
+        # patterns without literals only see the new chunk and this much text before it, a match may reach that far back
+        self._OVERLAP: Final[int] = min(overlap, window)
+        self._LITERAL_OVERLAP: Final[int] = max(self._prefilter.max_literal_length - 1, 0)
+        self._targets: Final[set[int]] = set(targets) if targets is not None else {tech_id for tech_id, _ in self._entries}
+        # only targets with patterns in this field can resolve, without explicit targets that's every technology
+        # of the field, so only close() ends the stream
+        self._unresolved: Final[set[int]] = self._targets & {tech_id for tech_id, _ in self._entries}
+        # "\Z" would match at the end of every window, these entries wait for the end of the document in close()
+        self._end_anchored: Final[frozenset[int]] = engine.end_anchored(field)
+        # entry -> offset where its literal was last seen, None for entries without literals
+        self._pending: dict[int, Optional[int]] = {
+            entry: None for entry in self._prefilter.unfiltered if self._entries[entry][0] in self._targets
+        }
+        self._resolved: set[int] = set()
+        self._buffer: str = ""
+        # the character before the buffer keeps "^" from matching at the start of a window and "\b" right at its edge
+        self._before: str = ""
+        self._tail: str = ""
+        self._offset: int = 0
+        self._closed: bool = False
+        self.hits: Final[Hits] = Hits()
+
+    @property
+    def done(self) -> bool:
+        return not self._unresolved
+
+    def feed(self, chunk: str) -> None:
+        if self._closed:
+            raise StreamClosedException("can't feed a closed stream")
+        if not chunk or self.done:
+            return
+        end: int = self._offset + len(chunk)
+        lowered: str = self._tail + chunk.lower()
+        for entry in self._prefilter.scan(lowered):
+            if entry not in self._resolved and self._entries[entry][0] in self._targets:
+                self._pending[entry] = end
+        self._tail = lowered[-self._LITERAL_OVERLAP:] if self._LITERAL_OVERLAP else ""
+        buffer: str = self._buffer + chunk
+        self._match(self._values(buffer, len(buffer)), self._values(buffer, len(chunk) + self._OVERLAP), end, self._end_anchored)
+        if len(buffer) > self._WINDOW:
+            self._before = buffer[-self._WINDOW - 1]
+        self._buffer = buffer[-self._WINDOW:]
+        self._offset = end
+
+    def close(self) -> Hits:
+        if not self._closed:
+            self._closed = True
+            values: list[str] = self._values(self._buffer, len(self._buffer))
+            self._match(values, values, self._offset, frozenset())
+        return self.hits
+
+    def feed_all(self, chunks: Iterable[str]) -> Hits:
+        for chunk in chunks:
+            self.feed(chunk)
+            if self.done:
+                break
+        return self.close()
+
+    def _values(self, buffer: str, length: int) -> list[str]:
+        # the last length characters and the one before them
+        if length >= len(buffer):
+            return [self._before + buffer]
+        return [buffer[-length - 1:]]
+
+    def _match(self, window: list[str], recent: list[str], end: int, held: frozenset[int]) -> None:
+        for entry, seen in list(self._pending.items()):
+            tech_id, pattern_id = self._entries[entry]
+            if entry not in held and self._engine.match_pattern(tech_id, pattern_id, recent if seen is None else window, self.hits):
+                self._resolved.add(entry)
+                self._unresolved.discard(tech_id)
+                del self._pending[entry]
+            elif seen is not None and end - seen > self._WINDOW:
+                del self._pending[entry]
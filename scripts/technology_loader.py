@@ -0,0 +1,182 @@
+import collections
+import copy
+import json
+import marshal
+import pathlib
+import re
+import string
+import threading
+from typing import Final, Any, Iterator, Optional
+
+from bundle import TechNotFoundException
+
+
+class InvalidIndexException(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+
+
+class TechnologyIndex:
+    VERSION: Final[int] = 1
+    _WHITESPACE: Final[re.Pattern] = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, shards: dict[str, tuple[int, int]], entries: dict[str, tuple[str, int, int, tuple[int, ...]]]):
+        # shard -> (size, mtime_ns) of the file the offsets were taken from
+        self.shards: Final[dict[str, tuple[int, int]]] = shards
+        # tech name -> (shard, byte offset of its value, byte length, categories)
+        self.entries: Final[dict[str, tuple[str, int, int, tuple[int, ...]]]] = entries
+
+    @classmethod
+    def build(cls, tech_dir: pathlib.Path = pathlib.Path("src").joinpath("technologies")) -> "TechnologyIndex":
+        shards: dict[str, tuple[int, int]] = {}
+        entries: dict[str, tuple[str, int, int, tuple[int, ...]]] = {}
+        for shard in TechnologyLoader.SHARDS:
+            path: pathlib.Path = tech_dir.joinpath(f"{shard}.json")
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            shards[shard] = (stat.st_size, stat.st_mtime_ns)
+            for name, offset, length, data in cls._scan(path.read_bytes().decode("utf8")):
+                entries[name] = (shard, offset, length, tuple(data.get("cats", ())))
+        return cls(shards, entries)
+
+    @classmethod
+    def _scan(cls, text: str) -> Iterator[tuple[str, int, int, dict]]:
+        decoder: json.JSONDecoder = json.JSONDecoder()
+        position: int = cls._skip(text, 0, "{")
+        # byte offsets are counted incrementally, the files are utf8 but not always ascii
+        consumed: int = 0
+        consumed_bytes: int = 0
+        while text[position] != "}":
+            name, position = json.decoder.scanstring(text, cls._skip(text, position, '"'))
+            position = cls._skip(text, position, ":")
+            position = cls._WHITESPACE.match(text, position).end()
+            data, end = decoder.raw_decode(text, position)
+            offset: int = consumed_bytes + len(text[consumed:position].encode("utf8"))
+            length: int = len(text[position:end].encode("utf8"))
+            consumed, consumed_bytes = end, offset + length
+            yield name, offset, length, data
+            position = cls._WHITESPACE.match(text, end).end()
+            if text[position] == ",":
+                position += 1
+            position = cls._WHITESPACE.match(text, position).end()
+
+    @classmethod
+    def _skip(cls, text: str, position: int, expected: str) -> int:
+        position = cls._WHITESPACE.match(text, position).end()
+        if not text.startswith(expected, position):
+            raise InvalidIndexException(f"expected '{expected}' at character {position}")
+        return position + 1
+
+    def fresh(self, shard: str, path: pathlib.Path) -> bool:
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return self.shards.get(shard) == (stat.st_size, stat.st_mtime_ns)
+
+    def save(self, path: pathlib.Path = pathlib.Path("build").joinpath("technologies.index")) -> pathlib.Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp: pathlib.Path = path.with_name(f"{path.name}.tmp")
+        with tmp.open("wb") as f:
+            marshal.dump({"version": self.VERSION, "shards": self.shards, "entries": self.entries}, f)
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: pathlib.Path = pathlib.Path("build").joinpath("technologies.index")) -> "TechnologyIndex":
+        with path.open("rb") as f:
+            try:
+                payload: Any = marshal.load(f)
+            except (EOFError, ValueError, TypeError):
+                raise InvalidIndexException(f"{path} is not a technologies index")
+        if not isinstance(payload, dict) or payload.get("version") != cls.VERSION:
+            raise InvalidIndexException(f"{path} has an unknown format, rebuild it")
+        return cls(payload["shards"], payload["entries"])
+
+
+class TechnologyLoader:
+    SHARDS: Final[tuple[str, ...]] = ("_",) + tuple(string.ascii_lowercase)
+
+    def __init__(self, source_dir: pathlib.Path = pathlib.Path("src"), max_shards: int = 4, index: Optional[TechnologyIndex] = None):
+        self._TECH_DIR: Final[pathlib.Path] = source_dir.joinpath("technologies")
+        self._MAX_SHARDS: Final[int] = max_shards
+        self._index: Final[Optional[TechnologyIndex]] = index
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self._shards: Final[collections.OrderedDict[str, dict[str, dict]]] = collections.OrderedDict()
+        self.shard_loads: int = 0
+        self.entry_loads: int = 0
+
+    @classmethod
+    def shard(cls, name: str) -> str:
+        first: str = name[:1].lower()
+        return first if first and first in string.ascii_lowercase else "_"
+
+    def letter(self, letter: str) -> dict[str, dict]:
+        if letter not in self.SHARDS:
+            raise TechNotFoundException(f"'{letter}' is not a technologies file, use one of {', '.join(self.SHARDS)}")
+        # callers get their own copy, editing it would otherwise change what every later lookup returns
+        return copy.deepcopy(self._load(letter))
+
+    def _load(self, letter: str) -> dict[str, dict]:
+        with self._lock:
+            technologies: Optional[dict[str, dict]] = self._shards.get(letter)
+            if technologies is not None:
+                self._shards.move_to_end(letter)
+                return technologies
+        path: pathlib.Path = self._TECH_DIR.joinpath(f"{letter}.json")
+        with path.open("r", encoding="utf8") as f:
+            technologies = json.load(f)
+        with self._lock:
+            self.shard_loads += 1
+            self._shards[letter] = technologies
+            self._shards.move_to_end(letter)
+            while len(self._shards) > self._MAX_SHARDS:
+                self._shards.popitem(last=False)
+        return technologies
+
+    def get(self, name: str) -> dict:
+        shard: str = self.shard(name)
+        with self._lock:
+            cached: Optional[dict[str, dict]] = self._shards.get(shard)
+        if cached is None and self._index is not None:
+            entry: Optional[tuple[str, int, int, tuple[int, ...]]] = self._index.entries.get(name)
+            path: pathlib.Path = self._TECH_DIR.joinpath(f"{shard}.json")
+            if self._index.fresh(shard, path):
+                if entry is None:
+                    raise TechNotFoundException(f"Tech '{name}' doesn't exist!")
+                return self._decode(path, entry[1], entry[2])
+        technologies: dict[str, dict] = cached if cached is not None else self._load(shard)
+        if name not in technologies:
+            raise TechNotFoundException(f"Tech '{name}' doesn't exist!")
+        return copy.deepcopy(technologies[name])
+
+    def category(self, category: int) -> dict[str, dict]:
+        indexed: dict[str, list[tuple[str, int, int]]] = {}
+        if self._index is not None:
+            for name, (shard, offset, length, cats) in self._index.entries.items():
+                if category in cats:
+                    indexed.setdefault(shard, []).append((name, offset, length))
+        technologies: dict[str, dict] = {}
+        for shard in self.SHARDS:
+            path: pathlib.Path = self._TECH_DIR.joinpath(f"{shard}.json")
+            if not path.is_file():
+                continue
+            # a shard added or edited since the index was built is scanned in full
+            if self._index is not None and self._index.fresh(shard, path):
+                technologies.update((name, self._decode(path, offset, length)) for name, offset, length in indexed.get(shard, ()))
+            else:
+                technologies.update((name, copy.deepcopy(data)) for name, data in self._load(shard).items() if category in data.get("cats", ()))
+        return technologies
+
+    def _decode(self, path: pathlib.Path, offset: int, length: int) -> dict:
+        with path.open("rb") as f:
+            f.seek(offset)
+            raw: bytes = f.read(length)
+        with self._lock:
+            self.entry_loads += 1
+        return json.loads(raw)
+
+
+if __name__ == '__main__':
+    print(TechnologyIndex.build().save())
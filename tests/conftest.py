@@ -0,0 +1,54 @@
+import json
+import pathlib
+import sys
+from typing import Callable
+
+import pytest
+
+ROOT: pathlib.Path = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT.joinpath("scripts")))
+
+from benchmark import CorpusGenerator
+from bundle import Bundle
+from engine import Engine, Snapshot
+from fingerprint_store import FingerprintStore
+
+
+@pytest.fixture(scope="session")
+def source_dir() -> pathlib.Path:
+    return ROOT.joinpath("src")
+
+
+@pytest.fixture(scope="session")
+def bundle(source_dir: pathlib.Path) -> Bundle:
+    return Bundle.from_source(source_dir)
+
+
+@pytest.fixture(scope="session")
+def engine(bundle: Bundle) -> Engine:
+    return Engine(bundle)
+
+
+@pytest.fixture(scope="session")
+def corpus(bundle: Bundle) -> list[Snapshot]:
+    # pages seeded with fragments of the fingerprints themselves, so most patterns get a chance to match
+    return [Snapshot.from_dict(page) for page in CorpusGenerator(bundle, seed=7, pages=6, page_size=20000).generate()]
+
+
+@pytest.fixture(scope="session")
+def source_store(source_dir: pathlib.Path) -> FingerprintStore:
+    return FingerprintStore.from_source(source_dir)
+
+
+@pytest.fixture(scope="session")
+def make_store(source_dir: pathlib.Path) -> Callable[[dict[str, dict]], FingerprintStore]:
+    with source_dir.joinpath("categories.json").open("r", encoding="utf8") as f:
+        categories: dict[str, dict] = json.load(f)
+    with source_dir.joinpath("groups.json").open("r", encoding="utf8") as f:
+        groups: dict[str, dict] = json.load(f)
+    return lambda technologies: FingerprintStore(categories, groups, technologies)
+
+
+@pytest.fixture(scope="session")
+def make_engine(make_store: Callable[[dict[str, dict]], FingerprintStore]) -> Callable[[dict[str, dict]], Engine]:
+    return lambda technologies: Engine(make_store(technologies).bundle())
@@ -0,0 +1,36 @@
+import asyncio
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from async_scanner import AsyncScanner
+from engine import Detection, Engine, Snapshot
+
+
+def collect(scanner: AsyncScanner, snapshots) -> list[tuple[Snapshot, list[Detection]]]:
+    async def run() -> list[tuple[Snapshot, list[Detection]]]:
+        return [item async for item in scanner.scan(snapshots)]
+
+    # a hang fails the test instead of blocking the suite
+    return asyncio.run(asyncio.wait_for(run(), 30))
+
+
+def test_scan_matches_analyze(engine: Engine, corpus: list[Snapshot]) -> None:
+    results: list[tuple[Snapshot, list[Detection]]] = collect(AsyncScanner(engine, max_pending=2), corpus)
+    assert sorted(corpus.index(snapshot) for snapshot, _ in results) == list(range(len(corpus)))
+    for snapshot, detections in results:
+        assert [detection.name for detection in detections] == [detection.name for detection in engine.analyze(snapshot)]
+
+
+def test_failing_source_reaches_the_consumer(engine: Engine) -> None:
+    def source() -> Iterator[Snapshot]:
+        yield Snapshot(headers={"Server": "nginx"})
+        raise RuntimeError("source failed")
+
+    async def async_source() -> AsyncIterator[Snapshot]:
+        yield Snapshot(html="<html></html>")
+        raise RuntimeError("source failed")
+
+    for snapshots in (source(), async_source()):
+        with pytest.raises(RuntimeError, match="source failed"):
+            collect(AsyncScanner(engine), snapshots)
@@ -0,0 +1,68 @@
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from dom_matcher import DomMatcher
+from engine import Engine, Snapshot
+
+HTML: str = """
+<html><head>
+<link rel="stylesheet" href="https://cdn.example/npm/kit@2.1.0/kit.css">
+<script src="/js/app.min.js"></script>
+<script>window.kit = {}</script>
+</head><body>
+<div id="root" class="app  Shell"><p class="x">first</p><p>second</p><span data-kit="on">kit</span></div>
+<ul><li>one</li><li class="b">two</li></ul>
+<iframe src="https://player.example/embed"></iframe>
+</body></html>
+"""
+
+SELECTORS: list[str] = [
+    "div#root", ".shell", ".Shell", "p.x", "div > span", "div span[data-kit]", "li + li", "ul li ~ li", "#root, .b",
+    "link[href*='npm/kit@']", "script[src$='.min.js']", "iframe[src^='https://player.']", "[data-kit='on']",
+    "[class~='app']", "*[id]", "SPAN", "html body iframe",
+]
+
+UNSUPPORTED: list[str] = ["div:has(> p.x)", "li:nth-child(2)", "script:not([src])", "p:first-child"]
+
+
+def test_matches_soupsieve() -> None:
+    soup: BeautifulSoup = BeautifulSoup(HTML, "html.parser")
+    matcher: DomMatcher = DomMatcher(SELECTORS)
+    assert matcher.unsupported == set()
+    matched: dict[str, list] = matcher.match(soup)
+    for selector in SELECTORS:
+        assert matched[selector] == soup.select(selector), selector
+
+
+def test_bundled_selectors_match_soupsieve(engine: Engine, corpus: list[Snapshot]) -> None:
+    matcher: DomMatcher = DomMatcher(engine.dom_selectors)
+    for snapshot in corpus[:2]:
+        soup: BeautifulSoup = BeautifulSoup(snapshot.html, "html.parser")
+        matched: dict[str, list] = matcher.match(soup)
+        for selector in engine.dom_selectors:
+            if matcher.supports(selector):
+                assert matched[selector] == soup.select(selector), selector
+
+
+def test_unsupported_selectors_are_left_out() -> None:
+    matcher: DomMatcher = DomMatcher(SELECTORS + UNSUPPORTED)
+    assert matcher.unsupported == set(UNSUPPORTED)
+    assert not any(matcher.supports(selector) for selector in UNSUPPORTED)
+    assert set(matcher.match(BeautifulSoup(HTML, "html.parser"))) == set(SELECTORS)
+    # without literals to require, the engine can't rule these out before parsing
+    assert all(matcher.literals(selector) == ((),) for selector in UNSUPPORTED)
+    assert matcher.tags(["p.x", "div:has(> p.x)"]) is None
+
+
+def test_engine_falls_back_to_soupsieve(make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    engine: Engine = make_engine({
+        "Has": {"cats": [1], "dom": {"div:has(> p.x)": {"exists": ""}}},
+        "Nth": {"cats": [1], "dom": {"li:nth-child(2)": {"text": "^two\\;version:2"}}},
+        "Inline": {"cats": [1], "dom": {"script:not([src])": {"text": "window\\.kit"}}},
+        "Kit": {"cats": [1], "dom": {"link[href*='npm/kit@']": {"attributes": {"href": "kit@([\\d.]+)\\;version:\\1"}}}},
+        "Missing": {"cats": [1], "dom": {"section:has(> p)": {"exists": ""}}},
+    })
+    assert not engine.dom_matcher.supports("div:has(> p.x)")
+    detections: list[tuple[str, str]] = [(detection.name, detection.version) for detection in engine.analyze(Snapshot(html=HTML))]
+    assert detections == [("Has", ""), ("Inline", ""), ("Kit", "2.1.0"), ("Nth", "2")]
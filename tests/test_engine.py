@@ -0,0 +1,188 @@
+import re
+from typing import Callable
+
+import pytest
+from bs4 import BeautifulSoup
+
+from bundle import Bundle, BundleFormat
+from engine import Detection, Engine, Hits, Snapshot
+from fingerprint_store import FingerprintStore
+
+
+class Reference:
+    # resolution rebuilt by name from the raw fingerprints, none of the bundle's precomputed closures or excludes
+    def __init__(self, technologies: dict[str, dict]):
+        self._technologies: dict[str, dict] = technologies
+        self._order: dict[str, int] = {name: position for position, name in enumerate(technologies)}
+        self._closures: dict[str, dict[str, tuple[int, str]]] = {}
+
+    def closure(self, name: str) -> dict[str, tuple[int, str]]:
+        if name not in self._closures:
+            closure: dict[str, tuple[int, str]] = {}
+            for ref in self._technologies[name].get("implies", []):
+                target, *tags = ref.split("\\;")
+                options: dict[str, str] = dict(tag.split(":", 1) for tag in tags)
+                confidence: int = int(options.get("confidence", 100))
+                implied: list[tuple[str, tuple[int, str]]] = [(target, (confidence, options.get("version", "")))]
+                implied.extend((nested, (min(confidence, nested_confidence), version)) for nested, (nested_confidence, version) in self.closure(target).items())
+                for implied_name, (implied_confidence, version) in implied:
+                    if implied_name not in closure or closure[implied_name][0] < implied_confidence:
+                        closure[implied_name] = (implied_confidence, version)
+            self._closures[name] = closure
+        return self._closures[name]
+
+    def implied(self, detected: dict[str, tuple[int, str]]) -> dict[str, tuple[int, str]]:
+        resolved: dict[str, tuple[int, str]] = dict(detected)
+        for name, (confidence, _) in detected.items():
+            for implied_name, (implied_confidence, version) in self.closure(name).items():
+                combined: int = min(confidence, implied_confidence)
+                if implied_name not in resolved or resolved[implied_name][0] < combined:
+                    resolved[implied_name] = (combined, version or resolved.get(implied_name, (0, ""))[1])
+        return resolved
+
+    def resolve(self, confidence: dict[str, int], versions: dict[str, list[str]]) -> list[tuple[str, int, str]]:
+        detected: dict[str, tuple[int, str]] = {
+            name: (min(100, total), max(versions.get(name, [""]), key=lambda version: ([int(part) for part in re.findall(r"\d+", version)], len(version))))
+            for name, total in confidence.items()
+        }
+        while True:
+            resolved: dict[str, tuple[int, str]] = self.implied(detected)
+            categories: set[int] = {cat for name in resolved for cat in self._technologies[name].get("cats", [])}
+            unmet: list[str] = [
+                name for name in detected
+                if any(required not in resolved for required in self._technologies[name].get("requires", []))
+                or any(cat not in categories for cat in self._technologies[name].get("requiresCategory", []))
+            ]
+            if not unmet:
+                break
+            for name in unmet:
+                del detected[name]
+        # most evidence first, whatever is already excluded excludes nothing, and nothing implied by it survives
+        excluded: set[str] = set()
+        for name in sorted(detected, key=lambda name: (-confidence[name], self._order[name])):
+            if name not in excluded:
+                excluded.update(other for source in (name, *self.closure(name)) for other in self._technologies[source].get("excludes", []))
+        resolved = self.implied({name: detection for name, detection in detected.items() if name not in excluded})
+        return sorted(((name, *detection) for name, detection in resolved.items() if name not in excluded), key=lambda item: item[0].lower())
+
+
+@pytest.fixture(scope="module")
+def reference(source_store: FingerprintStore) -> Reference:
+    return Reference(source_store.technologies)
+
+
+def brute_force(engine: Engine, reference: Reference, snapshot: Snapshot) -> list[tuple[str, int, str]]:
+    # every pattern of every technology against the whole snapshot, no prefilter, gating or exclusion shortcuts
+    bundle: Bundle = engine.bundle
+    hits: Hits = Hits()
+    soup: BeautifulSoup = BeautifulSoup(snapshot.html, "html.parser")
+    for tech_id, tech in enumerate(bundle.technologies):
+        for field, entries in tech[BundleFormat.TECH_PATTERNS].items():
+            if field in BundleFormat.LIST_FIELDS:
+                for pattern_id in entries:
+                    engine.match_pattern(tech_id, pattern_id, snapshot.values(field), hits)
+            elif field == BundleFormat.DOM_FIELD:
+                for selector_id, kind, name_id, pattern_id in entries:
+                    elements: list = soup.select(bundle.strings[selector_id])
+                    if not elements:
+                        continue
+                    if kind == BundleFormat.DOM_EXISTS:
+                        engine.match_pattern(tech_id, pattern_id, [""], hits)
+                    elif kind == BundleFormat.DOM_ATTRIBUTE:
+                        values: list = [element.get(bundle.string(name_id)) for element in elements]
+                        engine.match_pattern(tech_id, pattern_id, [" ".join(value) if isinstance(value, list) else value for value in values if value is not None], hits)
+                    elif kind == BundleFormat.DOM_TEXT:
+                        engine.match_pattern(tech_id, pattern_id, [element.get_text() for element in elements], hits)
+    for field, index in bundle.keys.items():
+        items: dict[str, list[str]] = snapshot.keyed(field)
+        for key, entries in index.items():
+            for tech_id, pattern_id in entries if key in items else ():
+                engine.match_pattern(tech_id, pattern_id, items[key], hits)
+    names: tuple[str, ...] = bundle.table.names
+    return reference.resolve(
+        {names[tech_id]: confidence for tech_id, confidence in hits.confidence.items()},
+        {names[tech_id]: versions for tech_id, versions in hits.versions.items()}
+    )
+
+
+def summary(detections: list[Detection]) -> list[tuple[str, int, str]]:
+    return [(detection.name, detection.confidence, detection.version) for detection in detections]
+
+
+def test_analyze_matches_brute_force(engine: Engine, reference: Reference, corpus: list[Snapshot]) -> None:
+    for snapshot in corpus:
+        detections: list[Detection] = engine.analyze(snapshot)
+        assert detections
+        assert summary(detections) == brute_force(engine, reference, snapshot)
+
+
+def test_match_many_matches_analyze(engine: Engine, corpus: list[Snapshot]) -> None:
+    result = engine.match_many(corpus)
+    assert result.size == len(corpus)
+    for page, snapshot in enumerate(corpus):
+        assert summary(result.page(page)) == summary(engine.analyze(snapshot))
+
+
+def test_match_many_without_pages(engine: Engine) -> None:
+    assert engine.match_many([]).technologies() == []
+
+
+@pytest.mark.parametrize("snapshot, expected", [
+    (Snapshot(headers={"Server": "nginx/1.25.3"}), ("Nginx", 100, "1.25.3")),
+    (Snapshot(headers={"X-Powered-By": "PHP/8.2.1"}), ("PHP", 100, "8.2.1")),
+    (Snapshot(meta={"generator": "WordPress 6.4.2"}), ("WordPress", 100, "6.4.2")),
+])
+def test_analyze_known_technologies(engine: Engine, snapshot: Snapshot, expected: tuple[str, int, str]) -> None:
+    assert expected in summary(engine.analyze(snapshot))
+
+
+# each of these has an exclude between technologies matched in different fields
+CROSS_FIELD: list[Snapshot] = [
+    Snapshot(html="<div ng-app=\"x\"></div>", js={"getAllAngularRootElements": ""}),
+    Snapshot(script_src=["https://x/angular.min.js"], js={"ng.probe": ""}),
+    Snapshot(js={"ng.probe": "", "angular": ""}),
+]
+
+
+def test_excludes_across_fields_agree(engine: Engine, reference: Reference) -> None:
+    for snapshot in CROSS_FIELD:
+        expected: list[tuple[str, int, str]] = brute_force(engine, reference, snapshot)
+        assert summary(engine.analyze(snapshot)) == expected
+        assert summary(engine.match_many([snapshot]).page(0)) == expected
+
+
+def test_requires_and_excludes(make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    engine: Engine = make_engine({
+        "Base": {"cats": [1], "headers": {"x-base": ""}},
+        "Plugin": {"cats": [1], "requires": ["Base"], "html": ["plugin-marker"]},
+        "Rival": {"cats": [1], "html": ["rival-marker"], "excludes": ["Base"]},
+    })
+    assert [detection.name for detection in engine.analyze(Snapshot(html="plugin-marker"))] == []
+    assert [detection.name for detection in engine.analyze(Snapshot(html="plugin-marker", headers={"X-Base": "1"}))] == ["Base", "Plugin"]
+    assert [detection.name for detection in engine.analyze(Snapshot(html="rival-marker", headers={"X-Base": "1"}))] == ["Rival"]
+    # the excluded prerequisite is still evaluated, so what depends on it survives
+    snapshot: Snapshot = Snapshot(html="rival-marker plugin-marker", headers={"X-Base": "1"})
+    assert [detection.name for detection in engine.analyze(snapshot)] == ["Plugin", "Rival"]
+    assert summary(engine.match_many([snapshot]).page(0)) == summary(engine.analyze(snapshot))
+
+
+def test_excluded_technologies_take_their_implies(engine: Engine, make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    technologies: dict[str, dict] = {
+        "Framework": {"cats": [1], "html": ["framework-marker"], "excludes": ["Legacy"]},
+        "Legacy": {"cats": [1], "headers": {"x-legacy": ""}, "implies": ["Runtime"]},
+        "Runtime": {"cats": [1]},
+        "Left": {"cats": [1], "html": ["left-marker"], "excludes": ["Right"]},
+        "Right": {"cats": [1], "html": ["right-marker", "right-extra"], "excludes": ["Left"]},
+    }
+    assert summary(engine.analyze(CROSS_FIELD[2])) == [("Angular", 100, ""), ("TypeScript", 100, "")]
+    small: Engine = make_engine(technologies)
+    reference: Reference = Reference(technologies)
+    snapshots: list[Snapshot] = [
+        Snapshot(html="framework-marker", headers={"X-Legacy": "1"}),
+        Snapshot(html="left-marker right-marker"),
+        Snapshot(html="left-marker right-marker right-extra"),
+    ]
+    expected: list[list[str]] = [["Framework"], ["Left"], ["Right"]]
+    for snapshot, names in zip(snapshots, expected):
+        assert [detection.name for detection in small.analyze(snapshot)] == names
+        assert summary(small.analyze(snapshot)) == brute_force(small, reference, snapshot)
@@ -0,0 +1,103 @@
+import copy
+import pathlib
+from typing import Callable, Optional
+
+import pytest
+
+from engine import Engine, Snapshot
+from fingerprint_store import FingerprintDelta, FingerprintStore, InvalidDeltaException, InvalidStoreException, LiveEngine
+from regex_registry import RegexRegistry
+
+
+def edited(store: FingerprintStore, technologies: dict[str, dict], categories: Optional[dict[str, dict]] = None) -> FingerprintStore:
+    return FingerprintStore(categories if categories is not None else store.categories, store.groups, technologies)
+
+
+def variants(store: FingerprintStore) -> dict[str, FingerprintStore]:
+    names: list[str] = list(store.technologies)
+    changed: dict[str, dict] = copy.deepcopy(store.technologies)
+    changed[names[1]]["website"] = "https://changed.example"
+    added: dict[str, dict] = {}
+    for name, data in store.technologies.items():
+        added[name] = data
+        if name == names[len(names) // 2]:
+            added["Added Tech"] = {"cats": [1], "html": ["added-marker"]}
+    first: dict[str, dict] = {"First Tech": {"cats": [1], "headers": {"x-first": ""}}}
+    first.update(store.technologies)
+    categories: dict[str, dict] = copy.deepcopy(store.categories)
+    categories["1"]["priority"] = 9
+    return {
+        "unchanged": edited(store, dict(store.technologies)),
+        "changed": edited(store, changed),
+        "added": edited(store, added),
+        "added first": edited(store, first),
+        "removed": edited(store, {name: data for name, data in store.technologies.items() if name not in names[3:6]}),
+        "moved": edited(store, dict(reversed(store.technologies.items()))),
+        "categories": edited(store, dict(store.technologies), categories),
+    }
+
+
+@pytest.mark.parametrize("variant", ["unchanged", "changed", "added", "added first", "removed", "moved", "categories"])
+def test_diff_apply_round_trip(source_store: FingerprintStore, variant: str, tmp_path: pathlib.Path) -> None:
+    target: FingerprintStore = variants(source_store)[variant]
+    delta: FingerprintDelta = source_store.diff(target)
+    assert bool(delta) is (variant != "unchanged")
+    loaded: FingerprintDelta = FingerprintDelta.load(delta.save(tmp_path.joinpath("fingerprints.delta")))
+    for applied in (source_store.apply(delta), source_store.apply(loaded)):
+        assert applied.revision == target.revision
+        assert list(applied.technologies) == list(target.technologies)
+        assert applied.technologies == target.technologies
+        assert applied.categories == target.categories
+
+
+def test_delta_only_carries_changes(source_store: FingerprintStore) -> None:
+    stores: dict[str, FingerprintStore] = variants(source_store)
+    assert source_store.diff(stores["changed"]).changed == [list(source_store.technologies)[1]]
+    assert source_store.diff(stores["added"]).changed == ["Added Tech"]
+    assert source_store.diff(stores["removed"]).removed == list(source_store.technologies)[3:6]
+    assert source_store.diff(stores["moved"]).order is not None
+    assert source_store.diff(stores["changed"]).categories is None
+
+
+def test_apply_rejects_another_base(source_store: FingerprintStore) -> None:
+    stores: dict[str, FingerprintStore] = variants(source_store)
+    with pytest.raises(InvalidDeltaException):
+        stores["changed"].apply(source_store.diff(stores["added"]))
+
+
+def test_store_save_load(make_store: Callable[[dict[str, dict]], FingerprintStore], tmp_path: pathlib.Path) -> None:
+    store: FingerprintStore = make_store({"Tech": {"cats": [1], "html": ["tech-marker"]}})
+    path: pathlib.Path = store.save(tmp_path.joinpath("fingerprints.store"))
+    assert FingerprintStore.load(path).revision == store.revision
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(InvalidStoreException):
+        FingerprintStore.load(path)
+    path.write_bytes(b"WAPD" + bytes(64))
+    with pytest.raises(InvalidStoreException):
+        FingerprintStore.load(path)
+
+
+def test_live_engine_matches_a_fresh_build(make_store: Callable[[dict[str, dict]], FingerprintStore]) -> None:
+    base: FingerprintStore = make_store({
+        "Kept": {"cats": [1], "html": ["kept-marker"]},
+        "Changed": {"cats": [1], "html": ["old-marker"]},
+        "Removed": {"cats": [1], "headers": {"x-removed": ""}},
+    })
+    target: FingerprintStore = make_store({
+        "Kept": {"cats": [1], "html": ["kept-marker"]},
+        "Added": {"cats": [1], "implies": ["Kept"], "headers": {"x-added": "^(\\d+)$\\;version:\\1"}},
+        "Changed": {"cats": [1], "html": ["new-marker"]},
+    })
+    shared: RegexRegistry = RegexRegistry.shared()
+    shared.compile("old-marker")
+    compiled: int = len(shared)
+    live: LiveEngine = LiveEngine(base)
+    before: Engine = live.engine
+    engine: Engine = live.apply(base.diff(target))
+    assert live.engine is engine and live.store.revision == target.revision
+    snapshot: Snapshot = Snapshot(html="kept-marker old-marker new-marker", headers={"X-Added": "3", "X-Removed": "1"})
+    summary: Callable[[Engine], list[tuple[str, str]]] = lambda scanner: [(detection.name, detection.version) for detection in scanner.analyze(snapshot)]
+    assert summary(engine) == summary(Engine(target.bundle(), RegexRegistry())) == [("Added", "3"), ("Changed", ""), ("Kept", "")]
+    assert summary(before) == [("Changed", ""), ("Kept", ""), ("Removed", "")]
+    # evicting what the new revision doesn't use leaves other engines' regexes alone
+    assert len(shared) == compiled
@@ -0,0 +1,77 @@
+import re
+import warnings
+
+import pytest
+
+from regex_dialect import JsRegexTranslator, UntranslatablePatternException
+
+
+def search(regex: str, value: str) -> bool:
+    # the same flags the engine compiles with, patterns are written for new RegExp(pattern, "i")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        return re.search(JsRegexTranslator().translate(regex), value, re.IGNORECASE) is not None
+
+
+@pytest.mark.parametrize("regex, value, expected", [
+    # $ only matches at the very end, python's would also match before a final newline
+    ("a$", "a", True),
+    ("a$", "a\n", False),
+    # . stops at every javascript line terminator
+    ("a.b", "a-b", True),
+    ("a.b", "a\rb", False),
+    ("a.b", "a b", False),
+    # \d, \w and \b are ascii only without the u flag
+    (r"\d", "٣", False),
+    (r"\w", "é", False),
+    (r"\bx", "éx", True),
+    (r"\Bx", "ax", True),
+    # [^] matches anything, [] nothing
+    ("a[^]b", "a\nb", True),
+    ("a[]b", "ab", False),
+    # unknown escapes stand for the character itself
+    (r"\A", "A", True),
+    (r"\a", "a", True),
+    (r"\x4", "x4", True),
+    (r"é", "é", True),
+    (r"\cJ", "\n", True),
+    # inside a class \b is a backspace
+    (r"[\b]", "\x08", True),
+    (r"[\b]", "b", False),
+    # braces and brackets that don't form a quantifier or a class are literals
+    ("a{b", "a{b", True),
+    ("a{2}", "aa", True),
+    ("a{2,}", "aaa", True),
+    ("a]", "a]", True),
+    ("a}", "a}", True),
+    # characters python reserves for set operations are plain members
+    ("[&&]", "&", True),
+    ("[~|]", "|", True),
+    ("[+--]", ",", True),
+    # \D and \W inside a class become alternatives
+    (r"[a\D]", "-", True),
+    (r"[\W1]", "1", True),
+    (r"[\W]", "a", False),
+    # named groups and backreferences
+    (r"(?<q>['\"])x\k<q>", "'x'", True),
+    (r"(?<q>['\"])x\k<q>", "'x\"", False),
+    (r"a(?=b)", "ab", True),
+    (r"(?<!a)b", "ab", False),
+])
+def test_translation_keeps_javascript_semantics(regex: str, value: str, expected: bool) -> None:
+    assert search(regex, value) is expected
+
+
+@pytest.mark.parametrize("regex", [
+    "a\\",
+    "[a",
+    r"[^\D]",
+    "(?i)a",
+    "(?P<name>a)",
+    r"\k<1>",
+    "a\bb",
+    "a\x00",
+])
+def test_untranslatable_patterns(regex: str) -> None:
+    with pytest.raises(UntranslatablePatternException):
+        JsRegexTranslator().translate(regex)
@@ -0,0 +1,116 @@
+import random
+from typing import Callable
+
+import pytest
+
+from engine import Engine, Hits
+from streaming import StreamClosedException, StreamingMatcher, UnsupportedFieldException
+
+
+def document(engine: Engine, field: str, seed: int) -> str:
+    # literals of the field's own patterns with noise in between, so prefilters fire all over the stream
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = []
+    for _ in range(300):
+        _, pattern_id = rng.choice(engine.entries(field))
+        literals: tuple[str, ...] = engine.bundle.pattern_literals(pattern_id)
+        parts.append(rng.choice(literals) if literals else "x")
+        parts.append("".join(rng.choice("abc <>/.=\"\n") for _ in range(rng.randint(0, 200))))
+    return "".join(parts)
+
+
+def whole(engine: Engine, field: str, body: str) -> dict[int, int]:
+    hits: Hits = Hits()
+    for tech_id, pattern_id in engine.entries(field):
+        engine.match_pattern(tech_id, pattern_id, [body], hits)
+    return hits.confidence
+
+
+def chunks(body: str, size: int) -> list[str]:
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("field", StreamingMatcher.STREAM_FIELDS)
+@pytest.mark.parametrize("size", [1024, 9000])
+def test_streaming_matches_whole_body(engine: Engine, field: str, size: int) -> None:
+    for seed in range(3):
+        body: str = document(engine, field, seed)
+        assert StreamingMatcher(engine, field).feed_all(chunks(body, size)).confidence == whole(engine, field, body)
+
+
+def test_targets_end_the_stream(make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    engine: Engine = make_engine({
+        "Early": {"cats": [1], "html": ["early-marker"]},
+        "Late": {"cats": [1], "html": ["late-marker"]},
+    })
+    matcher: StreamingMatcher = StreamingMatcher(engine, targets=[0])
+    matcher.feed("<p>early-")
+    assert not matcher.done
+    matcher.feed("marker</p>")
+    assert matcher.done
+    matcher.feed("late-marker")
+    assert 0 in matcher.hits and 1 not in matcher.hits
+    untargeted: StreamingMatcher = StreamingMatcher(engine)
+    untargeted.feed("early-marker")
+    assert not untargeted.done
+
+
+def test_targets_without_patterns_in_the_field(make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    engine: Engine = make_engine({
+        "Header": {"cats": [1], "headers": {"x-header": ""}},
+        "Marker": {"cats": [1], "html": ["marker"]},
+    })
+    matcher: StreamingMatcher = StreamingMatcher(engine, targets=[0, 1])
+    matcher.feed("<p>marker</p>")
+    assert matcher.done
+    assert StreamingMatcher(engine, targets=[0]).done
+
+
+def test_matches_across_chunks_and_windows(make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    engine: Engine = make_engine({
+        "Split": {"cats": [1], "html": ["split-marker"]},
+        "Span": {"cats": [1], "html": ["alpha-marker[\\s\\S]*omega-marker"]},
+        "Number": {"cats": [1], "html": ["\\b\\d{3}-\\d{4}\\b"]},
+    })
+    assert engine.prefilter("html").unfiltered == [2]
+    filler: str = "lorem ipsum " * 8
+    streams: list[tuple[list[str], set[int]]] = [
+        # a literal split by the chunk boundary, several windows into the document
+        ([filler] * 6 + ["<p>split-", "marker</p>"] + [filler] * 6, {0}),
+        # a match shorter than the window spread over several chunks
+        ([filler] * 6 + ["alpha-marker", filler, filler, "omega-marker"] + [filler] * 6, {1}),
+        # the literal left the window before the rest of the match arrived
+        ([filler] * 6 + ["alpha-marker"] + [filler] * 4 + ["omega-marker"], set()),
+        # a pattern without literals matching across the boundary, within the overlap
+        ([filler] * 6 + ["call 555-", "0199 now"] + [filler] * 6, {2}),
+    ]
+    for chunked, expected in streams:
+        assert set(StreamingMatcher(engine, window=256, overlap=64).feed_all(chunked).confidence) == expected
+    assert set(whole(engine, "html", "".join(streams[2][0]))) == {1}
+
+
+def test_anchors_only_match_at_the_document_edges(make_engine: Callable[[dict[str, dict]], Engine]) -> None:
+    engine: Engine = make_engine({
+        "Start": {"cats": [1], "html": ["^<!-- start-marker"]},
+        "End": {"cats": [1], "html": ["end-marker -->$"]},
+    })
+    body: str = "<!-- start-marker -->" + "x" * 100 + "<!-- start-marker --> end-marker -->" + "y" * 100 + "<!-- end-marker -->"
+    assert set(whole(engine, "html", body)) == {0, 1}
+    assert set(StreamingMatcher(engine, window=64).feed_all(chunks(body, 16)).confidence) == {0, 1}
+    body = "x" * 100 + "<!-- start-marker --> end-marker -->" + "y" * 100
+    assert whole(engine, "html", body) == {}
+    for size in (8, 16, 36, 64):
+        assert StreamingMatcher(engine, window=64).feed_all(chunks(body, size)).confidence == {}, size
+
+
+def test_closed_stream(engine: Engine) -> None:
+    matcher: StreamingMatcher = StreamingMatcher(engine)
+    matcher.feed("<html>")
+    assert matcher.close() is matcher.close()
+    with pytest.raises(StreamClosedException):
+        matcher.feed("</html>")
+
+
+def test_unsupported_field(engine: Engine) -> None:
+    with pytest.raises(UnsupportedFieldException):
+        StreamingMatcher(engine, "url")